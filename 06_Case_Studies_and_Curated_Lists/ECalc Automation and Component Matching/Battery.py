@@ -1,5 +1,9 @@
 import pandas as pd
+import numpy as np
 import math
+from scipy.spatial import cKDTree
+
+from catalog import ComponentCatalog, catalog_rows, load_catalog
 
 # --- Battery Class ---
 
@@ -8,6 +12,9 @@ class Battery:
     Represents a battery, allowing initialization with specific parameters
     or by matching an inventory entry to a full database.
     """
+    __slots__ = ('battery_type', 'n_cells', 'p_cells', 'voltpercell', 'weight', 'cell_Rin', 'Rin', 'volt',
+                 'capacity', 'c_rating', 'crate_const')
+
     def __init__(self, n_cells, voltpercell, cell_Rin, weight, capacity,
                  p_cells=1, battery_type=None, c_rating=None, crate_const=None):
         self.battery_type = battery_type
@@ -24,12 +31,20 @@ class Battery:
 
 
     @classmethod
-    def from_inventory(cls, inventory_entry):
+    def from_inventory(cls, inventory_entry, substitute=False):
         """
         Creates a Battery instance from a pandas Series representing an inventory entry
         by finding the best match in a full battery database.
+
+        If `substitute` is True and the strict C-rate window finds nothing, the nearest
+        catalog battery from `suggest_substitutes` is used instead.
         """
         best_match = find_best_match(inventory_entry)
+        if best_match is None and substitute:
+            substitutes = suggest_substitutes(inventory_entry, k=1)
+            if not substitutes.empty:
+                best_match = substitutes.iloc[0]
+                print(f"Note: no battery within the C-rate window, using nearest substitute '{best_match.get('text')}'")
 
         if best_match is not None:
             # Extract data from inventory_entry and best_match
@@ -52,8 +67,7 @@ class Battery:
 
 
 def find_best_match(inventory_battery):
-    full_database_file_path = r'resources/ecalcData/pkl_data/batteries.pkl'
-    full_database_df = pd.read_pickle(full_database_file_path)
+    full_database_df = load_catalog('batteries')
     best_match = None
 
     inventory_c_rating = inventory_battery.get('C-rating')
@@ -64,27 +78,218 @@ def find_best_match(inventory_battery):
         print(f"Warning: 'C-rating' or 'Capacity' missing or invalid in inventory entry: {inventory_battery}")
         return None
 
-    # Filter candidates based on C-rate within +/- 5 and explicitly create a copy
-    candidates_df = full_database_df[abs(full_database_df['crate_max'] - inventory_c_rating ) <= 10].copy()
-    candidates_df = candidates_df[candidates_df['cell_volt'] == 3.7].copy()
+    # Filter candidates based on C-rate within +/- 10 and cell voltage, without copying the catalog
+    candidates = (abs(full_database_df['crate_max'] - inventory_c_rating) <= 10) & (full_database_df['cell_volt'] == 3.7)
 
-    if not candidates_df.empty:
-        # Calculate absolute capacity difference for candidates
-        candidates_df['capacity_diff'] = abs(candidates_df['capacity'] - inventory_capacity)
-        # Find the candidate with the minimum capacity difference
-        best_match = candidates_df.loc[candidates_df['capacity_diff'].idxmin()]
-        # Remove the temporary 'capacity_diff' column before returning
-        best_match = best_match.drop('capacity_diff')
+    if candidates.any():
+        # Find the candidate with the minimum absolute capacity difference
+        capacity_diff = abs(full_database_df.loc[candidates, 'capacity'] - inventory_capacity)
+        best_match = full_database_df.loc[capacity_diff.idxmin()]
 
     return best_match
 
 
 
+def _capacity_buckets(full_database_df, cell_volt):
+    """
+    Groups catalog rows by 'crate_max'. Each bucket holds its capacities sorted ascending and
+    the matching catalog positions, ordered by (capacity, position).
+    """
+    crate_max = full_database_df['crate_max'].to_numpy(dtype=float)
+    capacity = full_database_df['capacity'].to_numpy(dtype=float)
+    valid = ~np.isnan(crate_max) & ~np.isnan(capacity)
+    if cell_volt is not None:
+        valid &= full_database_df['cell_volt'].to_numpy(dtype=float) == cell_volt
+    positions = np.flatnonzero(valid)
+
+    buckets = []
+    for crate in np.unique(crate_max[positions]):
+        bucket_positions = positions[crate_max[positions] == crate]
+        order = np.argsort(capacity[bucket_positions], kind='stable')
+        buckets.append((crate, capacity[bucket_positions][order], bucket_positions[order]))
+    return buckets
+
+
+def match_battery_positions(inventory_df, crate_window=10, cell_volt=3.7):
+    """
+    Vectorized core of `match_batteries`. Returns, for every inventory row, the catalog position
+    of its best match or -1 if there is none.
+    """
+    battery_catalog = ComponentCatalog.get('batteries')
+    buckets = battery_catalog.cached(('capacity_buckets', cell_volt),
+                                     lambda df: _capacity_buckets(df, cell_volt))
+
+    c_rating = pd.to_numeric(inventory_df['C-rating'], errors='coerce').to_numpy(dtype=float)
+    capacity = pd.to_numeric(inventory_df['Capacity'], errors='coerce').to_numpy(dtype=float)
+
+    best_position = np.full(len(inventory_df), -1, dtype=np.int64)
+    best_diff = np.full(len(inventory_df), np.inf)
+
+    for crate, capacities, positions in buckets:
+        rows = np.flatnonzero((np.abs(c_rating - crate) <= crate_window) & ~np.isnan(capacity))
+        if rows.size == 0:
+            continue
+        x = capacity[rows]
+
+        # Nearest capacity above (first of any equal capacities) and below (first of its equals)
+        upper = np.searchsorted(capacities, x, side='left')
+        upper_clipped = np.minimum(upper, len(capacities) - 1)
+        lower = np.searchsorted(capacities, capacities[np.maximum(upper - 1, 0)], side='left')
+
+        diff_upper = np.where(upper < len(capacities), capacities[upper_clipped] - x, np.inf)
+        diff_lower = np.where(upper > 0, x - capacities[lower], np.inf)
+        position_upper = positions[upper_clipped]
+        position_lower = positions[lower]
+
+        # Ties go to the earliest catalog row, like DataFrame.idxmin in find_best_match
+        take_lower = (diff_lower < diff_upper) | ((diff_lower == diff_upper) & (position_lower < position_upper))
+        diff = np.where(take_lower, diff_lower, diff_upper)
+        candidate = np.where(take_lower, position_lower, position_upper)
+
+        better = (diff < best_diff[rows]) | ((diff == best_diff[rows]) & (candidate < best_position[rows]))
+        best_diff[rows[better]] = diff[better]
+        best_position[rows[better]] = candidate[better]
+
+    return best_position
+
+
+def match_batteries(inventory_df, crate_window=10, cell_volt=3.7):
+    """
+    Matches every battery of an inventory DataFrame in one vectorized pass.
+
+    Comparison Logic (same as `find_best_match`, applied to all rows at once):
+    1. Keep catalog batteries whose 'crate_max' is within +/- `crate_window` of the inventory 'C-rating'
+       and, unless `cell_volt` is None, whose 'cell_volt' equals `cell_volt`.
+    2. Among these, pick the one with the closest 'capacity' to the inventory 'Capacity'.
+
+    The catalog is bucketed by 'crate_max' and sorted by capacity once, so every bucket is searched
+    for all inventory rows with a single `searchsorted`.
+
+    Args:
+        inventory_df (pd.DataFrame): Inventory batteries. Expected columns: 'C-rating', 'Capacity'.
+        crate_window (float): Allowed absolute difference between 'C-rating' and 'crate_max'.
+        cell_volt (float or None): Required catalog cell voltage, or None to accept any.
+
+    Returns:
+        pd.DataFrame: Catalog rows aligned with `inventory_df.index`; rows without a match are all NaN.
+    """
+    full_database_df = load_catalog('batteries')
+    positions = match_battery_positions(inventory_df, crate_window=crate_window, cell_volt=cell_volt)
+    return catalog_rows(full_database_df, positions, inventory_df.index)
+
+
+# --- Nearest-neighbour matching ---
+
+NEIGHBOUR_FEATURES = ('crate_max', 'capacity', 'cell_volt', 'weight', 'Rin')
+# Features spanning orders of magnitude are compared on a log scale
+LOG_FEATURES = ('capacity', 'weight', 'Rin')
+# Battery.from_inventory assumes 3.7 V cells, so cell chemistry dominates by default
+DEFAULT_NEIGHBOUR_WEIGHTS = {'cell_volt': 4.0}
+
+
+class BatteryNeighbours:
+    """
+    KD-tree over normalized battery catalog features answering weighted k-nearest queries.
+
+    Each feature is z-scored (after a log transform for LOG_FEATURES) and multiplied by the
+    square root of its weight (DEFAULT_NEIGHBOUR_WEIGHTS, overridden by `weights`), so the tree's Euclidean distance is the weighted distance.
+    Catalog rows with a missing feature are left out of the tree.
+    """
+    def __init__(self, full_database_df, features=NEIGHBOUR_FEATURES, weights=None):
+        self.features = tuple(features)
+        weights = {**DEFAULT_NEIGHBOUR_WEIGHTS, **(weights or {})}
+        self.weights = np.array([weights.get(feature, 1.0) for feature in self.features], dtype=float)
+
+        values = self._transform(full_database_df[list(self.features)].to_numpy(dtype=float))
+        valid = np.isfinite(values).all(axis=1)
+        self.positions = np.flatnonzero(valid)
+
+        if valid.any():
+            self.center = values[valid].mean(axis=0)
+            self.scale = values[valid].std(axis=0)
+            self.scale[self.scale == 0] = 1.0
+        else:
+            self.center = np.zeros(len(self.features))
+            self.scale = np.ones(len(self.features))
+        self.tree = cKDTree(self._normalize(values[valid]))
+
+    def _transform(self, values):
+        values = np.array(values, dtype=float)
+        for i, feature in enumerate(self.features):
+            if feature in LOG_FEATURES:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    values[..., i] = np.log(values[..., i])
+        return values
+
+    def _normalize(self, values):
+        return (values - self.center) / self.scale * np.sqrt(self.weights)
+
+    def query(self, targets, k=5):
+        """
+        Returns (distances, catalog positions) of the `k` nearest batteries for each target.
+
+        Args:
+            targets (array-like): Shape (n, len(features)) or (len(features),), in catalog units.
+            k (int): Number of neighbours, capped at the number of indexed batteries; k <= 0 (or an
+                empty index) gives empty (n, 0) arrays.
+        """
+        k = min(k, len(self.positions))
+        points = self._normalize(self._transform(np.atleast_2d(targets)))
+        if k <= 0:
+            return np.empty((len(points), 0)), np.empty((len(points), 0), dtype=int)
+        distances, rows = self.tree.query(points, k=k)
+        distances = np.asarray(distances).reshape(len(points), k)
+        rows = np.asarray(rows).reshape(len(points), k)
+        return distances, self.positions[rows]
+
+
+def battery_neighbours(features=NEIGHBOUR_FEATURES, weights=None):
+    """
+    Returns the BatteryNeighbours index for a feature set and weights, built once per catalog load.
+    """
+    key = ('neighbours', tuple(features), tuple(sorted((weights or {}).items())))
+    return ComponentCatalog.get('batteries').cached(key, lambda df: BatteryNeighbours(df, features, weights))
+
+
+def suggest_substitutes(inventory_battery, k=5, weights=None, cell_volt=3.7):
+    """
+    Ranks the `k` catalog batteries nearest to an inventory entry.
+
+    The query uses the inventory 'C-rating' and 'Capacity' against 'crate_max' and 'capacity', and
+    `cell_volt` against 'cell_volt' (pass None to ignore it). Catalog 'weight' and 'Rin' are also
+    used when the entry provides them under those names.
+
+    Returns:
+        pd.DataFrame: The k nearest catalog rows, closest first, with an added 'distance' column.
+    """
+    targets = {
+        'crate_max': inventory_battery.get('C-rating'),
+        'capacity': inventory_battery.get('Capacity'),
+        'cell_volt': cell_volt,
+        'weight': inventory_battery.get('weight'),
+        'Rin': inventory_battery.get('Rin'),
+    }
+    # A blank inventory cell reads as NaN, which is a float but not a usable target
+    targets = {feature: value for feature, value in targets.items()
+               if isinstance(value, (int, float, np.number)) and np.isfinite(value)}
+    if not {'crate_max', 'capacity'} <= targets.keys():
+        print(f"Warning: 'C-rating' or 'Capacity' missing or invalid in inventory entry: {inventory_battery}")
+        return load_catalog('batteries').iloc[0:0].assign(distance=[])
+
+    if k <= 0:
+        return load_catalog('batteries').iloc[0:0].assign(distance=[])
+
+    features = tuple(feature for feature in NEIGHBOUR_FEATURES if feature in targets)
+    neighbours = battery_neighbours(features, weights)
+    distances, positions = neighbours.query([targets[feature] for feature in features], k=k)
+
+    return load_catalog('batteries').iloc[positions[0]].assign(distance=distances[0])
+
+
 if __name__ == '__main__':
-    # Define file paths
-    inventory_file_path = r'resources/udcData/udcData.xlsx'
-    full_database_file_path = r'resources/ecalcData/pkl_data/batteries.pkl'
-    inventory_df = pd.read_excel(inventory_file_path, sheet_name='Available Batteries')
+    from inventory import inventory_sheet
+
+    inventory_df = inventory_sheet('Available Batteries')
 
     print("\n--- Finding Best Matches ---")
     for index, inv_bat_series in inventory_df.iterrows():
@@ -104,3 +309,6 @@ if __name__ == '__main__':
 
         else:
             print(f"No suitable match found for Inventory Battery (Row {index}): Battery No. {inv_bat_series.get('Battery No.')}, C-rating: {inv_bat_series.get('C-rating')}, Capacity: {inv_bat_series.get('Capacity')} mAh")
+            substitutes = suggest_substitutes(inv_bat_series, k=3)
+            for _, substitute in substitutes.iterrows():
+                print(f"  Possible substitute: {substitute.get('text')} (distance {substitute.get('distance'):.3f})")
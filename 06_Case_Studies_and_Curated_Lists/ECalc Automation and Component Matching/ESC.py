@@ -1,4 +1,6 @@
 class ESC:
+    __slots__ = ('Rin', 'type')
+
     def __init__(self,Rin, type=None):
         self.Rin = Rin
         self.type = type
\ No newline at end of file
@@ -1,11 +1,15 @@
+import numpy as np
 import pandas as pd
-from fuzzywuzzy import fuzz
-import re
+
+from catalog import ComponentCatalog, catalog_rows
+from motor_index import clean_model_name, motor_name_index, process_name
 class Motor:
     """
     Represents a motor, allowing initialization with specific parameters
     or by matching an inventory entry to a full database.
     """
+    __slots__ = ('kv', 'kt', 'Rin', 'i0', 'manuf', 'name', 'weight')
+
     def __init__(self, kv, R_in, i0, weight, manuf=None, name=None):
         self.kv = kv
         self.kt = 9.5694 / self.kv if self.kv != 0 else 0
@@ -39,17 +43,7 @@ class Motor:
         else:
             return None  # No suitable match found
 
-def clean_model_name(name):
-    """
-    Removes text in parentheses from a string and strips whitespace.
-    E.g., "KDE5215XF-330 (330)" becomes "KDE5215XF-330".
-    """
-    if isinstance(name, str):
-        return re.sub(r'\s*\(.*\)\s*', '', name).strip()
-    return name
-
-
-def find_best_match(inventory_motor, fuzzy_threshold=70):
+def find_best_match(inventory_motor, fuzzy_threshold=70, top_k=50):
     """
     Finds the best matching motor from a full database DataFrame for a given inventory motor.
 
@@ -59,24 +53,30 @@ def find_best_match(inventory_motor, fuzzy_threshold=70):
     3. Fuzzy match (fuzz.token_set_ratio) of the original inventory 'Model' against the original database 'type'
        with a score above 'fuzzy_threshold'.
 
+    Steps 1 and 2 are dictionary lookups in the motor name index. Step 3 first scores the 'top_k'
+    database names that share the most tokens/trigrams with the inventory 'Model', and falls back to
+    the whole database when the best of those is within FULL_SCAN_MARGIN of 'fuzzy_threshold'. The
+    fuzzy result is therefore approximate (a better name outside the shortlist can be missed when
+    the shortlist already has a clear match); match_motors applies the same rule.
+
     Args:
         inventory_motor (pd.Series): A pandas Series representing one motor from the inventory.
                                      Expected keys: 'Model'.
         fuzzy_threshold (int): The minimum fuzz.ratio score for a fuzzy match to be considered valid.
+        top_k (int): Number of shortlisted database names the fuzzy match is scored against.
 
     Returns:
         pd.Series or None: The best matching motor as a pandas Series,
                            or None if no suitable match is found.
     """
-    # Define file path for the full motor database
-    full_database_motor_file_path = r'resources/ecalcData/pkl_data/motors.pkl'
+    # The full motor database is shared process-wide and must not be modified here
+    motor_catalog = ComponentCatalog.get('motors')
 
-    # Load the full database directly within the function
     try:
-        full_database_df = pd.read_pickle(full_database_motor_file_path)
+        full_database_df = motor_catalog.load()
     except FileNotFoundError:
         print(
-            f"Error: Full Motor database PKL file not found at {full_database_motor_file_path}. Please ensure the file exists.")
+            f"Error: Full Motor database PKL file not found at {motor_catalog.file_path}. Please ensure the file exists.")
         return None
     except Exception as e:
         print(f"Error loading full motor database from PKL within find_best_match: {e}")
@@ -88,40 +88,77 @@ def find_best_match(inventory_motor, fuzzy_threshold=70):
         print(f"Warning: 'Model' missing or invalid (expected string) in inventory entry: {inventory_motor.to_dict()}")
         return None
 
-    exact_matches_original = full_database_df[full_database_df['type'].str.lower() == inventory_Model.lower()]
-    if not exact_matches_original.empty:
-        return exact_matches_original.iloc[0]
+    name_index = motor_name_index()
 
-    full_database_df['cleaned_type'] = full_database_df['type'].apply(clean_model_name)
-    cleaned_inventory_model = clean_model_name(inventory_Model)
+    position = name_index.exact_position(inventory_Model)
+    if position is None:
+        position = name_index.cleaned_position(inventory_Model)
+    if position is None:
+        position, _ = name_index.best_fuzzy(inventory_Model, fuzzy_threshold=fuzzy_threshold, top_k=top_k)
 
-    exact_matches_cleaned = full_database_df[
-        full_database_df['cleaned_type'].str.lower() == cleaned_inventory_model.lower()]
+    if position is not None:
+        return full_database_df.iloc[position]
+    return None
 
-    if not exact_matches_cleaned.empty:
-        return exact_matches_cleaned.iloc[0].drop('cleaned_type')
-    else:
-        best_fuzzy_match = None
-        highest_score = -1
 
-        for index, db_motor in full_database_df.iterrows():
-            db_motor_original_type = db_motor.get('type')
-            if isinstance(db_motor_original_type, str):
-                score = fuzz.token_set_ratio(inventory_Model.lower(), db_motor_original_type.lower())
-                if score > highest_score and score >= fuzzy_threshold:
-                    highest_score = score
-                    best_fuzzy_match = db_motor
+def match_motor_positions(inventory_df, fuzzy_threshold=70, max_workers=None, top_k=50):
+    """
+    Core of `match_motors`. Returns, for every inventory row, the catalog position of its
+    best match or -1 if there is none. Fuzzy matches follow the same shortlist-then-full-scan
+    rule as `find_best_match`, with the full scans spread over `max_workers` processes.
+    """
+    name_index = motor_name_index()
+    positions = np.full(len(inventory_df), -1, dtype=np.int64)
+    pending = {}  # processed model name -> inventory rows still needing a fuzzy match
+
+    for row, model in enumerate(inventory_df['Model']):
+        if not isinstance(model, str):
+            continue
+        position = name_index.exact_position(model)
+        if position is None:
+            position = name_index.cleaned_position(model)
+        if position is not None:
+            positions[row] = position
+        else:
+            pending.setdefault(process_name(model), []).append(row)
 
-        if best_fuzzy_match is not None:
-            return best_fuzzy_match.drop('cleaned_type')
-        return None
+    if pending:
+        models = [inventory_df['Model'].iloc[rows[0]] for rows in pending.values()]
+        matches = name_index.best_fuzzy_many(models, fuzzy_threshold=fuzzy_threshold, top_k=top_k,
+                                             max_workers=max_workers)
+        for rows, (position, _) in zip(pending.values(), matches):
+            if position is not None:
+                positions[rows] = position
 
+    return positions
+
+
+def match_motors(inventory_df, fuzzy_threshold=70, max_workers=None):
+    """
+    Matches every motor of an inventory DataFrame at once.
+
+    Exact and cleaned-exact names are resolved through the motor name index. The remaining
+    distinct models are fuzzy-matched as in `find_best_match` (shortlist first, whole catalog
+    when the shortlist winner is close to the threshold); the full-catalog scans run in one
+    batched call (`fuzzy_batch.best_fuzzy_matches`), spread over `max_workers` processes.
+
+    Args:
+        inventory_df (pd.DataFrame): Inventory motors. Expected column: 'Model'.
+        fuzzy_threshold (int): The minimum fuzz.token_set_ratio score for a fuzzy match.
+        max_workers (int or None): Process pool size; None uses every core, 1 stays in-process.
+
+    Returns:
+        pd.DataFrame: Catalog rows aligned with `inventory_df.index`; rows without a match are all NaN.
+    """
+    full_database_df = ComponentCatalog.get('motors').load()
+    positions = match_motor_positions(inventory_df, fuzzy_threshold=fuzzy_threshold, max_workers=max_workers)
+    return catalog_rows(full_database_df, positions, inventory_df.index)
 
 
 if __name__ == '__main__':
-    inventory_file_path = r'resources/udcData/udcData.xlsx'
-    full_database_file_path = r'resources/ecalcData/pkl_data/motors.pkl'
-    inventory_motor_df = pd.read_excel(inventory_file_path, sheet_name='Available Motors')
+    from inventory import inventory_sheet
+
+    inventory_motor_df = inventory_sheet('Available Motors')
 
 
     print("\n--- Finding Best Motor Matches ---")
@@ -1,5 +1,18 @@
+import numpy as np
 import pandas as pd
+from fuzzywuzzy import fuzz
+
+from catalog import ComponentCatalog
+from motor_index import process_name
+
+# Inventory columns that may hold the propeller type, in order of preference
+PROPELLER_TYPE_KEYS = ('Type', 'Model', 'Brand')
+# Used when the inventory gives no type; its constants are the Propeller defaults (Tc=1, Pc=1.08)
+DEFAULT_PROPELLER_TYPE = 'Generic - thin'
+
 class Propeller:
+    __slots__ = ('NB', 'pitch', 'diameter', 'Tc', 'Pc', 'weight', 'eff')
+
     def __init__(self,NB:float, pitch:float, diameter:float,weight, Tc=1, Pc=1.08, eff:float=None):
         self.NB = NB
         self.pitch = pitch
@@ -25,21 +38,104 @@ class Propeller:
     def from_inventory(cls, inventory_entry):
         """
         Creates a Propeller instance from a pandas Series representing an inventory entry
-        by finding the best match in a full battery database.
+        by finding the best match in the full propeller database.
         """
         best_match = find_best_match(inventory_entry)
         if best_match is not None:
             return cls(NB=inventory_entry.get('No. of Blades'),pitch=inventory_entry.get('Pitch'),diameter=inventory_entry.get('Diameter'), Tc=best_match.get('Tconst'),Pc=best_match.get('Pconst'), weight=inventory_entry.get('Weight (g)'))
+        else:
+            return None  # No suitable match found
+
+
+class PropellerTable:
+    """
+    Tconst/Pconst lookup table over the propeller database, built once per catalog load.
 
-def find_best_match(inventroy_entry):
-    full_database_motor_file_path = r'resources/ecalcData/pkl_data/motors.pkl'
-    # Load the full database directly within the function
+    The database holds one (Tconst, Pconst) pair per propeller type; diameter, pitch and blade
+    count enter the thrust model separately. Type names resolve by exact (case-insensitive)
+    lookup first and by fuzz.token_set_ratio over the few dozen types otherwise.
+    """
+    def __init__(self, full_database_df):
+        names = full_database_df['text'].tolist()
+        self.exact = {}
+        for position, name in enumerate(names):
+            if isinstance(name, str):
+                self.exact.setdefault(name.lower().strip(), position)
+        self.processed = [process_name(name) if isinstance(name, str) else None for name in names]
+        self.tconst = full_database_df['Tconst'].to_numpy(dtype=float)
+        self.pconst = full_database_df['Pconst'].to_numpy(dtype=float)
+        self._resolved = {}
+
+    def position(self, prop_type, fuzzy_threshold=70):
+        """
+        Returns the catalog position for a propeller type name, or None if nothing matches.
+        """
+        key = (prop_type.lower().strip(), fuzzy_threshold)
+        if key not in self._resolved:
+            position = self.exact.get(key[0])
+            if position is None:
+                query = process_name(prop_type)
+                scores = [fuzz.token_set_ratio(query, name, full_process=False) if name is not None else -1
+                          for name in self.processed]
+                best = int(np.argmax(scores)) if scores else None
+                position = best if best is not None and scores[best] >= fuzzy_threshold else None
+            self._resolved[key] = position
+        return self._resolved[key]
+
+    def constants(self, prop_types, fuzzy_threshold=70):
+        """
+        Returns (Tconst, Pconst) arrays for many type names at once; NaN where a type is unknown.
+        """
+        positions = np.array([self.position(t, fuzzy_threshold) if isinstance(t, str) else None
+                              for t in prop_types], dtype=object)
+        known = np.array([p is not None for p in positions], dtype=bool)
+        tconst = np.full(len(positions), np.nan)
+        pconst = np.full(len(positions), np.nan)
+        tconst[known] = self.tconst[positions[known].astype(int)]
+        pconst[known] = self.pconst[positions[known].astype(int)]
+        return tconst, pconst
+
+
+def propeller_table():
+    return ComponentCatalog.get('propellers').cached('constants_table', PropellerTable)
+
+
+def propeller_constants(prop_types, fuzzy_threshold=70):
+    """
+    Bulk (Tconst, Pconst) lookup for a sequence of propeller type names, e.g. to feed the
+    analytic thrust model for many propellers. Unknown types give NaN.
+    """
+    return propeller_table().constants(prop_types, fuzzy_threshold)
+
+
+def find_best_match(inventory_entry, fuzzy_threshold=70):
+    """
+    Finds the propeller database row for an inventory propeller.
+
+    The type is read from the first of PROPELLER_TYPE_KEYS present in the entry and resolved
+    through the propeller lookup table. Entries without a type use DEFAULT_PROPELLER_TYPE.
+
+    Returns:
+        pd.Series or None: The matching propeller row (with 'Tconst' and 'Pconst'), or None.
+    """
+    propeller_catalog = ComponentCatalog.get('propellers')
     try:
-        full_database_df = pd.read_pickle(full_database_motor_file_path)
+        full_database_df = propeller_catalog.load()
     except FileNotFoundError:
         print(
-            f"Error: Full Motor database PKL file not found at {full_database_motor_file_path}. Please ensure the file exists.")
+            f"Error: Full Propeller database PKL file not found at {propeller_catalog.file_path}. Please ensure the file exists.")
         return None
     except Exception as e:
-        print(f"Error loading full motor database from PKL within find_best_match: {e}")
-        return None
\ No newline at end of file
+        print(f"Error loading full propeller database from PKL within find_best_match: {e}")
+        return None
+
+    prop_type = next((inventory_entry.get(key) for key in PROPELLER_TYPE_KEYS
+                      if isinstance(inventory_entry.get(key), str)), None)
+    if prop_type is None:
+        prop_type = DEFAULT_PROPELLER_TYPE
+
+    position = propeller_table().position(prop_type, fuzzy_threshold)
+    if position is None:
+        print(f"Warning: no propeller type in the database matches '{prop_type}'")
+        return None
+    return full_database_df.iloc[position]
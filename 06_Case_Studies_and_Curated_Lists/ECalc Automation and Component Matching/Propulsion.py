@@ -4,32 +4,269 @@ from Propeller import Propeller
 from Battery import Battery
 from calc import ecalc
 import math
-from sympy import symbols, solve, sqrt
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from aerosandbox import Airplane
+from aerosandbox import Atmosphere
 from aerosandbox import OperatingPoint
 import aerosandbox.numpy as np
+from component_batch import BatteryBatch, EscBatch, MotorBatch, PropellerBatch, component_fields
+from performance_table import PerformanceTable, table_key
+
+# --- Analytic Propeller and Motor Model ---
+#
+# The coefficients of the analytic equations; every analytic path (Propulsion, PropulsionBatch,
+# design_space, mission, performance tables and the Opti model in propulsion_opti) goes through
+# the kernels below. The kernels use aerosandbox.numpy, so max_rpm_root, static_thrust,
+# dynamic_thrust, shaft_power and motor_current also accept asb.Opti variables.
+
+# Shaft power (W) = sqrt(NB - 1) * Pc * POWER_COEFF * D^4 * P * rpm^3, diameter and pitch in inches
+POWER_COEFF = 4.019e-15
+# Static thrust (g) = eff * sqrt(NB - 1) * Tc * THRUST_COEFF * D^3 * P * rpm^2
+THRUST_COEFF = 2.691e-9
+# Pitch speed (m/s) = pitch (in) * rpm * PITCH_SPEED_COEFF
+PITCH_SPEED_COEFF = 0.0254 / 60
+# Dynamic thrust = T_static * (1 - DYNAMIC_QUADRATIC * (v / vp)^2 - DYNAMIC_LINEAR * v / vp)
+DYNAMIC_QUADRATIC = 31 / 130
+DYNAMIC_LINEAR = 0.4543
+
+
+def max_rpm_root(NB, Pc, diameter, pitch, kt, kv, i0, volt, R_tot):
+    """
+    Positive root of the full-throttle torque balance (see max_rpm) without any validity checks,
+    in the cancellation-free form 2c / (b + sqrt(b^2 + 4ac)). Smooth for positive parameters, so
+    it can be used with asb.Opti variables.
+    """
+    a = np.sqrt(NB - 1) * Pc * POWER_COEFF * diameter ** 4 * pitch * R_tot
+    b = 2 * math.pi * kt / (60 * kv)
+    c = 2 * math.pi * kt * (volt - i0 * R_tot) / 60
+    return 2 * c / (b + np.sqrt(b ** 2 + 4 * a * c))
+
+
+@lru_cache(maxsize=4096)
+def max_rpm(NB, Pc, diameter, pitch, kt, kv, i0, volt, R_tot):
+    """
+    Full-throttle RPM at which the propeller load torque balances the motor torque.
+
+    Propeller power  Pm = sqrt(NB - 1) * Pc * POWER_COEFF * D^4 * P * rpm^3
+    Motor power      Pe = 2*pi*rpm/60 * kt * ((volt - rpm/kv) / R_tot - i0)
+
+    Setting Pm = Pe and dividing out the trivial root rpm = 0 leaves a quadratic in rpm,
+    whose positive root is returned (None if the motor cannot turn the propeller).
+    Results are memoized per parameter set.
+    """
+    # a*rpm^2 + b*rpm - c = 0, multiplied through by R_tot so R_tot = 0 is allowed
+    if NB < 1 or kv <= 0 or kt * (volt - i0 * R_tot) <= 0:
+        return None
+    return float(max_rpm_root(NB, Pc, diameter, pitch, kt, kv, i0, volt, R_tot))
+
+
+def max_rpm_array(NB, Pc, diameter, pitch, kt, kv, i0, volt, R_tot):
+    """
+    Vectorized `max_rpm`: every argument may be an array (they broadcast against each other).
+    Returns NaN where the motor cannot turn the propeller.
+    """
+    valid = (NB >= 1) & (kv > 0) & (kt * (volt - i0 * R_tot) > 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rpm = max_rpm_root(np.maximum(NB, 1), Pc, diameter, pitch, kt, np.where(kv > 0, kv, np.nan), i0, volt, R_tot)
+    return np.where(valid, rpm, np.nan)
+
+
+def static_thrust(rpm, NB, Tc, eff, diameter, pitch, density_ratio=1.0):
+    """
+    Static thrust (g) of a propeller turning at `rpm`.
+    """
+    return density_ratio * eff * np.sqrt(np.maximum(NB - 1, 0)) * Tc * THRUST_COEFF * diameter ** 3 * pitch * rpm ** 2
+
+
+def dynamic_thrust(t_static, rpm, pitch, v):
+    """
+    Thrust at airspeed `v` (m/s) from the static thrust at the same rpm. Without prop speed there is
+    only static thrust at v = 0 and no thrust otherwise.
+    """
+    vp = pitch * rpm * PITCH_SPEED_COEFF
+    stopped = np.abs(vp) < 1e-9
+    vp = np.where(stopped, 1.0, vp)
+    t_dynamic = t_static - DYNAMIC_QUADRATIC * t_static / vp ** 2 * v ** 2 - DYNAMIC_LINEAR * v * t_static / vp
+    return np.where(stopped, np.where(np.abs(v) < 1e-9, t_static, 0.0), t_dynamic)
+
+
+def throttle_for_thrust_array(t_static_max, rpm_max, pitch, v, target):
+    """
+    Throttle giving dynamic thrust `target` at airspeed `v`, from the full-throttle static thrust and rpm.
+
+    With rpm = rpm_max * throttle, dynamic thrust is A*x^2 - B*x - C in the throttle x, with
+    A = t_static_max, B = DYNAMIC_LINEAR*v*A/vp_max and C = DYNAMIC_QUADRATIC*A*v^2/vp_max^2 (vp_max the pitch speed at
+    full throttle); the larger root is taken, where thrust increases with throttle.
+
+    Returns:
+        (np.ndarray, np.ndarray): Throttle and a `reachable` mask. Targets at or below zero give
+        throttle 0; targets above full-throttle thrust (or without an rpm solution) give NaN.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        vp_max = pitch * rpm_max * PITCH_SPEED_COEFF
+        B = DYNAMIC_LINEAR * v * t_static_max / vp_max
+        C = DYNAMIC_QUADRATIC * t_static_max * v ** 2 / vp_max ** 2
+        root = (B + np.sqrt(B ** 2 + 4 * t_static_max * (C + target))) / (2 * t_static_max)
+    # T_dynamic at zero throttle is zero (no thrust without prop speed)
+    idle = target <= 0
+    reachable = idle | (np.isfinite(root) & (root <= 1 + 1e-9))
+    throttle = np.where(reachable, np.minimum(np.where(idle, 0.0, root), 1.0), np.nan)
+    return throttle, reachable
+
+
+def shaft_power(rpm, NB, Pc, diameter, pitch, density_ratio=1.0):
+    """
+    Mechanical power (W) the propeller absorbs at `rpm`.
+    """
+    return density_ratio * np.sqrt(np.maximum(NB - 1, 0)) * Pc * POWER_COEFF * diameter ** 4 * pitch * rpm ** 3
+
+
+def motor_current(pm, rpm, kt, i0):
+    """
+    Shaft torque (Nm) and motor current (A) delivering `pm` watts at `rpm`.
+    """
+    torque = np.where(rpm == 0, 0.0, pm * 60 / (2 * math.pi * np.where(rpm == 0, 1.0, rpm)))
+    return torque, i0 + torque / kt
+
+
+def solve_operating_point(rpm_max, throttle, v, NB, Tc, Pc, eff, diameter, pitch, kt, kv, i0, volt, R_tot,
+                          density_ratio=1.0):
+    """
+    Every analytic output of a drive from one full-throttle rpm solve `rpm_max` (see max_rpm), at
+    rpm = rpm_max * throttle and airspeed `v`. All arguments broadcast against each other.
+
+    Returns:
+        dict: 'rpm', 'T_static' and 'T_dynamic' (g), 'Pm' (shaft W), 'Torque' (Nm), 'CurrentDraw'
+        (motor A), 'P_electric' (W drawn from the pack, resistive losses included), 'BatteryCurrent'
+        (P_electric / volt; equals the motor current at full throttle) and 'efficiency' (Pm / P_electric).
+    """
+    rpm = rpm_max * throttle
+    t_static = static_thrust(rpm, NB, Tc, eff, diameter, pitch, density_ratio)
+    t_dynamic = dynamic_thrust(t_static, rpm, pitch, v)
+    pm = shaft_power(rpm, NB, Pc, diameter, pitch, density_ratio)
+    torque, current = motor_current(pm, rpm, kt, i0)
+    p_electric = current * (rpm / kv + current * R_tot)
+    drawing = p_electric > 0
+    with np.errstate(invalid='ignore'):
+        battery_current = np.where(drawing, p_electric / volt, 0.0)
+        efficiency = np.where(drawing, pm / np.where(drawing, p_electric, 1.0), 0.0)
+    return {'rpm': rpm, 'T_static': t_static, 'T_dynamic': t_dynamic, 'Pm': pm, 'Torque': torque,
+            'CurrentDraw': current, 'P_electric': p_electric, 'BatteryCurrent': battery_current,
+            'efficiency': efficiency}
+
+
+def _as_output(values):
+    """
+    Returns 0-d results as plain floats so scalar callers keep getting scalars.
+    """
+    return float(values) if np.ndim(values) == 0 else values
+
+
+def schedule_ecalc(propulsions, max_workers=1):
+    """
+    Schedules the eCalc runs of many Propulsion objects in the background and returns at once.
+
+    Each object's `results` then waits for its own run. calc.ecalc borrows a browser from
+    calc.session_pool(), which holds one session by default, so runs are serialized by default
+    (`max_workers=1`); raise both together to run several at once.
+
+    Returns:
+        list: The futures of the scheduled runs.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = [future for future in (propulsion.prefetch_ecalc(executor) for propulsion in propulsions)
+               if future is not None]
+    executor.shutdown(wait=False)
+    return futures
+
+
+class PropulsionBatch:
+    """
+    The analytic Propulsion model over component batches (see component_batch.py): entry i of
+    every output is the drive made of entry i of each batch. A batch of length 1 is shared by
+    all entries, e.g. one battery against many motors.
+
+    Where the motor cannot turn the propeller the outputs are NaN instead of None.
+    """
+    __slots__ = ('battery', 'motor', 'esc', 'propeller', 'R_tot', 'vcruise')
+
+    def __init__(self, battery: BatteryBatch, motor: MotorBatch, esc: EscBatch, propeller: PropellerBatch, vcruise=0.0):
+        self.battery = battery
+        self.motor = motor
+        self.esc = esc
+        self.propeller = propeller
+        self.R_tot = battery.Rin + motor.Rin + esc.Rin
+        self.vcruise = vcruise
+
+    @classmethod
+    def from_propulsions(cls, propulsions):
+        """
+        Batches the components of Propulsion objects, e.g. to evaluate many of them at once.
+        """
+        return cls(BatteryBatch.from_objects(p.battery for p in propulsions),
+                   MotorBatch.from_objects(p.motor for p in propulsions),
+                   EscBatch.from_objects(p.esc for p in propulsions),
+                   PropellerBatch.from_objects(p.propeller for p in propulsions),
+                   vcruise=np.array([p.vcruise for p in propulsions], dtype=float))
+
+    def __len__(self):
+        return len(self.R_tot)
+
+    def max_rpm(self, density_ratio=1.0):
+        prop, motor = self.propeller, self.motor
+        return max_rpm_array(prop.NB, prop.Pc * density_ratio, prop.diameter, prop.pitch, motor.kt, motor.kv,
+                             motor.i0, self.battery.volt, self.R_tot)
+
+    def operating_point(self, throttle=1.0, v=None, density_ratio=1.0):
+        """
+        Same outputs as Propulsion.operating_point for every entry; `throttle` and `v` are scalars
+        or one value per entry.
+        """
+        throttle = np.asarray(throttle, dtype=float)
+        if np.any((throttle < 0) | (throttle > 1)):
+            raise ValueError("Throttle must be between 0 and 1.")
+        prop, motor = self.propeller, self.motor
+        v = np.asarray(self.vcruise if v is None else v, dtype=float)
+        return solve_operating_point(self.max_rpm(density_ratio), throttle, v, prop.NB, prop.Tc, prop.Pc, prop.eff,
+                                     prop.diameter, prop.pitch, motor.kt, motor.kv, motor.i0, self.battery.volt,
+                                     self.R_tot, density_ratio)
+
+    analytic_outputs = operating_point
+
+    def throttle_for_thrust(self, v, t_dynamic_target, density_ratio=1.0):
+        """
+        Per-entry throttle and `reachable` mask for a dynamic thrust target, as in Propulsion.throttle_for_thrust.
+        """
+        prop = self.propeller
+        rpm_max = self.max_rpm(density_ratio)
+        t_static_max = static_thrust(rpm_max, prop.NB, prop.Tc, prop.eff, prop.diameter, prop.pitch, density_ratio)
+        return throttle_for_thrust_array(t_static_max, rpm_max, prop.pitch, np.asarray(v, dtype=float),
+                                         np.asarray(t_dynamic_target, dtype=float))
+
+
 class Propulsion:
     def __init__(self,airplane:Airplane,operatingPoint:OperatingPoint,battery:Battery=None,motor:Motor=None,esc:ESC=None,propeller:Propeller=None,AnalysisMethod:str = 'ecalc',**kwargs):
         self.battery = battery
         # Dynamically delegate battery properties with a prefix
         if battery:
-            for batt_name, batt_value in vars(battery).items():
+            for batt_name, batt_value in component_fields(battery).items():
                 setattr(self, f"battery_{batt_name}", batt_value)
         else: self.battery_Rin = 0
         self.motor = motor
         if motor:
-            for motor_name, motor_value in vars(motor).items():
+            for motor_name, motor_value in component_fields(motor).items():
                 setattr(self, f"motor_{motor_name}", motor_value)
         else: self.motor_Rin = 0
 
         self.esc = esc
         if esc:
-            for esc_name, esc_value in vars(esc).items():
+            for esc_name, esc_value in component_fields(esc).items():
                 setattr(self, f"esc_{esc_name}", esc_value)
         else: self.esc_Rin = 0
         self.propeller = propeller
         if propeller:
-            for prop_name, prop_value in vars(propeller).items():
+            for prop_name, prop_value in component_fields(propeller).items():
                 setattr(self, f"propeller_{prop_name}", prop_value)
 
         self.R_tot = self.motor_Rin + self.esc_Rin + self.battery_Rin
@@ -45,8 +282,13 @@ class Propulsion:
                                 'propType',
                                 ]
         args_for_ecalc = {k: v for k, v in kwargs.items() if k in expected_args_ecalc}
+        # eCalc is only run when `results` is first used (or when prefetch_ecalc starts it early)
+        self._ecalc_args = None
+        self._ecalc_future = None
+        self._results = None
+        self._results_ready = False
         if self.AnalysisMethod.lower() == 'ecalc':
-            self.results = self.run_ecalc(
+            self._ecalc_args = dict(
                 modelweight=args_for_ecalc['modelweight'],
                 wingspan=airplane.b_ref*1000,
                 wingarea=airplane.s_ref*100,
@@ -61,74 +303,69 @@ class Propulsion:
                 propType=args_for_ecalc['propType'],
             )
 
+    @property
+    def results(self):
+        """
+        The eCalc results for this propulsion set, computed on first access and cached.
+        If `prefetch_ecalc` started the run in the background, this waits for it.
+        """
+        if not self._results_ready:
+            if self._ecalc_args is None:
+                raise AttributeError("eCalc results are only available with AnalysisMethod='ecalc'")
+            if self._ecalc_future is not None:
+                self._results = self._ecalc_future.result()
+            else:
+                self._results = self.run_ecalc(**self._ecalc_args)
+            self._results_ready = True
+        return self._results
+
+    @results.setter
+    def results(self, results):
+        self._results = results
+        self._results_ready = True
+
+    def prefetch_ecalc(self, executor):
+        """
+        Starts the eCalc run on `executor` (e.g. a ThreadPoolExecutor) without waiting for it.
+
+        Returns:
+            concurrent.futures.Future or None: The pending run, or None if there is nothing to run.
+        """
+        if self._ecalc_args is None or self._results_ready:
+            return None
+        if self._ecalc_future is None:
+            self._ecalc_future = executor.submit(self.run_ecalc, **self._ecalc_args)
+        return self._ecalc_future
+
     def getMaxRPM(self):
-        rpm_100 = symbols('rpm_100', positive=True)
-        T1 = sqrt(self.propeller_NB - 1) * self.propeller_Pc * 4.019e-15 * self.propeller_diameter**4 * self.propeller_pitch * (rpm_100)**3
-        T2 = 2 * math.pi * rpm_100 * self.motor_kt * ((self.battery_volt - rpm_100 / self.motor_kv) / self.R_tot - self.motor_i0) / 60
-        equation = T1 - T2
-        solutions = solve(equation, rpm_100)
-        # Assuming we are looking for a real, positive solution, if multiple exist
-        for sol in solutions:
-            if sol.is_real and sol > 0:
-                return float(sol)
-        return None # Or raise an error if no suitable solution is found
+        return max_rpm(self.propeller_NB, self.propeller_Pc, self.propeller_diameter, self.propeller_pitch,
+                       self.motor_kt, self.motor_kv, self.motor_i0, self.battery_volt, self.R_tot)
+
+    def _throttle_array(self, throttle):
+        throttle = np.asarray(throttle, dtype=float)
+        if np.any((throttle < 0) | (throttle > 1)):
+            raise ValueError("Throttle must be between 0 and 1.")
+        return throttle
 
     def T_static(self, throttle=1, ecalc=1):
         """
         Calculates static thrust based on throttle.
+        `throttle` may be a scalar or an array; the result has the same shape.
         """
         if ecalc>0:
             return self._Tstaitc_ecalc()
-        else:
-            if not (0 <= throttle <= 1):
-                raise ValueError("Throttle must be between 0 and 1.")
-
-            RPM_100 = self.getMaxRPM()
-            if RPM_100 is None:
-                return None
-
-            # Ensure propeller_NB - 1 is not negative for sqrt
-            if (self.propeller_NB - 1) < 0:
-                return 0
-
-            t_static = (self.propeller_eff * np.sqrt(self.propeller_NB - 1) * self.propeller_Tc *
-                        2.691e-9 * self.propeller_diameter ** 3 * self.propeller_pitch *
-                        (RPM_100 * throttle) ** 2)
-            return t_static
+        return self._analytic_output('T_static', throttle)
 
     def T_dynamic(self, v=None, throttle=1,ecalc=1):
         """
         Calculates dynamic thrust based on velocity and throttle.
         Uses the provided formula.
+        `v` and `throttle` may be scalars or arrays and broadcast against each other, e.g.
+        `T_dynamic(v[None, :], throttle[:, None], ecalc=0)` gives a throttle x velocity map.
         """
         if ecalc>0:
             return self._Tdynamic_ecalc()
-        else:
-            if not v:
-                v = self.vcruise
-            RPM_100 = self.getMaxRPM()
-            if RPM_100 is None:
-                return None
-
-            if not (0 <= throttle <= 1):
-                raise ValueError("Throttle must be between 0 and 1.")
-
-            rpm = RPM_100 * throttle
-            t_static = self.T_static(throttle, ecalc=0)
-            if t_static is None:
-                return None
-
-            vp = self.propeller_pitch * 0.0254 * rpm / 60
-
-            if abs(vp) < 1e-9:  # Check if vp is practically zero
-                return t_static if abs(
-                    v) < 1e-9 else 0.0  # If v is also zero, it's static. Otherwise, no thrust if no prop speed.
-
-            term2_val = (31 * t_static) / (130 * vp ** 2) * v ** 2
-            term3_val = 0.4543 * v * t_static / vp
-
-            t_dynamic = t_static - term2_val - term3_val
-            return t_dynamic
+        return self._analytic_output('T_dynamic', throttle, v)
 
     def throttle(self, v=None, t_dynamic_target=None, tolerance=0.01,
                      max_iterations=200):
@@ -197,38 +434,164 @@ class Propulsion:
         else:
             return Warning(f"Couldn't Converge T_dynamic given {t_dynamic_target}, calculated T_dyamic = {self.T_dynamic(v, final_throttle, ecalc=0)}")
 
+    def throttle_for_thrust(self, v, t_dynamic_target):
+        """
+        Throttle needed for each (velocity, dynamic thrust) pair, solved in closed form for whole arrays.
+
+        The analytic T_dynamic is a quadratic in throttle (see throttle_for_thrust_array), so no
+        iteration is needed.
+
+        Args:
+            v (array-like): Velocities in m/s (broadcast against `t_dynamic_target`).
+            t_dynamic_target (array-like): Target dynamic thrusts, in the units of T_dynamic.
+
+        Returns:
+            (np.ndarray, np.ndarray): Throttle settings and a boolean `reachable` mask. Targets at or
+            below the zero-throttle thrust give throttle 0; targets above full-throttle thrust are
+            unreachable and give NaN.
+        """
+        v, target = np.broadcast_arrays(np.asarray(v, dtype=float), np.asarray(t_dynamic_target, dtype=float))
+        throttle = np.full(v.shape, np.nan)
+        reachable = np.zeros(v.shape, dtype=bool)
+
+        full = self.operating_point(1.0, 0.0)
+        if full is None or full['T_static'] <= 0:
+            return throttle, reachable
+        return throttle_for_thrust_array(full['T_static'], full['rpm'], self.propeller_pitch, v, target)
+
     def Pm(self, throttle=1):
         if self.AnalysisMethod == 'ecalc':
             return self.results['Motor_mechPower_W']
-        else:
-            RPM_100 = self.getMaxRPM()
-            if RPM_100 is None:
-                return None
-            pm = sqrt(self.propeller_NB - 1) * self.propeller_Pc * 4.019e-15 * self.propeller_diameter**4 * self.propeller_pitch * (RPM_100 * throttle)**3
-            return pm
+        return self._analytic_output('Pm', throttle)
 
     def Torque(self, throttle=1):
-        if self.AnalysisMethod == 'ecalc':
-            throttle = self.results['Motor_Total_Torque']
+        if self.AnalysisMethod != 'ecalc':
+            return self._analytic_output('Torque', throttle)
+        throttle = self.results['Motor_Total_Torque']
         RPM_100 = self.getMaxRPM()
         if RPM_100 is None:
             return None
-        pm = self.Pm(throttle)
-        if pm is None:
-            return None
-        if RPM_100 * throttle == 0:
-            return 0
-        torque = pm * 60 / (2 * math.pi * RPM_100 * throttle)
-        return torque
+        rpm = RPM_100 * np.asarray(throttle, dtype=float)
+        torque = np.where(rpm == 0, 0.0, self.Pm(throttle) * 60 / (2 * math.pi * np.where(rpm == 0, 1.0, rpm)))
+        return _as_output(torque)
 
     def CurrentDraw(self, throttle=1):
         if self.AnalysisMethod == 'ecalc':
             throttle = self._throttle_ecalc()
-        torque = self.Torque(throttle)
-        if torque is None:
+        return self._analytic_output('CurrentDraw', throttle)
+
+    def _analytic_output(self, name, throttle, v=None):
+        outputs = self.operating_point(throttle, v)
+        return None if outputs is None else _as_output(outputs[name])
+
+    def maps(self, throttle, v=None):
+        """
+        Analytic thrust, power and current maps over a throttle x velocity grid in one vectorized evaluation.
+
+        Args:
+            throttle (array-like): Throttle settings (0-1), the rows of every map.
+            v (array-like or None): Velocities in m/s, the columns; defaults to the cruise speed.
+
+        Returns:
+            dict or None: 'T_static', 'Pm', 'Torque' and 'CurrentDraw' of shape (len(throttle), 1)
+            and 'T_dynamic' of shape (len(throttle), len(v)); None if there is no RPM solution.
+        """
+        throttle = np.atleast_1d(np.asarray(throttle, dtype=float))[:, None]
+        v = np.atleast_1d(np.asarray(self.vcruise if v is None else v, dtype=float))[None, :]
+        outputs = self.operating_point(throttle, v)
+        if outputs is None:
+            return None
+        maps = {name: outputs[name][:, :1] for name in ('T_static', 'Pm', 'Torque', 'CurrentDraw')}
+        maps['T_dynamic'] = outputs['T_dynamic']
+        return maps
+
+    def operating_point(self, throttle=1, v=None, density_ratio=1.0):
+        """
+        Solves the motor/propeller equilibrium once and returns every analytic output at broadcast
+        (throttle, v) arrays: see solve_operating_point for the fields. T_static, T_dynamic, Pm,
+        Torque and CurrentDraw (with ecalc=0) are read from it, so they always agree.
+
+        `density_ratio` (air density / sea-level density) scales the propeller's thrust and load
+        torque; the full-throttle RPM is re-balanced against the lighter load.
+
+        Returns:
+            dict or None: The outputs, or None without an RPM solution.
+        """
+        RPM_100 = max_rpm(self.propeller_NB, self.propeller_Pc * density_ratio, self.propeller_diameter,
+                          self.propeller_pitch, self.motor_kt, self.motor_kv, self.motor_i0, self.battery_volt,
+                          self.R_tot)
+        if RPM_100 is None:
             return None
-        current = self.motor_i0 + torque / self.motor_kt
-        return current
+        throttle = self._throttle_array(throttle)
+        v, throttle = np.broadcast_arrays(np.asarray(self.vcruise if v is None else v, dtype=float), throttle)
+        return solve_operating_point(RPM_100, throttle, v, self.propeller_NB, self.propeller_Tc, self.propeller_Pc,
+                                     self.propeller_eff, self.propeller_diameter, self.propeller_pitch, self.motor_kt,
+                                     self.motor_kv, self.motor_i0, self.battery_volt, self.R_tot, density_ratio)
+
+    analytic_outputs = operating_point
+
+    def component_key(self):
+        """
+        The parameters the analytic model depends on, identifying this component set.
+        """
+        return tuple(float(value) for value in (
+            self.battery_volt, self.R_tot, self.motor_kv, self.motor_kt, self.motor_i0,
+            self.propeller_NB, self.propeller_Pc, self.propeller_Tc, self.propeller_eff,
+            self.propeller_diameter, self.propeller_pitch))
+
+    def performance_table(self, velocity=None, throttle=None, altitude=None, source='analytic', ecalc_points=None):
+        """
+        Returns a PerformanceTable for this component set, building it on first use.
+
+        Tables are kept on the instance and persisted under resources/ecalcData/performance_tables,
+        keyed by the component set and the grid, so later runs (and other Propulsion objects with
+        the same components) load them instead of re-evaluating the model.
+
+        Args:
+            velocity, throttle, altitude (array-like or None): Grid axes; default to 0-40 m/s in
+                41 steps, 0-1 in 51 steps and 0-3000 m in 7 steps.
+            source (str): 'analytic' to evaluate `operating_point` on the grid, or 'ecalc' to
+                tabulate stored eCalc results given as `ecalc_points`
+                (see PerformanceTable.from_ecalc_results).
+
+        Query the table with `table(velocity, throttle, altitude)`.
+        """
+        if source == 'ecalc':
+            points = [(float(v), float(alt), results) for v, alt, results in ecalc_points]
+            key = table_key('ecalc', self.component_key(),
+                            tuple((v, alt, tuple(results.items())) for v, alt, results in points))
+            build = lambda: PerformanceTable.from_ecalc_results(points, key=key)
+        else:
+            velocity = np.linspace(0, 40, 41) if velocity is None else np.asarray(velocity, dtype=float)
+            throttle = np.linspace(0, 1, 51) if throttle is None else np.asarray(throttle, dtype=float)
+            altitude = np.linspace(0, 3000, 7) if altitude is None else np.asarray(altitude, dtype=float)
+            key = table_key('analytic', self.component_key(), tuple(velocity), tuple(throttle), tuple(altitude))
+            build = lambda: self._analytic_table(velocity, throttle, altitude, key)
+
+        tables = self.__dict__.setdefault('_performance_tables', {})
+        if key not in tables:
+            table = PerformanceTable.load(key)
+            if table is None:
+                table = build()
+                try:
+                    table.save()
+                except OSError as e:
+                    print(f"Warning: could not persist performance table {key}: {e}")
+            tables[key] = table
+        return tables[key]
+
+    def _analytic_table(self, velocity, throttle, altitude, key):
+        sea_level_density = Atmosphere(altitude=0).density()
+        values = {}
+        for k, alt in enumerate(altitude):
+            outputs = self.operating_point(throttle[None, :], velocity[:, None],
+                                            density_ratio=Atmosphere(altitude=alt).density() / sea_level_density)
+            if outputs is None:
+                raise ValueError("No full-throttle RPM solution for this component set")
+            for name, grid in outputs.items():
+                values.setdefault(name, np.zeros((len(velocity), len(throttle), len(altitude))))[:, :, k] = grid
+        axes = {'velocity': velocity, 'throttle': throttle, 'altitude': altitude}
+        return PerformanceTable(axes, values, key=key, source='analytic')
 
     # This section for automating calculations using ecalc
     def run_ecalc(self,
@@ -284,9 +647,11 @@ if __name__ == '__main__':
     import pandas as pd
     import re
 
-    batteries_data = pd.read_pickle(r'resources/ecalcData/pkl_data/batteries.pkl')
-    esc_data = pd.read_pickle(r'resources/ecalcData/pkl_data/esc.pkl')
-    motors_data = pd.read_pickle(r'resources/ecalcData/pkl_data/motors.pkl')
+    from catalog import load_catalog
+
+    batteries_data = load_catalog('batteries')
+    esc_data = load_catalog('esc')
+    motors_data = load_catalog('motors')
 
     Battery_row = batteries_data[batteries_data['text'] == 'LiPo 4200mAh - 80/120C']
     Battery1 = Battery(n_cells=6, p_cells=1, voltpercell=float(Battery_row['cell_volt'].iloc[0]), cell_Rin=float(Battery_row['Rin'].iloc[0]))
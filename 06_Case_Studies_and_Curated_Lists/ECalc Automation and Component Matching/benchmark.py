@@ -0,0 +1,237 @@
+import argparse
+import json
+import os
+import platform
+import time
+
+import numpy as np
+import pandas as pd
+
+from Battery import Battery, find_best_match as find_best_battery, match_batteries
+from Motor import Motor, match_motors
+from catalog import ComponentCatalog, load_catalog
+from match_data import retrieve_battery
+from motor_index import clean_model_name, motor_name_index
+
+# --- Matching Benchmarks ---
+#
+# Times the component-matching paths against the bundled pkl_data catalogs on synthetic
+# inventories shaped like the 'Available Batteries' and 'Available Motors' sheets. Nothing
+# is read from the inventory workbook and nothing touches the network.
+#
+#   python benchmark.py                     run and compare against the baseline
+#   python benchmark.py --save-baseline     run and record the results as the new baseline
+
+BASELINE_FILE = r'resources/benchmarks/matching_baseline.json'
+INVENTORY_SIZES = (10, 1_000, 100_000)
+# Per-row paths are timed on at most this many rows of each inventory and reported per row
+MAX_PER_ROW_SAMPLE = 1_000
+# A benchmark is flagged when it is this many times slower than its baseline
+REGRESSION_FACTOR = 1.5
+# ... and at least this much slower in absolute terms, so timer noise on tiny timings is ignored
+REGRESSION_MIN_SECONDS = 1e-3
+
+
+def synthetic_battery_inventory(n_rows, seed=0):
+    """
+    An 'Available Batteries'-like sheet: C-rating and capacity drawn around real catalog
+    batteries (most within the matching window, some not), plus cell count and battery number.
+    """
+    rng = np.random.default_rng(seed)
+    catalog = load_catalog('batteries').dropna(subset=['crate_max', 'capacity'])
+    picks = catalog.iloc[rng.integers(0, len(catalog), n_rows)]
+    return pd.DataFrame({
+        'Battery No.': [f'B{i:06d}' for i in range(n_rows)],
+        'No. of cells': rng.choice([2, 3, 4, 6], n_rows).astype(float),
+        'C-rating': np.round(picks['crate_max'].to_numpy() + rng.normal(0, 8, n_rows)).clip(1),
+        'Capacity': np.round(picks['capacity'].to_numpy() * rng.uniform(0.8, 1.2, n_rows), -1),
+    })
+
+
+def _perturb(name, rng):
+    """
+    Drops one character and changes case, giving a name that only matches fuzzily.
+    """
+    i = rng.integers(0, len(name))
+    name = name[:i] + name[i + 1:]
+    return name.upper() if rng.random() < 0.5 else name.lower()
+
+
+def synthetic_motor_inventory(n_rows, seed=0, distinct_models=200):
+    """
+    An 'Available Motors'-like sheet. Models are drawn from a pool of `distinct_models` names
+    (real inventories repeat the same motors) made of exact catalog names, names without the
+    '(Kv)' suffix, perturbed names and names that are not in the catalog.
+    """
+    rng = np.random.default_rng(seed)
+    catalog = load_catalog('motors')
+    types = catalog['type'].dropna().to_numpy()
+    kvs = catalog['Kv'].to_numpy()
+
+    pool, pool_kv = [], []
+    for i in range(distinct_models):
+        position = rng.integers(0, len(types))
+        kind = i % 4
+        if kind == 0:
+            model = types[position]
+        elif kind == 1:
+            model = clean_model_name(types[position])
+        elif kind == 2:
+            model = _perturb(types[position], rng)
+        else:
+            model = f'Unlisted {rng.integers(100, 999)}-{rng.integers(1000, 9999)}'
+        pool.append(model)
+        pool_kv.append(float(kvs[position]))
+
+    rows = rng.integers(0, distinct_models, n_rows)
+    return pd.DataFrame({
+        'Model': np.array(pool, dtype=object)[rows],
+        'Kv': np.array(pool_kv)[rows],
+    })
+
+
+def _timed(func, repeat=1):
+    """
+    Returns the best wall time of `repeat` calls to `func`, in seconds.
+    """
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _per_row(func, inventory_df, repeat):
+    """
+    Calls `func(row)` for the first MAX_PER_ROW_SAMPLE rows and returns seconds per row.
+    """
+    rows = [row for _, row in inventory_df.head(MAX_PER_ROW_SAMPLE).iterrows()]
+    return _timed(lambda: [func(row) for row in rows], repeat) / len(rows)
+
+
+def _cold_load(catalog_name):
+    ComponentCatalog.get(catalog_name).invalidate()
+    load_catalog(catalog_name)
+
+
+def _motor_filter_and_fuzzy(inventory_df):
+    """
+    Splits Motor.find_best_match into its stages: the exact/cleaned-name lookups ('filter')
+    and the shortlisted fuzzy match on the rows they miss ('fuzzy'). Returns seconds per row.
+    """
+    name_index = motor_name_index()
+    models = [m for m in inventory_df['Model'].head(MAX_PER_ROW_SAMPLE) if isinstance(m, str)]
+    missed = []
+
+    def lookups():
+        missed.clear()
+        for model in models:
+            if name_index.exact_position(model) is None and name_index.cleaned_position(model) is None:
+                missed.append(model)
+
+    filter_time = _timed(lookups)
+    fuzzy_time = _timed(lambda: [name_index.best_fuzzy(model) for model in missed])
+    return filter_time / len(models), fuzzy_time / len(models)
+
+
+def run_benchmarks(sizes=INVENTORY_SIZES, repeat=3, seed=0):
+    """
+    Runs every benchmark and returns {name: seconds}. Names are '<path>/<stage>/<rows>'.
+    Per-row paths report seconds per inventory row, batch paths and loads the total time.
+    """
+    results = {}
+
+    # Load stage: unpickling (or reading the columnar store) and building the motor name index
+    results['battery/load/cold'] = _timed(lambda: _cold_load('batteries'), repeat)
+    results['motor/load/cold'] = _timed(lambda: _cold_load('motors'), repeat)
+    results['motor/load/name_index'] = _timed(motor_name_index)
+    results['battery/load/warm'] = _timed(lambda: load_catalog('batteries'), repeat)
+    results['motor/load/warm'] = _timed(lambda: load_catalog('motors'), repeat)
+
+    for n_rows in sizes:
+        batteries = synthetic_battery_inventory(n_rows, seed)
+        motors = synthetic_motor_inventory(n_rows, seed)
+
+        results[f'battery/filter/{n_rows}'] = _per_row(find_best_battery, batteries, repeat)
+        results[f'battery/from_inventory/{n_rows}'] = _per_row(Battery.from_inventory, batteries, repeat)
+        results[f'retrieve_battery/filter/{n_rows}'] = _per_row(retrieve_battery, batteries, repeat)
+        results[f'battery/batch/{n_rows}'] = _timed(lambda: match_batteries(batteries), repeat)
+
+        filter_time, fuzzy_time = _motor_filter_and_fuzzy(motors)
+        results[f'motor/filter/{n_rows}'] = filter_time
+        results[f'motor/fuzzy/{n_rows}'] = fuzzy_time
+        results[f'motor/from_inventory/{n_rows}'] = _per_row(Motor.from_inventory, motors, 1)
+        results[f'motor/batch/{n_rows}'] = _timed(lambda: match_motors(motors, max_workers=1))
+
+    return results
+
+
+def load_baseline(file_path=BASELINE_FILE):
+    try:
+        with open(file_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(results, file_path=BASELINE_FILE):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    baseline = {
+        'recorded': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'machine': f'{platform.node()} ({platform.processor() or platform.machine()}, Python {platform.python_version()})',
+        'results': results,
+    }
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
+
+
+def compare(results, baseline, factor=REGRESSION_FACTOR):
+    """
+    Returns [(name, baseline seconds, seconds)] for every benchmark more than `factor` times
+    (and REGRESSION_MIN_SECONDS) slower than its baseline.
+    """
+    regressions = []
+    for name, seconds in results.items():
+        reference = baseline['results'].get(name)
+        if reference and seconds > factor * reference and seconds - reference > REGRESSION_MIN_SECONDS:
+            regressions.append((name, reference, seconds))
+    return regressions
+
+
+def _format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:8.2f} {unit}'
+    return f'{seconds / 1e-9:8.2f} ns'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Time the component-matching paths on synthetic inventories.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(INVENTORY_SIZES), help='inventory sizes in rows')
+    parser.add_argument('--repeat', type=int, default=3, help='repetitions per benchmark; the best time is kept')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='record these results as the new baseline')
+    parser.add_argument('--factor', type=float, default=REGRESSION_FACTOR, help='slowdown flagged as a regression')
+    args = parser.parse_args()
+
+    results = run_benchmarks(sizes=args.sizes, repeat=args.repeat)
+    baseline = load_baseline(args.baseline)
+
+    print(f"\n{'benchmark':<36}{'time':>12}{'baseline':>12}")
+    for name, seconds in results.items():
+        reference = baseline['results'].get(name) if baseline else None
+        print(f"{name:<36}{_format_seconds(seconds):>12}{_format_seconds(reference) if reference else '-':>12}")
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"\nBaseline written to {args.baseline}")
+    elif baseline:
+        regressions = compare(results, baseline, args.factor)
+        for name, reference, seconds in regressions:
+            print(f"Regression: {name} took {_format_seconds(seconds).strip()} "
+                  f"(baseline {_format_seconds(reference).strip()}, {seconds / reference:.1f}x)")
+        if not regressions:
+            print(f"\nNo regressions against {args.baseline} (recorded {baseline['recorded']})")
+    else:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one")
@@ -5,15 +5,23 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
+from selenium.common.exceptions import WebDriverException
+import atexit
 import os
+import socket
+import subprocess
+import threading
+from collections import deque
+from contextlib import contextmanager
 from time import sleep, time
 import pandas as pd
 import re
 import glob
-import shutil
 
 from fuzzywuzzy import fuzz
 
+from ecalc_csv import parse_ecalc_csv
+
 from selenium.webdriver.remote.webelement import WebElement
 
 
@@ -56,201 +64,327 @@ def select_closest_option(select_element: WebElement, desired_text: str, thresho
             f"No suitable option found for '{desired_text}' in dropdown. Best match: '{best_match_text}' (Score: {best_score})")
 
 
-def ecalc(
-        modelweight,
-        wingspan, wingarea,
-        elevation,
-
-        batteryType, batterySeriesCells, batteryParallelCells,
-        escType,
-        motorManuf, motorType,
-        propType, propDiameter, propPitch, propNumberOfBlades, vCruise=0,
-        project_name="ecalcproject"
-):
-    def parse_ecalc_csv(file_path, max_rpm, torque):
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        data = {}
-
-        def get_section_lines(start_marker, end_marker, full_lines):
-            section_lines = []
-            in_section = False
-            for line in full_lines:
-                if start_marker in line:
-                    in_section = True
-                    section_lines.append(line)
-                    continue
-
-                if in_section:
-                    if end_marker in line:
-                        break
-                    section_lines.append(line)
-            return section_lines
-
-        def get_value_from_line(lines_list, label_start, column_index, is_float=True, default_val=None):
-            for line in lines_list:
-                if line.strip().startswith(label_start):
-                    parts = line.strip().split(';')
-                    if len(parts) > column_index:
-                        value_str = parts[column_index].strip()
-                        value_str = re.sub(r'[a-zA-Z%°/]+$', '', value_str).strip()
-                        value_str = value_str.replace(',', '')
-
-                        if is_float and value_str not in ('-', ''):
-                            try:
-                                return float(value_str)
-                            except ValueError:
-                                return default_val
-                        return value_str if value_str not in ('-', '') else default_val
-            return default_val
-
-        # --- Project Name ---
-        data['Project_Name'] = get_value_from_line(lines, "Project Name;;", column_index=2, is_float=False)
-
-        # --- Battery Section ---
-        battery_lines = get_section_lines("Battery;;", "Controller;;", lines)
-        data['Battery_Type'] = get_value_from_line(battery_lines, "Battery;;", column_index=2, is_float=False)
-        data['Battery_Configuration'] = get_value_from_line(battery_lines, "Configuration:;;", column_index=2,
-                                                            is_float=False)
-        data['Battery_Load_C'] = get_value_from_line(battery_lines, "Load:;C;", column_index=2)
-        data['Battery_Voltage_V'] = get_value_from_line(battery_lines, "Voltage:;V;", column_index=2)
-        data['Battery_RatedVoltage_V'] = get_value_from_line(battery_lines, "Rated Voltage:;V;", column_index=2)
-        data['Battery_Energy_Wh'] = get_value_from_line(battery_lines, "Energy:;Wh;", column_index=2)
-        data['Battery_TotalCapacity_mAh'] = get_value_from_line(battery_lines, "Total Capacity:;mAh;", column_index=2)
-        data['Battery_max_discharge_pct'] = get_value_from_line(battery_lines, "max. discharge:;;", column_index=2,
-                                                                is_float=False)
-        data['Battery_UsedCapacity_mAh'] = get_value_from_line(battery_lines, "Used Capacity:;mAh;", column_index=2)
-        data['Battery_min_FlightTime_min'] = get_value_from_line(battery_lines, "min. Flight Time:;min;",
-                                                                 column_index=2)
-        data['Battery_MixedFlightTime_min'] = get_value_from_line(battery_lines, "Mixed Flight Time:;min;",
-                                                                  column_index=2)
-        data['Battery_Weight_g'] = get_value_from_line(battery_lines, "Weight:;g;", column_index=2)
-
-        # --- Controller Section ---
-        controller_lines = get_section_lines("Controller;;", "Motor @ Maximum;;", lines)
-        data['Controller_Type'] = get_value_from_line(controller_lines, "Controller;;", column_index=2, is_float=False)
-        data['Controller_Current_A_cont'] = get_value_from_line(controller_lines, "Current:;A cont.;", column_index=2)
-        data['Controller_Current_A_max'] = get_value_from_line(controller_lines, ";A max;", column_index=2)
-        data['Controller_Weight_g'] = get_value_from_line(controller_lines, "Weight:;g;", column_index=2)
-        data['Controller_BatteryExtensionWire_Type'] = get_value_from_line(controller_lines,
-                                                                           "Battery extension Wire:;;", column_index=2,
-                                                                           is_float=False)
-
-        bat_wire_length_val = None
-        start_search_bat_wire = False
-        for line in controller_lines:
-            if "Battery extension Wire:;;" in line:
-                start_search_bat_wire = True
-            if start_search_bat_wire and "Length:;mm;" in line:
-                bat_wire_length_val = get_value_from_line([line], "Length:;mm;", column_index=2)
-                start_search_bat_wire = False  # Reset for the next one
-                break
-        data['Controller_BatWire_Length_mm'] = bat_wire_length_val if bat_wire_length_val is not None else 0.0
-
-        data['Controller_MotorExtensionWire_Type'] = get_value_from_line(controller_lines, "Motor extension Wire:;;",
-                                                                         column_index=2, is_float=False)
-
-        mot_wire_length_val = None
-        start_search_mot_wire = False
-        for line in controller_lines:
-            if "Motor extension Wire:;;" in line:
-                start_search_mot_wire = True
-            if start_search_mot_wire and "Length:;mm;" in line:
-                mot_wire_length_val = get_value_from_line([line], "Length:;mm;", column_index=2)
-                break
-        data['Controller_MotWire_Length_mm'] = mot_wire_length_val if mot_wire_length_val is not None else 0.0
-        # --- Motor @ Maximum Section ---
-        motor_lines = get_section_lines("Motor @ Maximum;;", "Propeller", lines)
-        data['Motor_Type'] = get_value_from_line(motor_lines, "Motor @ Maximum;;", column_index=2, is_float=False)
-        data['Motor_GearRatio'] = get_value_from_line(motor_lines, "Gear Ratio:;: 1;", column_index=2)
-        data['Motor_Weight_g'] = get_value_from_line(motor_lines, "Weight:;g;", column_index=2)
-        data['Motor_Current_A'] = get_value_from_line(motor_lines, "Current:;A;", column_index=2)
-        data['Motor_Voltage_V'] = get_value_from_line(motor_lines, "Voltage:;V;", column_index=2)
-        data['Motor_Revolutions_rpm'] = get_value_from_line(motor_lines, "Revolutions*:", column_index=2)
-        data['Motor_electricPower_W'] = get_value_from_line(motor_lines, "electric Power:;W;", column_index=2)
-        data['Motor_mechPower_W'] = get_value_from_line(motor_lines, "mech. Power:;W;", column_index=2)
-        data['Motor_Efficiency_pct'] = get_value_from_line(motor_lines, "Efficiency:;%;", column_index=2)
-        data['Motor_estTemperature_C'] = get_value_from_line(motor_lines, "est. Temperature:;°C;", column_index=2)
-        data['Motor_Total_Torque'] = torque
-
-        # --- Propeller Section ---
-        propeller_lines = get_section_lines("Propeller;;", "Total Drive;;", lines)
-        data['Propeller_Type'] = get_value_from_line(propeller_lines, "Propeller;;", column_index=2, is_float=False)
-        data['Propeller_NumBlades'] = get_value_from_line(propeller_lines, "# Blades:;;", column_index=2)
-        data['Propeller_StaticThrust_g'] = get_value_from_line(propeller_lines, "Static Thrust:;g;", column_index=2)
-        data['Propeller_Revolutions_rpm'] = get_value_from_line(propeller_lines, "Revolutions*:", column_index=2)
-        data['Propeller_StallThrust_g'] = get_value_from_line(propeller_lines, "Stall Thrust:;g;", column_index=2)
-        data['Propeller_Max_rpm'] = max_rpm
-
-        dynamic_thrust_long = get_value_from_line(propeller_lines,"avail.Thrust @ Flight Speed:;g@km/h;",column_index=2,is_float=False)
-        if dynamic_thrust_long:
-            dynamic_thrust_extracted = float(dynamic_thrust_long.split(" @ ")[0])
-            data['Propeller_availThrust_g_kmh'] = dynamic_thrust_extracted
-        else: #dynamic_thrust is None
-            data['Propeller_availThrust_g_kmh'] = dynamic_thrust_long
-
-        data['Propeller_PitchSpeed_kmh'] = get_value_from_line(propeller_lines, "Pitch Speed:;km/h;", column_index=2)
-        data['Propeller_specificThrust_gW'] = get_value_from_line(propeller_lines, "specific Thrust:;g/W;",
-                                                                  column_index=2)
-
-        # --- Total Drive Section ---
-        total_drive_lines = get_section_lines("Total Drive;;", "Airplane", lines)
-        data['TotalDrive_Weight_g'] = get_value_from_line(total_drive_lines, "Drive Weight:;g;", column_index=2)
-        data['TotalDrive_PowerWeight_W_kg'] = get_value_from_line(total_drive_lines, "Power-Weight:;W/kg;",
-                                                                  column_index=2)
-        data['TotalDrive_ThrustWeight_ratio'] = get_value_from_line(total_drive_lines, "Thrust-Weight:;: 1;",
-                                                                    column_index=2)
-        data['TotalDrive_Current_max_A'] = get_value_from_line(total_drive_lines, "Current @ max:;A;", column_index=2)
-        data['TotalDrive_Pin_max_W'] = get_value_from_line(total_drive_lines, "P(in) @ max:;W;", column_index=2)
-        data['TotalDrive_Pout_max_W'] = get_value_from_line(total_drive_lines, "P(out) @ max:;W;", column_index=2)
-        data['TotalDrive_Efficiency_max_pct'] = get_value_from_line(total_drive_lines, "Efficiency @ max:;%;",
-                                                                    column_index=2)
-
-
-        # --- Airplane Section ---
-        airplane_lines = get_section_lines("Airplane", "Remarks:;;", lines)
-        data['Airplane_NumMotors'] = get_value_from_line(airplane_lines, "# of Motors:;;", column_index=2)
-        data['Airplane_AllUpWeight_g'] = get_value_from_line(airplane_lines, "All-up Weight:;g;", column_index=2)
-        data['Airplane_WingArea'] = get_value_from_line(airplane_lines, "Wing Area:;;", column_index=2, is_float=False)
-        data['Airplane_WingLoad_g_dm2'] = get_value_from_line(airplane_lines, "Wing Load:;g/dm²;", column_index=2)
-        data['Airplane_CubicWingLoad'] = get_value_from_line(airplane_lines, "Cubic Wing Load:;;", column_index=2,
-                                                             is_float=False)
-        data['Airplane_estStallSpeed_kmh'] = get_value_from_line(airplane_lines, "est. Stall Speed:;km/h;",
-                                                                 column_index=2)
-        data['Airplane_estSpeed_level_kmh'] = get_value_from_line(airplane_lines, "est. Speed (level):;km/h;",
-                                                                  column_index=2)
-        data['Airplane_estSpeed_vertical_kmh'] = get_value_from_line(airplane_lines, "est. Speed (vertical):;km/h;",
-                                                                     column_index=2)
-        data['Airplane_estRateOfClimb_ms'] = get_value_from_line(airplane_lines, "est. rate of climb:;m/s;",
-                                                                 column_index=2)
-
-        # --- Remarks ---
-        data['Remarks'] = get_value_from_line(lines, "Remarks:;;", column_index=2, is_float=False)
-
-        return pd.Series(data)
-
-    tor_process = None
-    driver = None
-    download_dir = os.path.join(os.getcwd(), "ecalcCSVs")
-
+# --- eCalc Sessions ---
+
+ECALC_URL = "https://www.ecalc.ch/motorcalc.php"
+TOR_PATH = r'D:\Tor Browser\Browser\TorBrowser\Tor\tor.exe'
+TOR_PROXY = ('localhost', 9050)
+CHROMEDRIVER_PATH = r'resources/drivers/chromedriver.exe'
+DOWNLOAD_DIR = "ecalcCSVs"
+TOR_STARTUP_TIMEOUT = 60
+DOWNLOAD_TIMEOUT = 30
+# A session is replaced after this many jobs, so browser memory does not grow without bound
+MAX_JOBS_PER_SESSION = 50
+
+# Enables the disabled dropdown options and re-values them so they can be selected by text
+JS_PREPARE_FORM = """
+function manipulateMType() {
+    const manufacturerSelect = document.getElementById("inMManufacturer");
+    const mTypeSelect = document.getElementById("inMType");
+
+    if (manufacturerSelect && mTypeSelect) {
+        const selectedManufacturer = manufacturerSelect.value;
+        Array.from(mTypeSelect.options).forEach((option, index) => {
+            if (index > 0) {
+                option.removeAttribute("disabled");
+                const optionText = option.textContent.split(' ').slice(0, -1).join(' ');
+                option.value = `${selectedManufacturer}|${optionText}`;
+            }
+        });
+    }
+}
+
+function manipulateSelectElements() {
+    const selectElementIds = ["inBCell", "inEType"];
+    selectElementIds.forEach(id => {
+        const selectElement = document.getElementById(id);
+        if (selectElement) {
+            if (id === "inEType") {
+                Array.from(selectElement.options).forEach((option, index) => {
+                    if (index > 0) {
+                        option.removeAttribute("disabled");
+                        option.value = index;
+                    }
+                });
+            } else {
+                Array.from(selectElement.options).forEach(option => {
+                    option.removeAttribute("disabled");
+                    option.value = option.textContent;
+                });
+            }
+        }
+    });
+
+    const manufacturerSelect = document.getElementById("inMManufacturer");
+    if (manufacturerSelect) {
+        manufacturerSelect.addEventListener("change", manipulateMType);
+    }
+    manipulateMType();
+}
+manipulateSelectElements();
+"""
+
+JS_ENABLE_CSV_BUTTONS = """
+const downloadButton = document.getElementById("DownloadCSV");
+if (downloadButton) {
+    downloadButton.removeAttribute("disabled");
+}
+const addButton = document.getElementById("AddCSV");
+if (addButton) {
+    addButton.removeAttribute("disabled");
+}
+const clearButton = document.getElementById("ClearCSV");
+if (clearButton) {
+    clearButton.removeAttribute("disabled");
+}
+"""
+
+ELEMENT_IDS = {
+    'modelweight': "inGWeight",
+    'wingspan': "inGWingSpan",
+    'wingarea': "inGWingArea",
+    'elevation': "inGElevation",
+    'batteryType': "inBCell",
+    'batterySeriesCells': "inBS",
+    'batteryParallelCells': "inBP",
+    'escType': "inEType",
+    'motorManuf': "inMManufacturer",
+    'motorType': "inMType",
+    'propType': "inPType",
+    'propDiameter': "inPDiameter",
+    'propPitch': "inPPitch",
+    'propNumberOfBlades': "inPBlades",
+    'vCruise': "inPSpeed"
+}
+
+SELECT_IDS = ("inBCell", "inEType", "inMManufacturer", "inMType", "inPType")
+
+PARAM_GROUPS = {
+    'General': ['modelweight', 'wingspan', 'wingarea', 'elevation'],
+    'Battery': ['batteryType', 'batterySeriesCells', 'batteryParallelCells'],
+    'ESC': ['escType'],
+    'Motor': ['motorManuf', 'motorType'],
+    'Propeller': ['propType', 'propDiameter', 'propPitch', 'propNumberOfBlades', 'vCruise']
+}
+
+# Minimum similarity (0-100) for a dropdown option to be taken for the requested text
+SELECT_THRESHOLD = 80
+
+# Sets every field of arguments[0] ({element id: text}, in order) in one call and fires the input
+# and change events the page listens to. Dropdowns take the option whose text is closest to the
+# requested one, scored like fuzz.ratio (difflib's SequenceMatcher ratio, rounded half to even),
+# so SELECT_THRESHOLD means the same as in select_closest_option.
+# The motor type only counts as set once the list belongs to the selected manufacturer: if the
+# manufacturer changed but the motor types are still the previous list, it is reported unresolved
+# (and remembered across calls) until the page has repopulated it.
+# Returns {'set': {id: text}, 'unresolved': {id: [closest option, score]}}.
+JS_FILL_FORM = """
+const values = arguments[0];
+const threshold = arguments[1];
+
+function matchingCharacters(a, b) {
+    // Total size of SequenceMatcher(None, a, b).get_matching_blocks(), including its autojunk rule
+    const b2j = new Map();
+    Array.from(b).forEach((character, j) => {
+        if (!b2j.has(character)) {
+            b2j.set(character, []);
+        }
+        b2j.get(character).push(j);
+    });
+    if (b.length >= 200) {
+        const popular = Math.floor(b.length / 100) + 1;
+        Array.from(b2j.keys()).forEach(character => {
+            if (b2j.get(character).length > popular) {
+                b2j.delete(character);
+            }
+        });
+    }
+
+    let total = 0;
+    const queue = [[0, a.length, 0, b.length]];
+    while (queue.length) {
+        const [alo, ahi, blo, bhi] = queue.pop();
+        let besti = alo, bestj = blo, bestsize = 0;
+        let j2len = new Map();
+        for (let i = alo; i < ahi; i++) {
+            const newj2len = new Map();
+            for (const j of b2j.get(a[i]) || []) {
+                if (j < blo) {
+                    continue;
+                }
+                if (j >= bhi) {
+                    break;
+                }
+                const k = (j2len.get(j - 1) || 0) + 1;
+                newj2len.set(j, k);
+                if (k > bestsize) {
+                    besti = i - k + 1;
+                    bestj = j - k + 1;
+                    bestsize = k;
+                }
+            }
+            j2len = newj2len;
+        }
+        while (besti > alo && bestj > blo && a[besti - 1] === b[bestj - 1]) {
+            besti--;
+            bestj--;
+            bestsize++;
+        }
+        while (besti + bestsize < ahi && bestj + bestsize < bhi && a[besti + bestsize] === b[bestj + bestsize]) {
+            bestsize++;
+        }
+        if (bestsize) {
+            total += bestsize;
+            if (alo < besti && blo < bestj) {
+                queue.push([alo, besti, blo, bestj]);
+            }
+            if (besti + bestsize < ahi && bestj + bestsize < bhi) {
+                queue.push([besti + bestsize, ahi, bestj + bestsize, bhi]);
+            }
+        }
+    }
+    return total;
+}
+
+function similarity(a, b) {
+    if (a === b) {
+        return 100;
+    }
+    if (!a.length || !b.length) {
+        return 0;
+    }
+    // round(200 * matches / length), with Python's round half to even
+    const numerator = 200 * matchingCharacters(a, b);
+    const length = a.length + b.length;
+    const quotient = Math.floor(numerator / length);
+    const twiceRemainder = 2 * (numerator - quotient * length);
+    return quotient + (twiceRemainder > length || (twiceRemainder === length && quotient % 2) ? 1 : 0);
+}
+
+function fire(element) {
+    element.dispatchEvent(new Event("input", {bubbles: true}));
+    element.dispatchEvent(new Event("change", {bubbles: true}));
+}
+
+function optionTexts(element) {
+    return element ? Array.from(element.options).map(option => option.text).join("\\n") : "";
+}
+
+if ("inMManufacturer" in values) {
+    delete window.ecalcStaleMotorTypes;
+}
+
+const result = {set: {}, unresolved: {}};
+for (const [id, text] of Object.entries(values)) {
+    const element = document.getElementById(id);
+    if (!element) {
+        result.unresolved[id] = [null, 0];
+        continue;
+    }
+    let manufacturer = null;
+    if (id === "inMType") {
+        manufacturer = document.getElementById("inMManufacturer").value;
+        if (window.ecalcStaleMotorTypes !== undefined && optionTexts(element) === window.ecalcStaleMotorTypes) {
+            result.unresolved[id] = [null, 0];
+            continue;
+        }
+        delete window.ecalcStaleMotorTypes;
+        // Options the page added after the prepared change listener ran still need its value rewrite
+        Array.from(element.options).forEach((option, index) => {
+            if (index > 0 && !option.value.startsWith(manufacturer + "|")) {
+                option.removeAttribute("disabled");
+                option.value = `${manufacturer}|${option.textContent.split(" ").slice(0, -1).join(" ")}`;
+            }
+        });
+    }
+    if (element.tagName === "SELECT") {
+        const desired = text.toLowerCase();
+        let best = null;
+        let bestScore = -1;
+        Array.from(element.options).forEach(option => {
+            const score = similarity(desired, option.text.toLowerCase());
+            if (score > bestScore) {
+                best = option;
+                bestScore = score;
+            }
+        });
+        if (!best || bestScore < threshold || (manufacturer !== null && !best.value.startsWith(manufacturer + "|"))) {
+            result.unresolved[id] = [best ? best.text : null, bestScore];
+            continue;
+        }
+        const previousMotorTypes = id === "inMManufacturer" ? optionTexts(document.getElementById("inMType")) : null;
+        const changed = element.value !== best.value;
+        element.value = best.value;
+        best.selected = true;
+        fire(element);
+        if (changed && previousMotorTypes !== null && optionTexts(document.getElementById("inMType")) === previousMotorTypes) {
+            window.ecalcStaleMotorTypes = previousMotorTypes;
+        }
+        result.set[id] = best.text;
+    } else {
+        element.value = text;
+        fire(element);
+        result.set[id] = text;
+    }
+}
+return result;
+"""
+
+
+def _port_open(address, timeout=1.0):
     try:
-        if os.path.exists(download_dir):
-            shutil.rmtree(download_dir)
-        os.makedirs(download_dir)
+        with socket.create_connection(address, timeout=timeout):
+            return True
+    except OSError:
+        return False
 
-        tor_process = os.popen(r'D:\Tor Browser\Browser\TorBrowser\Tor\tor.exe')
-        print("Starting Tor process...")
-        sleep(15)
 
-        PROXY = "socks5://localhost:9050"
+def start_tor(tor_path=TOR_PATH, proxy=TOR_PROXY, timeout=TOR_STARTUP_TIMEOUT):
+    """
+    Starts Tor unless something already listens on the proxy port, and waits until the port
+    accepts connections instead of sleeping a fixed time.
+
+    Returns:
+        subprocess.Popen or None: The started process, or None if Tor was already running.
+    """
+    if _port_open(proxy):
+        return None
+    print("Starting Tor process...")
+    tor_process = subprocess.Popen([tor_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    start_time = time()
+    while time() - start_time < timeout:
+        if _port_open(proxy):
+            return tor_process
+        if tor_process.poll() is not None:
+            raise RuntimeError(f"Tor exited with code {tor_process.returncode} before opening {proxy[0]}:{proxy[1]}")
+        sleep(0.5)
+    tor_process.terminate()
+    raise RuntimeError(f"Tor did not open {proxy[0]}:{proxy[1]} within {timeout} s")
+
+
+class ECalcSession:
+    """
+    One Chrome driver kept on the eCalc page with the form prepared (modal dismissed,
+    JS_PREPARE_FORM injected), so jobs only fill, calculate and download.
+
+    Each session downloads into its own folder under DOWNLOAD_DIR, so sessions never pick up
+    each other's exports.
+    """
+    def __init__(self, download_dir, proxy=TOR_PROXY):
+        self.download_dir = os.path.abspath(download_dir)
+        self.proxy = proxy
+        self.driver = None
+        self.wait = None
+        self.jobs = 0
+
+    def start(self):
+        os.makedirs(self.download_dir, exist_ok=True)
         options = webdriver.ChromeOptions()
-        options.add_argument('--proxy-server=%s' % PROXY)
+        if self.proxy:
+            options.add_argument('--proxy-server=socks5://%s:%d' % self.proxy)
         options.add_argument("--start-maximized")
-        options.add_experimental_option("detach", True)
-
         prefs = {
-            "download.default_directory": download_dir,
+            "download.default_directory": self.download_dir,
             "download.prompt_for_download": False,
             "download.directory_upgrade": True,
             "safebrowsing.enabled": True,
@@ -258,134 +392,93 @@ def ecalc(
         }
         options.add_experimental_option("prefs", prefs)
 
-        service = Service(r'resources/drivers/chromedriver.exe')
-        driver = webdriver.Chrome(options=options, service=service)
-        wait = WebDriverWait(driver, 30)
-
-        driver.get("https://www.ecalc.ch/motorcalc.php")
+        service = Service(CHROMEDRIVER_PATH)
+        self.driver = webdriver.Chrome(options=options, service=service)
+        self.wait = WebDriverWait(self.driver, 30)
+        self.driver.get(ECALC_URL)
 
-        modal_confirm_ok = wait.until(EC.element_to_be_clickable((By.ID, "modalConfirmOk")))
+        modal_confirm_ok = self.wait.until(EC.element_to_be_clickable((By.ID, "modalConfirmOk")))
         modal_confirm_ok.click()
         print("Clicked modal confirm.")
+        self.wait.until(EC.invisibility_of_element_located((By.ID, "modalConfirmOk")))
+        self.driver.execute_script(JS_PREPARE_FORM)
+        print("Executed JS for dropdown and button manipulation.")
+        return self
 
-        sleep(1)
-        js_script = """
-        function manipulateMType() {
-            const manufacturerSelect = document.getElementById("inMManufacturer");
-            const mTypeSelect = document.getElementById("inMType");
-
-            if (manufacturerSelect && mTypeSelect) {
-                const selectedManufacturer = manufacturerSelect.value;
-                Array.from(mTypeSelect.options).forEach((option, index) => {
-                    if (index > 0) {
-                        option.removeAttribute("disabled");
-                        const optionText = option.textContent.split(' ').slice(0, -1).join(' ');
-                        option.value = `${selectedManufacturer}|${optionText}`;
-                    }
-                });
-            }
-        }
-
-        function manipulateSelectElements() {
-            const selectElementIds = ["inBCell", "inEType"];
-            selectElementIds.forEach(id => {
-                const selectElement = document.getElementById(id);
-                if (selectElement) {
-                    if (id === "inEType") {
-                        Array.from(selectElement.options).forEach((option, index) => {
-                            if (index > 0) {
-                                option.removeAttribute("disabled");
-                                option.value = index;
-                            }
-                        });
-                    } else {
-                        Array.from(selectElement.options).forEach(option => {
-                            option.removeAttribute("disabled");
-                            option.value = option.textContent;
-                        });
-                    }
-                }
-            });
-
-            const manufacturerSelect = document.getElementById("inMManufacturer");
-            if (manufacturerSelect) {
-                manufacturerSelect.addEventListener("change", manipulateMType);
-            }
-            manipulateMType();
-        }
-        manipulateSelectElements();
+    def is_healthy(self):
         """
-        js_script2 = """
-        const downloadButton = document.getElementById("DownloadCSV");
-        if (downloadButton) {
-            downloadButton.removeAttribute("disabled");
-        }
-        const addButton = document.getElementById("AddCSV");
-        if (addButton) {
-            addButton.removeAttribute("disabled");
-        }
-        const clearButton = document.getElementById("ClearCSV");
-        if (clearButton) {
-            clearButton.removeAttribute("disabled");
-        }
+        True if the browser still answers and is on the prepared eCalc form.
         """
-        driver.execute_script(js_script)
-        print("Executed JS for dropdown and button manipulation.")
-        sleep(1.5)
-
-        input_values_map = {
-            'modelweight': modelweight,
-            'wingspan': wingspan,
-            'wingarea': wingarea,
-            'elevation': elevation,
-            'batteryType': batteryType,
-            'batterySeriesCells': batterySeriesCells,
-            'batteryParallelCells': batteryParallelCells,
-            'escType': escType,
-            'motorManuf': motorManuf,
-            'motorType': motorType,
-            'propType': propType,
-            'propDiameter': propDiameter,
-            'propPitch': propPitch,
-            'propNumberOfBlades': propNumberOfBlades,
-            'vCruise': vCruise*3.6,  #m/s to km/h
-        }
-
-        ELEMENT_IDS = {
-            'modelweight': "inGWeight",
-            'wingspan': "inGWingSpan",
-            'wingarea': "inGWingArea",
-            'elevation': "inGElevation",
-            'batteryType': "inBCell",
-            'batterySeriesCells': "inBS",
-            'batteryParallelCells': "inBP",
-            'escType': "inEType",
-            'motorManuf': "inMManufacturer",
-            'motorType': "inMType",
-            'propType': "inPType",
-            'propDiameter': "inPDiameter",
-            'propPitch': "inPPitch",
-            'propNumberOfBlades': "inPBlades",
-            'vCruise':"inPSpeed"
-        }
-
-        param_groups = {
-            'General': ['modelweight', 'wingspan', 'wingarea', 'elevation'],
-            'Battery': ['batteryType', 'batterySeriesCells', 'batteryParallelCells'],
-            'ESC': ['escType'],
-            'Motor': ['motorManuf', 'motorType'],
-            'Propeller': ['propType', 'propDiameter', 'propPitch', 'propNumberOfBlades','vCruise']
-        }
+        if self.driver is None:
+            return False
+        try:
+            return bool(self.driver.execute_script(
+                "return document.readyState === 'complete' && document.getElementById('inGWeight') !== null;"))
+        except WebDriverException:
+            return False
 
-        for group_name, param_names_list in param_groups.items():
+    def reset(self):
+        """
+        Clears the exports added by the previous job (on the page and on disk) so the next
+        download holds exactly one project.
+        """
+        for file_path in glob.glob(os.path.join(self.download_dir, '*')):
+            os.remove(file_path)
+        if self.jobs:
+            self.driver.execute_script(JS_ENABLE_CSV_BUTTONS)
+            # Confirm the clear dialog in the page itself rather than waiting for an alert
+            self.driver.execute_script("""
+                const confirm = window.confirm;
+                window.confirm = () => true;
+                document.getElementById("ClearCSV").click();
+                window.confirm = confirm;
+            """)
+
+    def fill_form(self, input_values_map):
+        """
+        Sets every field in one execute_script call (JS_FILL_FORM). Dropdowns whose options are not
+        there yet (e.g. motor types still loading for the manufacturer) are retried until they
+        resolve; anything still unresolved after the wait goes through fill_fields.
+        """
+        values = {}
+        for param_name in (name for names in PARAM_GROUPS.values() for name in names):
+            value = input_values_map[param_name]
+            if isinstance(value, float) and ELEMENT_IDS[param_name] not in SELECT_IDS:
+                value = round(value, 3)
+            values[ELEMENT_IDS[param_name]] = str(value)
+
+        result = self.driver.execute_script(JS_FILL_FORM, values, SELECT_THRESHOLD)
+        pending = {field_id: values[field_id] for field_id in result['unresolved']}
+        try:
+            WebDriverWait(self.driver, 5, poll_frequency=0.1).until(
+                lambda driver: not pending or not driver.execute_script(JS_FILL_FORM, pending, SELECT_THRESHOLD)['unresolved'])
+            pending = {}
+        except WebDriverException:
+            pending = {field_id: values[field_id] for field_id in
+                       self.driver.execute_script(JS_FILL_FORM, pending, SELECT_THRESHOLD)['unresolved']}
+
+        print(f"Set {len(values) - len(pending)} fields in one script call.")
+        if pending:
+            self.fill_fields([param_name for param_name, field_id in ELEMENT_IDS.items() if field_id in pending],
+                             input_values_map)
+
+    def fill_fields(self, param_names, input_values_map):
+        """
+        Field-by-field entry with fuzzy dropdown matching, as a fallback for values JS_FILL_FORM
+        could not resolve.
+        """
+        for group_name, param_names_list in PARAM_GROUPS.items():
+            param_names_list = [param_name for param_name in param_names_list if param_name in param_names]
+            if not param_names_list:
+                continue
             print(f"\n--- Setting {group_name} Fields ---")
             for param_name in param_names_list:
                 try:
                     field_id = ELEMENT_IDS[param_name]
-                    field_element = wait.until(EC.presence_of_element_located((By.ID, field_id)))
+                    field_element = self.wait.until(EC.presence_of_element_located((By.ID, field_id)))
                     value_to_set = input_values_map[param_name]
 
-                    if field_id in ["inBCell", "inEType", "inMManufacturer", "inMType", "inPType"]:
+                    if field_id in SELECT_IDS:
                         try:
                             select_closest_option(field_element, str(value_to_set),
                                                   threshold=80)
@@ -408,11 +501,29 @@ def ecalc(
 
                 except Exception as e:
                     print(f"Failed to set {param_name} (ID: {field_id}): {e}")
-        driver.execute_script(js_script2)
+
+    def run(self, input_values_map, project_name="ecalcproject"):
+        """
+        Fills the form, calculates, exports the result and returns it parsed (see parse_ecalc_csv).
+        """
+        driver, wait = self.driver, self.wait
+        self.reset()
+        self.jobs += 1
+        self.fill_form(input_values_map)
+
+        driver.execute_script(JS_ENABLE_CSV_BUTTONS)
+        # Blank the previous job's outputs so the new ones can be waited for
+        driver.execute_script("""
+            ["outOptRpm", "outTotTorque"].forEach(id => {
+                const element = document.getElementById(id);
+                if (element) {
+                    element.textContent = "";
+                }
+            });
+        """)
         calculatebtn = wait.until(EC.element_to_be_clickable((By.NAME, 'btnCalculate')))
         Addtobtn = wait.until(EC.element_to_be_clickable((By.ID, 'AddCSV')))
         Downloadbtn = wait.until(EC.element_to_be_clickable((By.ID, 'DownloadCSV')))
-        clearbtn = wait.until(EC.element_to_be_clickable((By.ID, 'ClearCSV')))
 
         calculatebtn.click()
         print("Clicked 'Calculate' button.")
@@ -421,18 +532,18 @@ def ecalc(
             confirm_calculation_modal = wait.until(EC.element_to_be_clickable((By.CLASS_NAME, "btn-primary")))
             confirm_calculation_modal.click()
             print("Clicked calculation confirmation modal.")
-            sleep(1)
         except Exception as e:
             print(f"No calculation confirmation modal found or error clicking it: {e}")
-        rpm_span_element = wait.until(EC.presence_of_element_located((By.ID, "outOptRpm")))
-        float_span_element = wait.until(EC.presence_of_element_located((By.ID, "outTotTorque")))
-        print(rpm_span_element)
-        rpm_max = float(rpm_span_element.text)
-        torque = float(float_span_element.text)
+        rpm_max, torque = wait.until(lambda driver: driver.execute_script("""
+            const values = ["outOptRpm", "outTotTorque"].map(id => {
+                const element = document.getElementById(id);
+                return element ? parseFloat(element.textContent) : NaN;
+            });
+            return values.every(Number.isFinite) ? values : false;
+        """))
 
-        driver.execute_script(js_script2)
+        driver.execute_script(JS_ENABLE_CSV_BUTTONS)
         driver.execute_script("arguments[0].scrollIntoView(true);", Addtobtn)
-        sleep(1)
         Addtobtn.send_keys(Keys.RETURN)
         print("Clicked 'Add to >>' button.")
         try:
@@ -446,54 +557,217 @@ def ecalc(
 
             alert.accept()
             print("Accepted project name alert.")
-            sleep(1)
 
         except Exception as e:
             print(f"Error handling project name alert: {e}")
             raise
-        sleep(2)
+        wait.until(lambda driver: not EC.alert_is_present()(driver))
+        Downloadbtn = wait.until(EC.element_to_be_clickable((By.ID, 'DownloadCSV')))
         driver.execute_script("arguments[0].scrollIntoView(true);", Downloadbtn)
         Downloadbtn.send_keys(Keys.RETURN)
         print("Clicked 'Download .csv' button.")
 
-        downloaded_file_path = None
-        timeout = 30
-        check_interval = 1
-        start_time = time()
-
-        while time() - start_time < timeout:
-            all_csv_files = glob.glob(os.path.join(download_dir, '*.csv'))
-            complete_csv_files = [f for f in all_csv_files if not f.endswith('.crdownload')]
+        def downloaded(driver):
+            complete_csv_files = [f for f in glob.glob(os.path.join(self.download_dir, '*.csv'))
+                                  if not f.endswith('.crdownload')]
+            return max(complete_csv_files, key=os.path.getmtime) if complete_csv_files else False
 
-            if complete_csv_files:
-                complete_csv_files.sort(key=os.path.getmtime, reverse=True)
-                downloaded_file_path = complete_csv_files[0]
-                print(f"Detected downloaded file: {downloaded_file_path}")
-                break
-            sleep(check_interval)
-
-        if not downloaded_file_path:
+        try:
+            downloaded_file_path = WebDriverWait(driver, DOWNLOAD_TIMEOUT, poll_frequency=0.1).until(downloaded)
+        except WebDriverException:
             raise Exception("CSV file did not download within the expected time.")
+        print(f"Detected downloaded file: {downloaded_file_path}")
 
         df_parsed = parse_ecalc_csv(downloaded_file_path, rpm_max, torque)
         print("\nSuccessfully parsed CSV into DataFrame:")
         print("--------------------------------------------------------------------------------------------------------------------")
-        #print(df_parsed.head())
-
         return df_parsed
 
+    def screenshot(self, file_path):
+        try:
+            self.driver.save_screenshot(file_path)
+        except WebDriverException:
+            pass
+
+    def close(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except WebDriverException:
+                pass
+            self.driver = None
+
+
+class ECalcSessionPool:
+    """
+    Keeps up to `size` ECalcSessions (and one Tor process) alive across ecalc calls.
+
+    Sessions are created on first use, health-checked before every job, and replaced when the
+    check fails, when a job raises, or after `max_jobs` jobs. Thread-safe: callers beyond `size`
+    wait until a session is returned or a slot is freed, so Propulsion.schedule_ecalc can run
+    `size` jobs at once while other threads read results.
+    """
+    def __init__(self, size=1, max_jobs=MAX_JOBS_PER_SESSION, use_tor=True, download_dir=DOWNLOAD_DIR):
+        self.size = size
+        self.max_jobs = max_jobs
+        self.use_tor = use_tor
+        self.download_dir = download_dir
+        self.tor_process = None
+        self._idle = deque()
+        self._borrowed = set()
+        self._created = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+        # Signalled whenever a session is returned or a slot is freed
+        self._available = threading.Condition(self._lock)
+
+    def _new_session(self):
+        with self._lock:
+            if self.use_tor and (self.tor_process is None or self.tor_process.poll() is not None):
+                self.tor_process = start_tor()
+            session_id = self._next_id
+            self._next_id += 1
+        session = ECalcSession(os.path.join(self.download_dir, f'session_{session_id}'),
+                               proxy=TOR_PROXY if self.use_tor else None)
+        try:
+            return session.start()
+        except Exception:
+            session.close()
+            raise
+
+    def _acquire(self):
+        with self._available:
+            while not self._idle and self._created >= self.size:
+                self._available.wait()
+            if self._idle:
+                session = self._idle.popleft()
+            else:
+                session = None
+                self._created += 1
+
+        if session is not None:
+            if session.is_healthy() and session.jobs < self.max_jobs:
+                with self._lock:
+                    self._borrowed.add(session)
+                return session
+            print("Recycling eCalc session.")
+            session.close()
+        try:
+            session = self._new_session()
+        except Exception:
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+        with self._lock:
+            self._borrowed.add(session)
+        return session
+
+    def _release(self, session, failed):
+        with self._available:
+            if session not in self._borrowed:
+                # The pool was closed while this session was out
+                failed = True
+            else:
+                self._borrowed.discard(session)
+                if failed:
+                    self._created -= 1
+                else:
+                    self._idle.append(session)
+                self._available.notify()
+        if failed:
+            print("Discarding eCalc session after a failed job.")
+            session.close()
+
+    @contextmanager
+    def session(self):
+        """
+        Borrows a healthy session for one job; it goes back to the pool unless the job raised.
+        """
+        session = self._acquire()
+        failed = True
+        try:
+            yield session
+            failed = False
+        finally:
+            self._release(session, failed)
+
+    def close(self):
+        """
+        Quits every session, idle or borrowed, and stops the Tor process this pool started.
+        """
+        with self._available:
+            sessions = list(self._idle) + list(self._borrowed)
+            self._idle.clear()
+            self._borrowed.clear()
+            self._created = 0
+            tor_process, self.tor_process = self.tor_process, None
+            self._available.notify_all()
+        for session in sessions:
+            session.close()
+        if tor_process is not None and tor_process.poll() is None:
+            tor_process.terminate()
+
+
+_default_pool = None
+
+
+def session_pool():
+    """
+    The process-wide pool used by ecalc, created on first use and closed at exit.
+    """
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = ECalcSessionPool()
+        atexit.register(_default_pool.close)
+    return _default_pool
+
+
+def ecalc(
+        modelweight,
+        wingspan, wingarea,
+        elevation,
+
+        batteryType, batterySeriesCells, batteryParallelCells,
+        escType,
+        motorManuf, motorType,
+        propType, propDiameter, propPitch, propNumberOfBlades, vCruise=0,
+        project_name="ecalcproject",
+        pool=None,
+):
+    """
+    Runs one configuration through eCalc on a pooled browser session (`pool`, or the shared
+    session_pool()) and returns the parsed results, or None if the run failed.
+    """
+    input_values_map = {
+        'modelweight': modelweight,
+        'wingspan': wingspan,
+        'wingarea': wingarea,
+        'elevation': elevation,
+        'batteryType': batteryType,
+        'batterySeriesCells': batterySeriesCells,
+        'batteryParallelCells': batteryParallelCells,
+        'escType': escType,
+        'motorManuf': motorManuf,
+        'motorType': motorType,
+        'propType': propType,
+        'propDiameter': propDiameter,
+        'propPitch': propPitch,
+        'propNumberOfBlades': propNumberOfBlades,
+        'vCruise': vCruise*3.6,  #m/s to km/h
+    }
+
+    try:
+        with (pool or session_pool()).session() as session:
+            try:
+                return session.run(input_values_map, project_name)
+            except Exception:
+                session.screenshot(os.path.join(os.getcwd(), "error_screenshot.png"))
+                raise
     except Exception as e:
         print(f"An error occurred during ecalc execution: {e}")
-        if driver:
-            driver.save_screenshot(os.path.join(os.getcwd(), "error_screenshot.png"))
         return None
 
-    finally:
-        if driver:
-            pass
-        if tor_process:
-            print("Please manually close Tor Browser or its process if it's still running.")
-
 
 if __name__ == '__main__':
     results = ecalc(
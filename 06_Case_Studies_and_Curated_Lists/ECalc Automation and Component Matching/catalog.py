@@ -0,0 +1,154 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from columnar import ColumnarCatalog, columnar_path
+
+# --- Component Catalogs ---
+
+CATALOG_DIR = r'resources/ecalcData/pkl_data'
+
+CATALOG_FILES = {
+    'batteries': 'batteries.pkl',
+    'esc': 'esc.pkl',
+    'motors': 'motors.pkl',
+    'full_motors': 'full_motors.pkl',
+    'motors_with_type': 'motors_with_type.pkl',
+    'propellers': 'propellers.pkl',
+}
+
+
+def file_signature(file_path, chunk_size=1 << 20):
+    """
+    Returns the sha1 hex digest of a file's contents.
+    """
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ComponentCatalog:
+    """
+    A component database (batteries, motors, ESCs, propellers) that is loaded once
+    per process and kept resident.
+
+    The file is stat'ed on every access. When its mtime or size changes the contents
+    are re-hashed, and the DataFrame is only reloaded if the hash differs from the one
+    it was loaded with. If a columnar store built from the current file exists (see
+    columnar.py) it is read instead of the pickle, and `columns` memory-maps single
+    numeric columns from it. Anything derived from the DataFrame (indices, sorted
+    views, ...) can be cached in `derived`, which is cleared whenever the catalog is reloaded.
+
+    The shared DataFrame must be treated as read-only by callers.
+    """
+    _instances = {}
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.df = None
+        self.signature = None
+        self.derived = {}
+        self._stat = None
+        self._hashed = None  # ((mtime_ns, size), sha1) of the last hash of the file
+
+    @classmethod
+    def get(cls, name_or_path):
+        """
+        Returns the process-wide catalog for a catalog name (e.g. 'motors') or a .pkl path.
+        """
+        file_path = os.path.join(CATALOG_DIR, CATALOG_FILES[name_or_path]) \
+            if name_or_path in CATALOG_FILES else name_or_path
+        key = os.path.abspath(file_path)
+        if key not in cls._instances:
+            cls._instances[key] = cls(file_path)
+        return cls._instances[key]
+
+    def load(self):
+        """
+        Returns the catalog DataFrame, reloading it only if the file changed on disk.
+        """
+        st = os.stat(self.file_path)
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if self.df is not None and stat_key == self._stat:
+            return self.df
+
+        store = self.columnar()
+        signature = store.source_signature if store is not None else self.file_signature()
+        if self.df is None or signature != self.signature:
+            self.df = store.to_frame() if store is not None else pd.read_pickle(self.file_path)
+            self.signature = signature
+            self.derived = {}
+        self._stat = stat_key
+        return self.df
+
+    def columnar(self):
+        """
+        Returns the catalog's columnar store if it was built from the file as it is now, else None.
+        """
+        store = ColumnarCatalog.open(columnar_path(self.file_path))
+        if store is None:
+            return None
+        if store.is_fresh_for(self.file_path) or store.source_signature == self.file_signature():
+            return store
+        return None
+
+    def file_signature(self):
+        """
+        The file's sha1, hashed at most once per (mtime, size) of the file.
+        """
+        st = os.stat(self.file_path)
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if self._hashed is None or self._hashed[0] != stat_key:
+            self._hashed = (stat_key, file_signature(self.file_path))
+        return self._hashed[1]
+
+    def columns(self, names):
+        """
+        Returns a dict of numpy arrays for the requested columns (e.g. ['Kv', 'Rin', 'Io', 'weight']).
+        Numeric columns are memory-mapped from the columnar store when it is up to date, so the
+        rest of the catalog is never read; otherwise they come from the loaded DataFrame.
+        """
+        store = self.columnar()
+        if store is not None:
+            return {name: store.column(name) for name in names}
+        df = self.load()
+        return {name: df[name].to_numpy() for name in names}
+
+    def cached(self, key, builder):
+        """
+        Returns `derived[key]`, building it with `builder(df)` on first use after a (re)load.
+        """
+        df = self.load()
+        if key not in self.derived:
+            self.derived[key] = builder(df)
+        return self.derived[key]
+
+    def invalidate(self):
+        self.df = None
+        self.signature = None
+        self.derived = {}
+        self._stat = None
+        self._hashed = None
+
+
+def load_catalog(name_or_path):
+    """
+    Returns the shared DataFrame for a catalog name (e.g. 'batteries') or a .pkl path.
+    """
+    return ComponentCatalog.get(name_or_path).load()
+
+
+def catalog_rows(full_database_df, positions, index):
+    """
+    Takes the catalog rows at `positions` (-1 meaning no match) and aligns them with `index`.
+    """
+    matched = positions >= 0
+    result = full_database_df.iloc[positions[matched]]
+    result.index = np.flatnonzero(matched)
+    result = result.reindex(range(len(positions)))
+    result.index = index
+    return result
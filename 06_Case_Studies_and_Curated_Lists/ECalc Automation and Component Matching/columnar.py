@@ -0,0 +1,200 @@
+import glob
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# --- Columnar Catalog Format ---
+#
+# One directory per catalog file, keyed by its folder and name, e.g. pkl_data/motors.pkl is
+# stored in resources/ecalcData/columnar/pkl_data/motors/:
+#   manifest.json      format version, source file fingerprint, row count and column layout
+#   colN.npy           numeric columns, typed and memory-mappable
+#   colN.codes.npy     dictionary-encoded columns: int32 codes (-1 = missing) ...
+#   colN.dict.json     ... and the list of distinct values they refer to
+#   colN.json          columns holding unhashable values (e.g. lists), stored as plain JSON
+#
+# Bump FORMAT_VERSION whenever this layout changes; stores of another version are ignored.
+
+FORMAT_VERSION = 1
+DATA_DIR = r'resources/ecalcData'
+COLUMNAR_DIR = r'resources/ecalcData/columnar'
+# Folders of pickled catalogs the build step converts. excel_data holds the spreadsheets the
+# pickles were made from; ComponentCatalog never reads them, so they get no store.
+SOURCE_DIRS = (r'resources/ecalcData/pkl_data', r'resources/ecalcData/pkl_data2')
+
+
+def columnar_path(source_path):
+    """
+    The columnar store for a catalog file, e.g. pkl_data/motors.pkl -> columnar/pkl_data/motors,
+    so same-named catalogs in different folders never share a store. Files outside DATA_DIR are
+    keyed by a hash of their folder.
+    """
+    stem, _ = os.path.splitext(os.path.basename(source_path))
+    folder = os.path.dirname(os.path.abspath(source_path))
+    relative = os.path.relpath(folder, os.path.abspath(DATA_DIR))
+    if relative.startswith(os.pardir) or os.path.isabs(relative):
+        relative = os.path.join('external', hashlib.sha1(folder.encode()).hexdigest()[:12])
+    return os.path.join(COLUMNAR_DIR, relative, stem)
+
+
+def _is_missing(value):
+    return isinstance(value, float) and np.isnan(value)
+
+
+def write_columnar(df, store_path, source_path=None, source_signature=None):
+    """
+    Writes a DataFrame as a columnar store. Numeric and boolean columns are stored as typed
+    .npy arrays; every other column is dictionary-encoded, unless its values are unhashable.
+    """
+    tmp_path = f'{store_path}.tmp'
+    if os.path.exists(tmp_path):
+        shutil.rmtree(tmp_path)
+    os.makedirs(tmp_path)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        file_stem = f'col{i}'
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            np.save(os.path.join(tmp_path, f'{file_stem}.npy'), np.ascontiguousarray(series.to_numpy()))
+            columns.append({'name': name, 'kind': 'numeric', 'dtype': series.dtype.str, 'file': file_stem})
+            continue
+        try:
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        except TypeError:
+            with open(os.path.join(tmp_path, f'{file_stem}.json'), 'w', encoding='utf-8') as f:
+                json.dump([None if _is_missing(v) else v for v in series.tolist()], f)
+            columns.append({'name': name, 'kind': 'json', 'file': file_stem})
+        else:
+            np.save(os.path.join(tmp_path, f'{file_stem}.codes.npy'), codes.astype(np.int32))
+            with open(os.path.join(tmp_path, f'{file_stem}.dict.json'), 'w', encoding='utf-8') as f:
+                json.dump([v.item() if isinstance(v, np.generic) else v for v in uniques], f)
+            columns.append({'name': name, 'kind': 'dictionary', 'file': file_stem})
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'n_rows': len(df),
+        'index': df.index.tolist() if not isinstance(df.index, pd.RangeIndex) else None,
+        'columns': columns,
+        'source': os.path.abspath(source_path) if source_path else None,
+        'source_signature': source_signature,
+    }
+    if source_path:
+        st = os.stat(source_path)
+        manifest['source_mtime_ns'] = st.st_mtime_ns
+        manifest['source_size'] = st.st_size
+    with open(os.path.join(tmp_path, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+
+    # Swap the finished store in so readers never see a half-written one
+    if os.path.exists(store_path):
+        shutil.rmtree(store_path)
+    os.replace(tmp_path, store_path)
+
+
+class ColumnarCatalog:
+    """
+    Read access to a columnar store. Columns are memory-mapped on first use, so only the
+    columns a caller touches are ever paged in.
+    """
+    def __init__(self, store_path):
+        self.store_path = store_path
+        with open(os.path.join(store_path, 'manifest.json'), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Columnar store {store_path} has format version "
+                             f"{self.manifest.get('format_version')}, expected {FORMAT_VERSION}")
+        self.n_rows = self.manifest['n_rows']
+        self._layout = {column['name']: column for column in self.manifest['columns']}
+        self._dictionaries = {}
+
+    @classmethod
+    def open(cls, store_path):
+        """
+        Returns the store at `store_path`, or None if it is missing or of another format version.
+        """
+        try:
+            return cls(store_path)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @property
+    def columns(self):
+        return [column['name'] for column in self.manifest['columns']]
+
+    @property
+    def source_signature(self):
+        return self.manifest.get('source_signature')
+
+    def is_fresh_for(self, source_path):
+        """
+        True if the store was built from `source_path` and the file's mtime and size are unchanged.
+        """
+        if self.manifest.get('source') != os.path.abspath(source_path):
+            return False
+        st = os.stat(source_path)
+        return (st.st_mtime_ns, st.st_size) == (self.manifest.get('source_mtime_ns'), self.manifest.get('source_size'))
+
+    def is_numeric(self, name):
+        return self._layout[name]['kind'] == 'numeric'
+
+    def codes(self, name):
+        """
+        Memory-mapped int32 codes of a dictionary-encoded column (-1 = missing).
+        """
+        return np.load(os.path.join(self.store_path, f"{self._layout[name]['file']}.codes.npy"), mmap_mode='r')
+
+    def dictionary(self, name):
+        if name not in self._dictionaries:
+            with open(os.path.join(self.store_path, f"{self._layout[name]['file']}.dict.json"), encoding='utf-8') as f:
+                self._dictionaries[name] = np.array(json.load(f), dtype=object)
+        return self._dictionaries[name]
+
+    def column(self, name):
+        """
+        A numeric column as a read-only memory-mapped array, or any other column decoded
+        to an object array (NaN where missing, like the pickled catalogs).
+        """
+        layout = self._layout[name]
+        if layout['kind'] == 'numeric':
+            return np.load(os.path.join(self.store_path, f"{layout['file']}.npy"), mmap_mode='r')
+        if layout['kind'] == 'json':
+            with open(os.path.join(self.store_path, f"{layout['file']}.json"), encoding='utf-8') as f:
+                values = np.empty(self.n_rows, dtype=object)
+                values[:] = [np.nan if v is None else v for v in json.load(f)]
+            return values
+        codes = np.asarray(self.codes(name))
+        dictionary = self.dictionary(name)
+        values = dictionary.take(np.maximum(codes, 0)) if len(dictionary) else np.full(len(codes), np.nan, dtype=object)
+        values[codes < 0] = np.nan
+        return values
+
+    def to_frame(self, columns=None):
+        """
+        Builds a DataFrame from the requested columns (all by default).
+        """
+        columns = self.columns if columns is None else list(columns)
+        index = self.manifest.get('index')
+        index = pd.Index(index) if index is not None else pd.RangeIndex(self.n_rows)
+        # Non-numeric columns stay object dtype, as in the pickled catalogs
+        return pd.DataFrame({name: pd.Series(self.column(name), index=index,
+                                             dtype=None if self.is_numeric(name) else object)
+                             for name in columns}, index=index)
+
+
+if __name__ == '__main__':
+    # Build step: convert every pickled catalog in SOURCE_DIRS into its columnar store
+    from catalog import file_signature
+
+    for source_path in sorted(path for source_dir in SOURCE_DIRS for path in glob.glob(os.path.join(source_dir, '*.pkl'))):
+        df = pd.read_pickle(source_path)
+        if not isinstance(df, pd.DataFrame):
+            print(f"Skipping {source_path}: not a catalog DataFrame")
+            continue
+        store_path = columnar_path(source_path)
+        write_columnar(df, store_path, source_path=source_path, source_signature=file_signature(source_path))
+        print(f"Wrote {source_path} ({len(df)} rows, {len(df.columns)} columns) to {store_path}")
@@ -0,0 +1,103 @@
+import numpy as np
+
+# --- Component Batches ---
+#
+# Struct-of-arrays counterparts of Battery, Motor, ESC and Propeller: one contiguous float64
+# array per field instead of one Python object per component, so a million candidates are a
+# handful of arrays rather than a million objects and attribute dicts.
+
+
+def component_fields(component):
+    """
+    {attribute: value} of a component object, whether it uses __slots__ or an instance dict.
+    """
+    slots = [name for cls in type(component).__mro__ for name in getattr(cls, '__slots__', ())]
+    if not slots:
+        return dict(vars(component))
+    return {name: getattr(component, name) for name in slots if hasattr(component, name)}
+
+
+class ComponentBatch:
+    """
+    Fixed-length batch of components holding each field in FIELDS as a contiguous float64 array.
+
+    Extra keyword arrays (e.g. 'max_current') are kept alongside the required fields, and `names`
+    may hold a label per component. Fields read as attributes: `batch.kv`.
+    """
+    FIELDS = ()
+    __slots__ = ('columns', 'names')
+
+    def __init__(self, names=None, **columns):
+        missing = [field for field in self.FIELDS if field not in columns]
+        if missing:
+            raise ValueError(f"{type(self).__name__} is missing fields: {', '.join(missing)}")
+        self.columns = {field: np.ascontiguousarray(values, dtype=float).reshape(-1)
+                        for field, values in columns.items()}
+        lengths = {len(values) for values in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"{type(self).__name__} fields have different lengths: {sorted(lengths)}")
+        self.names = None if names is None else np.asarray(names, dtype=object)
+
+    def __getattr__(self, field):
+        if field in ComponentBatch.__slots__:
+            raise AttributeError(field)
+        try:
+            return self.columns[field]
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__} has no field '{field}'") from None
+
+    def __len__(self):
+        return len(self.columns[self.FIELDS[0]])
+
+    def __getstate__(self):
+        return self.columns, self.names
+
+    def __setstate__(self, state):
+        self.columns, self.names = state
+
+    def take(self, rows):
+        """
+        A new batch of the selected rows (indices or a boolean mask).
+        """
+        names = None if self.names is None else self.names[rows]
+        return type(self)(names=names, **{field: values[rows] for field, values in self.columns.items()})
+
+    @classmethod
+    def from_objects(cls, components):
+        """
+        Batches component objects (Battery, Motor, ...); missing values become NaN.
+        """
+        values = {field: [] for field in cls.FIELDS}
+        for component in components:
+            fields = component_fields(component)
+            for field in cls.FIELDS:
+                value = fields.get(field)
+                values[field].append(np.nan if value is None else value)
+        return cls(**values)
+
+    @classmethod
+    def from_options(cls, options):
+        """
+        Wraps a design_space option dict ({'name': ..., field: array, ...}) without copying.
+        """
+        return cls(names=options.get('name'), **{field: values for field, values in options.items() if field != 'name'})
+
+
+class BatteryBatch(ComponentBatch):
+    FIELDS = ('n_cells', 'p_cells', 'volt', 'Rin', 'capacity', 'weight')
+    __slots__ = ()
+
+
+class MotorBatch(ComponentBatch):
+    FIELDS = ('kv', 'kt', 'Rin', 'i0', 'weight')
+    __slots__ = ()
+
+
+class EscBatch(ComponentBatch):
+    FIELDS = ('Rin',)
+    __slots__ = ()
+
+
+class PropellerBatch(ComponentBatch):
+    FIELDS = ('NB', 'pitch', 'diameter', 'Tc', 'Pc', 'eff')
+    __slots__ = ()
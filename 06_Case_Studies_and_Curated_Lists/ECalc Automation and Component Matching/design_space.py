@@ -0,0 +1,305 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from Propeller import Propeller
+from Propulsion import dynamic_thrust, max_rpm_array, motor_current, shaft_power, static_thrust
+from catalog import load_catalog
+from ranking import ParetoFront, TopK
+from shared_catalog import SharedCatalog
+
+# --- Design-Space Exploration ---
+#
+# Every battery x motor x ESC x propeller combination is addressed by one flat index into the
+# 4-d grid of component options. Chunks of indices are evaluated as struct-of-arrays batches:
+# the full-throttle rpm and current come first, combinations over a current or power limit are
+# dropped, and only the survivors get thrust, weight and efficiency.
+
+# (diameter in, pitch in, blades) evaluated for every propeller type
+DEFAULT_PROPELLER_SIZES = ((10, 5, 2), (11, 5.5, 2), (12, 6, 2), (13, 6.5, 2), (14, 7, 2), (15, 8, 2), (16, 8, 2))
+DEFAULT_SERIES_CELLS = (3, 4, 6)
+COMPONENTS = ('battery', 'motor', 'esc', 'propeller')
+# Default Pareto objectives: static thrust per gram of drive, full-throttle endurance, drive weight
+DEFAULT_OBJECTIVES = {'thrust_per_gram': 'max', 'endurance': 'max', 'drive_weight': 'min'}
+
+# Component option arrays each worker process evaluates against, set once by _set_options
+# in-process or by _init_worker in pool workers
+_options = None
+
+
+def _set_options(options):
+    global _options
+    _options = options
+
+
+def _init_worker(handles):
+    """
+    Pool initializer: views every component's options onto the segments published by the parent.
+    """
+    _set_options({component: SharedCatalog.attach(handle).arrays for component, handle in handles.items()})
+
+
+def battery_options(batteries_df, series_cells=DEFAULT_SERIES_CELLS, parallel_cells=(1,)):
+    """
+    One option per catalog battery and (series, parallel) configuration, as in Battery:
+    pack voltage n * cell_volt, pack resistance Rin * n / p, and a current limit of
+    capacity * crate_max * p.
+    """
+    df = batteries_df.dropna(subset=['capacity', 'Rin', 'cell_volt', 'crate_max', 'weight'])
+    rows, n, p = np.meshgrid(np.arange(len(df)), np.asarray(series_cells, dtype=float),
+                             np.asarray(parallel_cells, dtype=float), indexing='ij')
+    rows, n, p = rows.ravel(), n.ravel(), p.ravel()
+    column = lambda name: df[name].to_numpy(dtype=float)[rows]
+    return {
+        'name': df['text'].to_numpy(dtype=object)[rows],
+        'n_cells': n,
+        'p_cells': p,
+        'volt': n * column('cell_volt'),
+        'Rin': column('Rin') * n / p,
+        'capacity': column('capacity') * p,
+        'max_current': column('capacity') / 1000 * column('crate_max') * p,
+        'weight': column('weight') * n * p,
+    }
+
+
+def motor_options(motors_df):
+    """
+    One option per catalog motor; 'power_limit' is the catalog's 'limit' (W).
+    """
+    df = motors_df.dropna(subset=['Kv', 'Rin', 'Io', 'weight'])
+    df = df[df['Kv'] > 0]
+    kv = df['Kv'].to_numpy(dtype=float)
+    return {
+        'name': (df['manufacturer'].astype(str) + ' ' + df['type'].astype(str)).to_numpy(dtype=object),
+        'kv': kv,
+        'kt': 9.5694 / kv,  # as in Motor
+        'Rin': df['Rin'].to_numpy(dtype=float),
+        'i0': df['Io'].to_numpy(dtype=float),
+        'weight': df['weight'].to_numpy(dtype=float),
+        'power_limit': df['limit'].fillna(np.inf).to_numpy(dtype=float),
+    }
+
+
+def esc_options(esc_df):
+    df = esc_df.dropna(subset=['Rin', 'max_current', 'weight'])
+    return {
+        'name': df['text'].to_numpy(dtype=object),
+        'Rin': df['Rin'].to_numpy(dtype=float),
+        'max_current': df['max_current'].to_numpy(dtype=float),
+        'weight': df['weight'].to_numpy(dtype=float),
+    }
+
+
+def propeller_options(propellers_df, sizes=DEFAULT_PROPELLER_SIZES):
+    """
+    One option per propeller type and (diameter, pitch, blades) size. Blade efficiency comes
+    from Propeller, which only supports 2 or 3 blades.
+    """
+    df = propellers_df.dropna(subset=['Tconst', 'Pconst'])
+    sizes = [(diameter, pitch, blades, Propeller(blades, pitch, diameter, weight=None).eff)
+             for diameter, pitch, blades in sizes]
+    rows, size = np.meshgrid(np.arange(len(df)), np.arange(len(sizes)), indexing='ij')
+    rows, size = rows.ravel(), size.ravel()
+    size_column = lambda i: np.array([s[i] for s in sizes], dtype=float)[size]
+    return {
+        'name': df['text'].to_numpy(dtype=object)[rows],
+        'Tc': df['Tconst'].to_numpy(dtype=float)[rows],
+        'Pc': df['Pconst'].to_numpy(dtype=float)[rows],
+        'diameter': size_column(0),
+        'pitch': size_column(1),
+        'NB': size_column(2),
+        'eff': size_column(3),
+    }
+
+
+def catalog_design_space(series_cells=DEFAULT_SERIES_CELLS, propeller_sizes=DEFAULT_PROPELLER_SIZES):
+    """
+    Component options for every battery, motor, ESC and propeller type in the catalogs.
+    Pass matched inventory rows (e.g. from match_batteries / match_motors) to the *_options
+    functions instead to explore only what is on the shelf.
+    """
+    return {
+        'battery': battery_options(load_catalog('batteries'), series_cells),
+        'motor': motor_options(load_catalog('motors')),
+        'esc': esc_options(load_catalog('esc')),
+        'propeller': propeller_options(load_catalog('propellers'), propeller_sizes),
+    }
+
+
+def _evaluate_chunk(start, stop, velocity, airframe_weight):
+    """
+    Evaluates the combinations with flat indices [start, stop) and returns the survivors.
+    """
+    shape = tuple(len(next(iter(_options[component].values()))) for component in COMPONENTS)
+    flat = np.arange(start, stop, dtype=np.int64)
+    ib, im, ie, ip = np.unravel_index(flat, shape)
+    battery, motor, esc, prop = (_options[component] for component in COMPONENTS)
+
+    # Prune on the full-throttle operating point before anything else is computed
+    R_tot = motor['Rin'][im] + esc['Rin'][ie] + battery['Rin'][ib]
+    volt = battery['volt'][ib]
+    rpm = max_rpm_array(prop['NB'][ip], prop['Pc'][ip], prop['diameter'][ip], prop['pitch'][ip],
+                        motor['kt'][im], motor['kv'][im], motor['i0'][im], volt, R_tot)
+    pm = shaft_power(rpm, prop['NB'][ip], prop['Pc'][ip], prop['diameter'][ip], prop['pitch'][ip])
+    _, current = motor_current(pm, rpm, motor['kt'][im], motor['i0'][im])
+    with np.errstate(invalid='ignore'):
+        keep = (np.isfinite(rpm) & (current <= esc['max_current'][ie]) & (current <= battery['max_current'][ib])
+                & (current * volt <= motor['power_limit'][im]))
+
+    flat, ib, im, ie, ip = flat[keep], ib[keep], im[keep], ie[keep], ip[keep]
+    rpm, pm, current, volt, R_tot = rpm[keep], pm[keep], current[keep], volt[keep], R_tot[keep]
+
+    t_static = static_thrust(rpm, prop['NB'][ip], prop['Tc'][ip], prop['eff'][ip], prop['diameter'][ip], prop['pitch'][ip])
+    t_dynamic = dynamic_thrust(t_static, rpm, prop['pitch'][ip], velocity)
+    drive_weight = battery['weight'][ib] + motor['weight'][im] + esc['weight'][ie]
+    p_electric = current * (rpm / motor['kv'][im] + current * R_tot)
+
+    return {
+        'index': flat, 'battery': ib, 'motor': im, 'esc': ie, 'propeller': ip,
+        'rpm': rpm, 'current': current, 'Pm': pm, 'efficiency': pm / p_electric,
+        'T_static': t_static, 'T_dynamic': t_dynamic, 'drive_weight': drive_weight,
+        'thrust_per_gram': t_static / drive_weight, 'T_W': t_static / (airframe_weight + drive_weight),
+        'endurance': battery['capacity'][ib] / 1000 / current * 60,
+    }
+
+
+def _run_chunks(options, n_combinations, chunk_size, max_workers, args):
+    max_workers = max_workers or os.cpu_count() or 1
+    starts = range(0, n_combinations, chunk_size)
+    stops = [min(start + chunk_size, n_combinations) for start in starts]
+    n_args = len(stops)
+
+    if max_workers == 1 or n_args <= 1:
+        _set_options(options)
+        yield from (_evaluate_chunk(start, stop, *args) for start, stop in zip(starts, stops))
+        return
+
+    # The options are published once into shared memory; workers only receive the handles
+    shared = {component: SharedCatalog.publish_arrays(component, fields) for component, fields in options.items()}
+    try:
+        handles = {component: catalog.handle for component, catalog in shared.items()}
+        # Only a few chunks per worker are in flight, so results never pile up faster than they are consumed
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(handles,)) as pool:
+            pending = deque()
+            for start, stop in zip(starts, stops):
+                pending.append(pool.submit(_evaluate_chunk, start, stop, *args))
+                if len(pending) >= 2 * max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    finally:
+        for catalog in shared.values():
+            catalog.close()
+
+
+def _numeric_options(options):
+    """
+    The option arrays workers need: everything but the names.
+    """
+    return {component: {field: values for field, values in fields.items() if field != 'name'}
+            for component, fields in options.items()}
+
+
+def explore_chunks(options, velocity=15.0, airframe_weight=0.0, chunk_size=250_000, max_workers=None):
+    """
+    Evaluates every combination of `options` (see catalog_design_space) and yields the surviving
+    combinations of each chunk as a dict of arrays, in flat-index order.
+
+    Args:
+        options (dict): {'battery', 'motor', 'esc', 'propeller'} -> option arrays.
+        velocity (float): Airspeed (m/s) for the dynamic thrust.
+        airframe_weight (float): Weight (g) of everything but the drive, for T/W.
+        chunk_size (int): Combinations per batch.
+        max_workers (int or None): Process pool size; None uses every core, 1 stays in-process.
+    """
+    n_combinations = int(np.prod([len(options[component]['name']) for component in COMPONENTS]))
+    yield from _run_chunks(_numeric_options(options), n_combinations, chunk_size, max_workers,
+                           (velocity, airframe_weight))
+
+
+def explore(options, velocity=15.0, airframe_weight=0.0, chunk_size=250_000, max_workers=None):
+    """
+    Evaluates the analytic propulsion model over every battery x motor x ESC x propeller option.
+
+    Combinations whose full-throttle current exceeds the ESC's max current or the battery's C-rate
+    limit, or whose electrical power exceeds the motor limit, are pruned before thrust is computed.
+
+    Returns:
+        pd.DataFrame: One row per surviving combination with component names, rpm, current (A),
+        shaft power (W), efficiency, static/dynamic thrust (g), drive weight (g), T/W and
+        full-throttle endurance (min).
+    """
+    chunks = list(explore_chunks(options, velocity, airframe_weight, chunk_size, max_workers))
+    results = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]} if chunks else {}
+    return _results_frame(results, options)
+
+
+def explore_top_k(options, k=20, objective='thrust_per_gram', largest=True, velocity=15.0, airframe_weight=0.0,
+                  chunk_size=250_000, max_workers=None):
+    """
+    Like `explore`, but streams the chunks through a bounded TopK and returns only the `k` best
+    combinations by `objective` (any output column, e.g. 'T_W' or 'endurance'). Memory stays
+    constant however many combinations are scanned.
+    """
+    top_k = TopK(k, objective, largest=largest)
+    for chunk in explore_chunks(options, velocity, airframe_weight, chunk_size, max_workers):
+        top_k.update(chunk)
+    return _results_frame(top_k.result(), options)
+
+
+def explore_pareto(options, objectives=None, velocity=15.0, airframe_weight=0.0, chunk_size=250_000,
+                   max_workers=None):
+    """
+    Like `explore`, but streams the chunks through an incremental ParetoFront and returns only the
+    non-dominated combinations. `objectives` maps output columns to 'max' or 'min' and defaults to
+    DEFAULT_OBJECTIVES (thrust per gram, endurance, drive weight).
+    """
+    front = ParetoFront(objectives or DEFAULT_OBJECTIVES)
+    for chunk in explore_chunks(options, velocity, airframe_weight, chunk_size, max_workers):
+        front.update(chunk)
+    return _results_frame(front.result(), options)
+
+
+def _results_frame(results, options):
+    """
+    Turns evaluated combinations into a DataFrame with the component names and sizes attached.
+    """
+    df = pd.DataFrame(results)
+    if df.empty:
+        return df
+    for component in COMPONENTS:
+        df[f'{component}_name'] = options[component]['name'][df[component].to_numpy()]
+    df['n_cells'] = options['battery']['n_cells'][df['battery'].to_numpy()]
+    for field in ('diameter', 'pitch', 'NB'):
+        df[f'propeller_{field}'] = options['propeller'][field][df['propeller'].to_numpy()]
+    return df
+
+
+if __name__ == '__main__':
+    import time
+
+    # A slice of the catalogs: 6S packs, 100 T-Motor motors, every 15th ESC, 10 propeller types x 7 sizes
+    options = catalog_design_space(series_cells=(6,))
+    take = lambda component, rows: {field: values[rows] for field, values in options[component].items()}
+    t_motor = np.array([name.startswith('T-Motor ') for name in options['motor']['name']], dtype=bool)
+    options['motor'] = take('motor', np.flatnonzero(t_motor)[:100])
+    options['esc'] = take('esc', slice(None, None, 15))
+    options['propeller'] = take('propeller', slice(None, 10 * len(DEFAULT_PROPELLER_SIZES)))
+    n_combinations = int(np.prod([len(options[component]['name']) for component in COMPONENTS]))
+
+    columns = ['battery_name', 'n_cells', 'motor_name', 'esc_name', 'propeller_name', 'propeller_diameter',
+               'propeller_pitch', 'current', 'T_static', 'drive_weight', 'thrust_per_gram', 'endurance', 'T_W']
+
+    start = time.perf_counter()
+    best = explore_top_k(options, k=10, objective='T_W', velocity=15.0, airframe_weight=1500.0)
+    print(f"Top 10 by T/W of {n_combinations} combinations ({time.perf_counter() - start:.1f} s):")
+    print(best[columns])
+
+    start = time.perf_counter()
+    front = explore_pareto(options, velocity=15.0, airframe_weight=1500.0)
+    print(f"\nPareto front (thrust per gram, endurance, drive weight): {len(front)} combinations "
+          f"({time.perf_counter() - start:.1f} s)")
+    print(front[columns].head(20))
@@ -0,0 +1,177 @@
+import re
+
+import pandas as pd
+
+# --- eCalc CSV Exports ---
+
+
+def parse_ecalc_csv(file_path, max_rpm=None, torque=None):
+    """
+    Parses an eCalc 'Download .csv' export into a flat Series of results.
+
+    `max_rpm` and `torque` are read from the result page rather than the export, so they are
+    passed in by calc.ecalc (None for stored exports).
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+
+    data = {}
+
+    def get_section_lines(start_marker, end_marker, full_lines):
+        section_lines = []
+        in_section = False
+        for line in full_lines:
+            if start_marker in line:
+                in_section = True
+                section_lines.append(line)
+                continue
+
+            if in_section:
+                if end_marker in line:
+                    break
+                section_lines.append(line)
+        return section_lines
+
+    def get_value_from_line(lines_list, label_start, column_index, is_float=True, default_val=None):
+        for line in lines_list:
+            if line.strip().startswith(label_start):
+                parts = line.strip().split(';')
+                if len(parts) > column_index:
+                    value_str = parts[column_index].strip()
+                    value_str = re.sub(r'[a-zA-Z%°/]+$', '', value_str).strip()
+                    value_str = value_str.replace(',', '')
+
+                    if is_float and value_str not in ('-', ''):
+                        try:
+                            return float(value_str)
+                        except ValueError:
+                            return default_val
+                    return value_str if value_str not in ('-', '') else default_val
+        return default_val
+
+    # --- Project Name ---
+    data['Project_Name'] = get_value_from_line(lines, "Project Name;;", column_index=2, is_float=False)
+
+    # --- Battery Section ---
+    battery_lines = get_section_lines("Battery;;", "Controller;;", lines)
+    data['Battery_Type'] = get_value_from_line(battery_lines, "Battery;;", column_index=2, is_float=False)
+    data['Battery_Configuration'] = get_value_from_line(battery_lines, "Configuration:;;", column_index=2,
+                                                        is_float=False)
+    data['Battery_Load_C'] = get_value_from_line(battery_lines, "Load:;C;", column_index=2)
+    data['Battery_Voltage_V'] = get_value_from_line(battery_lines, "Voltage:;V;", column_index=2)
+    data['Battery_RatedVoltage_V'] = get_value_from_line(battery_lines, "Rated Voltage:;V;", column_index=2)
+    data['Battery_Energy_Wh'] = get_value_from_line(battery_lines, "Energy:;Wh;", column_index=2)
+    data['Battery_TotalCapacity_mAh'] = get_value_from_line(battery_lines, "Total Capacity:;mAh;", column_index=2)
+    data['Battery_max_discharge_pct'] = get_value_from_line(battery_lines, "max. discharge:;;", column_index=2,
+                                                            is_float=False)
+    data['Battery_UsedCapacity_mAh'] = get_value_from_line(battery_lines, "Used Capacity:;mAh;", column_index=2)
+    data['Battery_min_FlightTime_min'] = get_value_from_line(battery_lines, "min. Flight Time:;min;",
+                                                             column_index=2)
+    data['Battery_MixedFlightTime_min'] = get_value_from_line(battery_lines, "Mixed Flight Time:;min;",
+                                                              column_index=2)
+    data['Battery_Weight_g'] = get_value_from_line(battery_lines, "Weight:;g;", column_index=2)
+
+    # --- Controller Section ---
+    controller_lines = get_section_lines("Controller;;", "Motor @ Maximum;;", lines)
+    data['Controller_Type'] = get_value_from_line(controller_lines, "Controller;;", column_index=2, is_float=False)
+    data['Controller_Current_A_cont'] = get_value_from_line(controller_lines, "Current:;A cont.;", column_index=2)
+    data['Controller_Current_A_max'] = get_value_from_line(controller_lines, ";A max;", column_index=2)
+    data['Controller_Weight_g'] = get_value_from_line(controller_lines, "Weight:;g;", column_index=2)
+    data['Controller_BatteryExtensionWire_Type'] = get_value_from_line(controller_lines,
+                                                                       "Battery extension Wire:;;", column_index=2,
+                                                                       is_float=False)
+
+    bat_wire_length_val = None
+    start_search_bat_wire = False
+    for line in controller_lines:
+        if "Battery extension Wire:;;" in line:
+            start_search_bat_wire = True
+        if start_search_bat_wire and "Length:;mm;" in line:
+            bat_wire_length_val = get_value_from_line([line], "Length:;mm;", column_index=2)
+            start_search_bat_wire = False  # Reset for the next one
+            break
+    data['Controller_BatWire_Length_mm'] = bat_wire_length_val if bat_wire_length_val is not None else 0.0
+
+    data['Controller_MotorExtensionWire_Type'] = get_value_from_line(controller_lines, "Motor extension Wire:;;",
+                                                                     column_index=2, is_float=False)
+
+    mot_wire_length_val = None
+    start_search_mot_wire = False
+    for line in controller_lines:
+        if "Motor extension Wire:;;" in line:
+            start_search_mot_wire = True
+        if start_search_mot_wire and "Length:;mm;" in line:
+            mot_wire_length_val = get_value_from_line([line], "Length:;mm;", column_index=2)
+            break
+    data['Controller_MotWire_Length_mm'] = mot_wire_length_val if mot_wire_length_val is not None else 0.0
+    # --- Motor @ Maximum Section ---
+    motor_lines = get_section_lines("Motor @ Maximum;;", "Propeller", lines)
+    data['Motor_Type'] = get_value_from_line(motor_lines, "Motor @ Maximum;;", column_index=2, is_float=False)
+    data['Motor_GearRatio'] = get_value_from_line(motor_lines, "Gear Ratio:;: 1;", column_index=2)
+    data['Motor_Weight_g'] = get_value_from_line(motor_lines, "Weight:;g;", column_index=2)
+    data['Motor_Current_A'] = get_value_from_line(motor_lines, "Current:;A;", column_index=2)
+    data['Motor_Voltage_V'] = get_value_from_line(motor_lines, "Voltage:;V;", column_index=2)
+    data['Motor_Revolutions_rpm'] = get_value_from_line(motor_lines, "Revolutions*:", column_index=2)
+    data['Motor_electricPower_W'] = get_value_from_line(motor_lines, "electric Power:;W;", column_index=2)
+    data['Motor_mechPower_W'] = get_value_from_line(motor_lines, "mech. Power:;W;", column_index=2)
+    data['Motor_Efficiency_pct'] = get_value_from_line(motor_lines, "Efficiency:;%;", column_index=2)
+    data['Motor_estTemperature_C'] = get_value_from_line(motor_lines, "est. Temperature:;°C;", column_index=2)
+    data['Motor_Total_Torque'] = torque
+
+    # --- Propeller Section ---
+    propeller_lines = get_section_lines("Propeller;;", "Total Drive;;", lines)
+    data['Propeller_Type'] = get_value_from_line(propeller_lines, "Propeller;;", column_index=2, is_float=False)
+    data['Propeller_NumBlades'] = get_value_from_line(propeller_lines, "# Blades:;;", column_index=2)
+    data['Propeller_StaticThrust_g'] = get_value_from_line(propeller_lines, "Static Thrust:;g;", column_index=2)
+    data['Propeller_Revolutions_rpm'] = get_value_from_line(propeller_lines, "Revolutions*:", column_index=2)
+    data['Propeller_StallThrust_g'] = get_value_from_line(propeller_lines, "Stall Thrust:;g;", column_index=2)
+    data['Propeller_Max_rpm'] = max_rpm
+
+    dynamic_thrust_long = get_value_from_line(propeller_lines,"avail.Thrust @ Flight Speed:;g@km/h;",column_index=2,is_float=False)
+    if dynamic_thrust_long:
+        dynamic_thrust_extracted = float(dynamic_thrust_long.split(" @ ")[0])
+        data['Propeller_availThrust_g_kmh'] = dynamic_thrust_extracted
+        data['Propeller_FlightSpeed_kmh'] = float(dynamic_thrust_long.split(" @ ")[1])
+    else: #dynamic_thrust is None
+        data['Propeller_availThrust_g_kmh'] = dynamic_thrust_long
+        data['Propeller_FlightSpeed_kmh'] = None
+
+    data['Propeller_PitchSpeed_kmh'] = get_value_from_line(propeller_lines, "Pitch Speed:;km/h;", column_index=2)
+    data['Propeller_specificThrust_gW'] = get_value_from_line(propeller_lines, "specific Thrust:;g/W;",
+                                                              column_index=2)
+
+    # --- Total Drive Section ---
+    total_drive_lines = get_section_lines("Total Drive;;", "Airplane", lines)
+    data['TotalDrive_Weight_g'] = get_value_from_line(total_drive_lines, "Drive Weight:;g;", column_index=2)
+    data['TotalDrive_PowerWeight_W_kg'] = get_value_from_line(total_drive_lines, "Power-Weight:;W/kg;",
+                                                              column_index=2)
+    data['TotalDrive_ThrustWeight_ratio'] = get_value_from_line(total_drive_lines, "Thrust-Weight:;: 1;",
+                                                                column_index=2)
+    data['TotalDrive_Current_max_A'] = get_value_from_line(total_drive_lines, "Current @ max:;A;", column_index=2)
+    data['TotalDrive_Pin_max_W'] = get_value_from_line(total_drive_lines, "P(in) @ max:;W;", column_index=2)
+    data['TotalDrive_Pout_max_W'] = get_value_from_line(total_drive_lines, "P(out) @ max:;W;", column_index=2)
+    data['TotalDrive_Efficiency_max_pct'] = get_value_from_line(total_drive_lines, "Efficiency @ max:;%;",
+                                                                column_index=2)
+
+
+    # --- Airplane Section ---
+    airplane_lines = get_section_lines("Airplane", "Remarks:;;", lines)
+    data['Airplane_NumMotors'] = get_value_from_line(airplane_lines, "# of Motors:;;", column_index=2)
+    data['Airplane_AllUpWeight_g'] = get_value_from_line(airplane_lines, "All-up Weight:;g;", column_index=2)
+    data['Airplane_WingArea'] = get_value_from_line(airplane_lines, "Wing Area:;;", column_index=2, is_float=False)
+    data['Airplane_WingLoad_g_dm2'] = get_value_from_line(airplane_lines, "Wing Load:;g/dm²;", column_index=2)
+    data['Airplane_CubicWingLoad'] = get_value_from_line(airplane_lines, "Cubic Wing Load:;;", column_index=2,
+                                                         is_float=False)
+    data['Airplane_estStallSpeed_kmh'] = get_value_from_line(airplane_lines, "est. Stall Speed:;km/h;",
+                                                             column_index=2)
+    data['Airplane_estSpeed_level_kmh'] = get_value_from_line(airplane_lines, "est. Speed (level):;km/h;",
+                                                              column_index=2)
+    data['Airplane_estSpeed_vertical_kmh'] = get_value_from_line(airplane_lines, "est. Speed (vertical):;km/h;",
+                                                                 column_index=2)
+    data['Airplane_estRateOfClimb_ms'] = get_value_from_line(airplane_lines, "est. rate of climb:;m/s;",
+                                                             column_index=2)
+
+    # --- Remarks ---
+    data['Remarks'] = get_value_from_line(lines, "Remarks:;;", column_index=2, is_float=False)
+
+    return pd.Series(data)
@@ -0,0 +1,125 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from fuzzywuzzy import fuzz
+
+from shared_catalog import SharedCatalog
+
+# Catalog strings each worker process scores against (None where missing), set once by _set_choices
+# in-process or by _init_worker in pool workers
+_choices = None
+
+
+def _set_choices(choices):
+    global _choices
+    _choices = choices
+
+
+def _share_choices(choices):
+    """
+    Publishes the choices once as a fixed-width string column plus a missing mask, so pool
+    workers read them from one shared segment instead of each unpickling a copy.
+    """
+    missing = np.array([choice is None for choice in choices], dtype=bool)
+    text = np.array(['' if choice is None else choice for choice in choices], dtype=str)
+    return SharedCatalog.publish_arrays('fuzzy_choices', {'choice': text, 'missing': missing})
+
+
+def _init_worker(handle):
+    shared = SharedCatalog.attach(handle)
+    _set_choices(_SharedChoices(shared['choice'], shared['missing']))
+
+
+class _SharedChoices:
+    """
+    Sequence view of shared choices: str per entry, None where missing.
+    """
+    def __init__(self, text, missing):
+        self.text = text
+        self.missing = missing
+
+    def __len__(self):
+        return len(self.text)
+
+    def __iter__(self):
+        return (None if missing else str(choice) for choice, missing in zip(self.text, self.missing))
+
+
+def _score_chunk(queries, scorer=fuzz.token_set_ratio):
+    """
+    Scores a chunk of queries against every choice. Missing (None) strings score -1.
+    """
+    scores = np.full((len(queries), len(_choices)), -1, dtype=np.int16)
+    for i, query in enumerate(queries):
+        if query is None:
+            continue
+        scores[i] = [scorer(query, choice, full_process=False) if choice is not None else -1
+                     for choice in _choices]
+    return scores
+
+
+def _best_in_chunk(queries, scorer=fuzz.token_set_ratio):
+    """
+    Reduces a chunk's score block to (argmax, score) per query inside the worker, so only
+    two small arrays travel back to the parent process.
+    """
+    scores = _score_chunk(queries, scorer)
+    best = scores.argmax(axis=1) if scores.shape[1] else np.zeros(len(queries), dtype=np.int64)
+    best_scores = scores[np.arange(len(queries)), best] if scores.shape[1] else np.full(len(queries), -1)
+    return best, best_scores
+
+
+def _run_chunks(func, queries, choices, chunk_size, max_workers, scorer):
+    max_workers = max_workers or os.cpu_count() or 1
+    if chunk_size is None:
+        # A few chunks per worker keeps the pool balanced when some queries are slower to score
+        chunk_size = max(1, -(-len(queries) // (4 * max_workers)))
+    chunks = [queries[i:i + chunk_size] for i in range(0, len(queries), chunk_size)]
+
+    if max_workers == 1 or len(chunks) <= 1:
+        _set_choices(choices)
+        return [func(chunk, scorer) for chunk in chunks]
+
+    with _share_choices(choices) as shared:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(shared.handle,)) as pool:
+            return list(pool.map(func, chunks, [scorer] * len(chunks)))
+
+
+def fuzzy_score_matrix(queries, choices, scorer=fuzz.token_set_ratio, chunk_size=None, max_workers=None):
+    """
+    Computes the full queries x choices similarity matrix.
+
+    Both `queries` and `choices` must already be processed with `motor_index.process_name`
+    (the motor name index keeps the catalog's processed names in `processed`), since the
+    scorer is called with `full_process=False`. Rows are scored in chunks of `chunk_size`
+    (by default about four chunks per worker) across a process pool of `max_workers`
+    (all cores by default; 1 runs in-process).
+
+    Returns:
+        np.ndarray: int16 array of shape (len(queries), len(choices)); -1 where a string is None.
+    """
+    queries, choices = list(queries), list(choices)
+    if not queries:
+        return np.empty((0, len(choices)), dtype=np.int16)
+    blocks = _run_chunks(_score_chunk, queries, choices, chunk_size, max_workers, scorer)
+    return np.vstack(blocks)
+
+
+def best_fuzzy_matches(queries, choices, scorer=fuzz.token_set_ratio, chunk_size=None, max_workers=None):
+    """
+    Like `fuzzy_score_matrix`, but returns only the argmax per query and its score.
+
+    Ties go to the lowest choice index, as in a first-to-last scan keeping strictly better scores.
+
+    Returns:
+        (np.ndarray, np.ndarray): Best choice index and best score for each query.
+    """
+    queries, choices = list(queries), list(choices)
+    if not queries:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int16)
+    results = _run_chunks(_best_in_chunk, queries, choices, chunk_size, max_workers, scorer)
+    best = np.concatenate([r[0] for r in results])
+    best_scores = np.concatenate([r[1] for r in results])
+    return best, best_scores
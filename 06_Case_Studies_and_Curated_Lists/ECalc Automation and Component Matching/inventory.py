@@ -0,0 +1,74 @@
+import os
+import pickle
+
+import pandas as pd
+
+from catalog import file_signature
+
+# --- Inventory Workbook ---
+
+INVENTORY_FILE = r'resources/udcData/udcData.xlsx'
+
+# In-process cache: workbook path -> ((mtime_ns, size), content hash, {sheet name: DataFrame})
+_loaded = {}
+
+
+def sidecar_path(workbook_path):
+    """
+    The parsed sheets are cached next to the workbook, e.g. udcData.xlsx -> .udcData.xlsx.sheets.pkl.
+    """
+    directory, file_name = os.path.split(workbook_path)
+    return os.path.join(directory, f'.{file_name}.sheets.pkl')
+
+
+def _read_sidecar(file_path, signature):
+    try:
+        with open(file_path, 'rb') as f:
+            stored = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    if stored.get('signature') != signature:
+        return None
+    return stored['sheets']
+
+
+def load_inventory(workbook_path=INVENTORY_FILE):
+    """
+    Returns every sheet of the inventory workbook as {sheet name: DataFrame}.
+
+    The workbook is parsed with openpyxl in a single pass over all sheets, and the result is
+    written to a binary sidecar keyed by the workbook's content hash. Later runs load the
+    sidecar and only re-parse the workbook when its contents change. Within a process the
+    sheets are kept in memory and the workbook is only re-hashed when its mtime or size changes.
+
+    The returned DataFrames are shared and must be treated as read-only.
+    """
+    key = os.path.abspath(workbook_path)
+    st = os.stat(workbook_path)
+    stat_key = (st.st_mtime_ns, st.st_size)
+    if key in _loaded and _loaded[key][0] == stat_key:
+        return _loaded[key][2]
+
+    signature = file_signature(workbook_path)
+    if key in _loaded and _loaded[key][1] == signature:
+        sheets = _loaded[key][2]
+    else:
+        sheets = _read_sidecar(sidecar_path(workbook_path), signature)
+        if sheets is None:
+            sheets = pd.read_excel(workbook_path, sheet_name=None)
+            try:
+                with open(sidecar_path(workbook_path), 'wb') as f:
+                    pickle.dump({'signature': signature, 'sheets': sheets}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError as e:
+                print(f"Warning: could not write inventory sidecar for {workbook_path}: {e}")
+
+    _loaded[key] = (stat_key, signature, sheets)
+    return sheets
+
+
+def inventory_sheet(sheet_name, workbook_path=INVENTORY_FILE):
+    """
+    Returns one sheet of the inventory workbook, e.g. 'Available Batteries' or 'Available Motors'.
+    """
+    return load_inventory(workbook_path)[sheet_name]
+
@@ -1,5 +1,9 @@
 import pandas as pd
 
+from catalog import load_catalog
+from inventory import inventory_sheet
+from match_store import MatchStore
+
 def retrieve_battery(inventory_battery):
     """
     Comparison Logic:
@@ -8,8 +12,7 @@ def retrieve_battery(inventory_battery):
     2. Among these candidates, select the one with the closest capacity to the
        'Capacity' of the inventory_battery.
     """
-    full_database_file_path = r'resources/ecalcData/pkl_data/batteries.pkl'
-    full_database_df = pd.read_pickle(full_database_file_path)
+    full_database_df = load_catalog('batteries')
     best_match = None
 
     inventory_c_rating = inventory_battery.get('C-rating')
@@ -20,38 +23,36 @@ def retrieve_battery(inventory_battery):
         print(f"Warning: 'C-rating' or 'Capacity' missing or invalid in inventory entry: {inventory_battery}")
         return None
 
-    # Filter candidates based on C-rate within +/- 5 and explicitly create a copy
-    candidates_df = full_database_df[abs(full_database_df['crate_max'] - inventory_c_rating) <= 5].copy()
+    # Filter candidates based on C-rate within +/- 5, without copying the catalog
+    candidates = abs(full_database_df['crate_max'] - inventory_c_rating) <= 5
 
-    if not candidates_df.empty:
-        # Calculate absolute capacity difference for candidates
-        candidates_df['capacity_diff'] = abs(candidates_df['capacity'] - inventory_capacity)
-        # Find the candidate with the minimum capacity difference
-        best_match = candidates_df.loc[candidates_df['capacity_diff'].idxmin()]
-        # Remove the temporary 'capacity_diff' column before returning
-        best_match = best_match.drop('capacity_diff')
+    if candidates.any():
+        # Find the candidate with the minimum absolute capacity difference
+        capacity_diff = abs(full_database_df.loc[candidates, 'capacity'] - inventory_capacity)
+        best_match = full_database_df.loc[capacity_diff.idxmin()]
 
     return best_match
 
 
-# Define file paths
-inventory_file_path = r'resources/udcData/udcData.xlsx'
-full_database_file_path = r'resources/ecalcData/pkl_data/batteries.pkl'
-
-inventory_df = pd.read_excel(inventory_file_path,sheet_name='Available Batteries')
-full_database_df = pd.read_pickle(full_database_file_path)
+if __name__ == '__main__':
+    inventory_df = inventory_sheet('Available Batteries')
+    full_database_df = load_catalog('batteries')
 
 
 
-print("\n--- Finding Best Matches ---")
+    print("\n--- Finding Best Matches ---")
 
-if not inventory_df.empty and not full_database_df.empty:
-    for index, inv_bat in inventory_df.iterrows():
-        match = retrieve_battery(inv_bat)
-        if match is not None:
-            print(f"\nInventory Battery (Row {index}): Battery No. {inv_bat.get('Battery No.')}, C-rating: {inv_bat.get('C-rating')}, Capacity: {inv_bat.get('Capacity')} mAh")
-            print(f"Best Match Found: {match.get('text')}, C-rating: {match.get('crate_const')}, Capacity: {match.get('capacity')} mAh")
-        else:
-            print(f"\nNo suitable match found for Inventory Battery (Row {index}): Battery No. {inv_bat.get('Battery No.')}, C-rating: {inv_bat.get('C-rating')}, Capacity: {inv_bat.get('Capacity')} mAh")
-else:
-    print("\nCannot perform matching: Inventory or Full Database is empty or failed to load.")
+    if not inventory_df.empty and not full_database_df.empty:
+        # Same rule as retrieve_battery (+/- 5 C, any cell voltage), evaluated for all rows at once.
+        # Rows unchanged since the last run are read back from the match store instead of re-matched.
+        match_store = MatchStore()
+        matches = match_store.match('battery', inventory_df, crate_window=5, cell_volt=None)
+        print(f"Re-matched {match_store.last_rematched} new or edited inventory rows")
+        for (index, inv_bat), (_, match) in zip(inventory_df.iterrows(), matches.iterrows()):
+            if not match.isna().all():
+                print(f"\nInventory Battery (Row {index}): Battery No. {inv_bat.get('Battery No.')}, C-rating: {inv_bat.get('C-rating')}, Capacity: {inv_bat.get('Capacity')} mAh")
+                print(f"Best Match Found: {match.get('text')}, C-rating: {match.get('crate_const')}, Capacity: {match.get('capacity')} mAh")
+            else:
+                print(f"\nNo suitable match found for Inventory Battery (Row {index}): Battery No. {inv_bat.get('Battery No.')}, C-rating: {inv_bat.get('C-rating')}, Capacity: {inv_bat.get('Capacity')} mAh")
+    else:
+        print("\nCannot perform matching: Inventory or Full Database is empty or failed to load.")
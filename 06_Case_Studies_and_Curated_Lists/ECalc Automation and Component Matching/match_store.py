@@ -0,0 +1,124 @@
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from Battery import match_battery_positions
+from Motor import match_motor_positions
+from catalog import ComponentCatalog, catalog_rows
+
+# --- Incremental Matching ---
+
+MATCH_STORE_FILE = r'resources/udcData/.match_store.pkl'
+
+# Bump when the matching logic changes so previously stored results are not reused
+MATCHER_VERSION = 1
+
+
+def _numeric(series):
+    return pd.to_numeric(series, errors='coerce').astype(float)
+
+
+def _text(series):
+    return series.map(lambda value: value if isinstance(value, str) else None)
+
+
+# kind -> catalog name, inventory columns the match depends on (with their normalization),
+# default matcher parameters and the batch function returning catalog positions
+MATCHERS = {
+    'battery': {
+        'catalog': 'batteries',
+        'columns': {'C-rating': _numeric, 'Capacity': _numeric},
+        'defaults': {'crate_window': 10, 'cell_volt': 3.7},
+        'match': lambda df, params, max_workers: match_battery_positions(df, **params),
+    },
+    'motor': {
+        'catalog': 'motors',
+        'columns': {'Model': _text},
+        'defaults': {'fuzzy_threshold': 70},
+        'match': lambda df, params, max_workers: match_motor_positions(df, max_workers=max_workers, **params),
+    },
+}
+
+
+def row_hashes(inventory_df, columns):
+    """
+    Content hash of each inventory row, computed over the (normalized) columns the match depends on.
+    Edits to other columns, or dtype changes such as an int column turning float, do not change it.
+    """
+    key_df = pd.DataFrame({name: normalize(inventory_df[name]) if name in inventory_df
+                           else pd.Series(None, index=inventory_df.index, dtype=object)
+                           for name, normalize in columns.items()})
+    return pd.util.hash_pandas_object(key_df, index=False).to_numpy()
+
+
+class MatchStore:
+    """
+    Persistent record of inventory match results.
+
+    Results are stored per (matcher kind, catalog content hash, matcher parameters) and, within
+    that, per inventory row content hash. Matching an inventory sheet only runs the matcher on
+    rows whose hash has not been seen for the current catalog and parameters; everything else is
+    read back from the store. Entries for older catalog versions are dropped when a catalog changes.
+    """
+    def __init__(self, file_path=MATCH_STORE_FILE):
+        self.file_path = file_path
+        self.results = {}
+        self.last_rematched = 0
+        try:
+            with open(file_path, 'rb') as f:
+                stored = pickle.load(f)
+            if stored.get('version') == MATCHER_VERSION:
+                self.results = stored['results']
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+    def match_positions(self, kind, inventory_df, max_workers=None, **params):
+        """
+        Returns the catalog position matched to each inventory row (-1 for no match).
+        """
+        matcher = MATCHERS[kind]
+        params = {**matcher['defaults'], **params}
+        matcher_catalog = ComponentCatalog.get(matcher['catalog'])
+        matcher_catalog.load()
+        signature = matcher_catalog.signature
+        key = (kind, signature, tuple(sorted(params.items())))
+
+        for stale in [k for k in self.results if k[0] == kind and k[1] != signature]:
+            del self.results[stale]
+        known = self.results.setdefault(key, {})
+
+        hashes = row_hashes(inventory_df, matcher['columns']).tolist()
+        # Rows not in the store yet; identical rows only need to be matched once
+        first_rows = {}
+        for row, row_hash in enumerate(hashes):
+            if row_hash not in known:
+                first_rows.setdefault(row_hash, row)
+        rows = np.fromiter(first_rows.values(), dtype=np.int64, count=len(first_rows))
+
+        if rows.size:
+            positions = matcher['match'](inventory_df.iloc[rows], params, max_workers)
+            known.update(zip(first_rows, positions.tolist()))
+        self.last_rematched = int(rows.size)
+
+        return np.array([known[row_hash] for row_hash in hashes], dtype=np.int64)
+
+    def match(self, kind, inventory_df, max_workers=None, **params):
+        """
+        Matches an inventory sheet ('battery' or 'motor'), re-running the matcher only on new or
+        edited rows, and saves the store.
+
+        Returns:
+            pd.DataFrame: Catalog rows aligned with `inventory_df.index`; rows without a match are all NaN.
+        """
+        positions = self.match_positions(kind, inventory_df, max_workers=max_workers, **params)
+        self.save()
+        full_database_df = ComponentCatalog.get(MATCHERS[kind]['catalog']).load()
+        return catalog_rows(full_database_df, positions, inventory_df.index)
+
+    def save(self):
+        tmp_path = f'{self.file_path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': MATCHER_VERSION, 'results': self.results}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.file_path)
@@ -0,0 +1,246 @@
+import numpy as np
+from aerosandbox import Atmosphere
+
+from Propulsion import max_rpm_array, solve_operating_point, static_thrust, throttle_for_thrust_array
+
+# --- Mission Endurance Simulation ---
+#
+# Integrates state of charge, open-circuit voltage, voltage sag and current draw through a
+# segmented mission for many propulsion candidates at once. Candidates are a struct of arrays
+# (one entry per candidate); every time step is a handful of array operations over all of them.
+
+# Resting LiPo cell voltage over state of charge (3.7 V nominal); other chemistries are scaled by cell_volt / 3.7
+LIPO_SOC = np.array([0.0, 0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0])
+LIPO_CELL_VOLT = np.array([3.27, 3.61, 3.69, 3.73, 3.77, 3.79, 3.82, 3.87, 3.93, 4.03, 4.11, 4.20])
+NOMINAL_CELL_VOLT = 3.7
+
+# Fraction of the capacity left unused, like eCalc's default 85% max discharge
+DEFAULT_RESERVE = 0.15
+# Loaded cell voltage below which the pack is considered exhausted
+CUTOFF_CELL_VOLT = 3.0
+# Bound on open-ended (fly until empty) segments, in s
+MAX_MISSION_TIME = 4 * 3600
+
+CANDIDATE_FIELDS = ('n_cells', 'cell_volt', 'capacity', 'battery_Rin', 'R_tot', 'kv', 'kt', 'i0',
+                    'NB', 'Pc', 'Tc', 'eff', 'diameter', 'pitch')
+
+
+class MissionSegment:
+    """
+    One leg of a mission, flown either at a fixed `throttle` (0-1) or at the throttle holding
+    `thrust` (g of dynamic thrust per drive; a scalar or one value per candidate).
+
+    Args:
+        name (str): Label, e.g. 'takeoff', 'climb', 'cruise', 'loiter'.
+        duration (float or None): Length in s; None flies until the battery reaches its reserve.
+        velocity (float): Airspeed in m/s.
+        altitude (float): Altitude in m, through the air-density ratio.
+    """
+    def __init__(self, name, duration, velocity, thrust=None, throttle=None, altitude=0.0):
+        if (thrust is None) == (throttle is None):
+            raise ValueError(f"Segment '{name}' needs exactly one of thrust or throttle.")
+        self.name = name
+        self.duration = duration
+        self.velocity = velocity
+        self.thrust = thrust
+        self.throttle = throttle
+        self.altitude = altitude
+
+
+def open_circuit_volt(soc, n_cells, cell_volt=NOMINAL_CELL_VOLT):
+    """
+    Resting pack voltage at state of charge `soc` (0-1).
+    """
+    return n_cells * np.interp(soc, LIPO_SOC, LIPO_CELL_VOLT) * cell_volt / NOMINAL_CELL_VOLT
+
+
+def propulsion_candidates(propulsions):
+    """
+    Candidate arrays from Propulsion objects (each needs a battery, motor and propeller).
+    """
+    column = lambda attribute: np.array([float(getattr(p, attribute)) for p in propulsions])
+    return {
+        'n_cells': column('battery_n_cells'),
+        'cell_volt': column('battery_voltpercell'),
+        'capacity': column('battery_capacity'),
+        'battery_Rin': column('battery_Rin'),
+        'R_tot': column('R_tot'),
+        'kv': column('motor_kv'),
+        'kt': column('motor_kt'),
+        'i0': column('motor_i0'),
+        'NB': column('propeller_NB'),
+        'Pc': column('propeller_Pc'),
+        'Tc': column('propeller_Tc'),
+        'eff': column('propeller_eff'),
+        'diameter': column('propeller_diameter'),
+        'pitch': column('propeller_pitch'),
+    }
+
+
+def design_candidates(results, options):
+    """
+    Candidate arrays from design_space results (a chunk dict or DataFrame with the 'battery',
+    'motor', 'esc' and 'propeller' option indices) and the options they index.
+    """
+    ib, im, ie, ip = (np.asarray(results[component]) for component in ('battery', 'motor', 'esc', 'propeller'))
+    battery, motor, esc, prop = (options[component] for component in ('battery', 'motor', 'esc', 'propeller'))
+    return {
+        'n_cells': battery['n_cells'][ib],
+        'cell_volt': battery['volt'][ib] / battery['n_cells'][ib],
+        'capacity': battery['capacity'][ib],
+        'battery_Rin': battery['Rin'][ib],
+        'R_tot': battery['Rin'][ib] + motor['Rin'][im] + esc['Rin'][ie],
+        'kv': motor['kv'][im],
+        'kt': motor['kt'][im],
+        'i0': motor['i0'][im],
+        **{field: prop[field][ip] for field in ('NB', 'Pc', 'Tc', 'eff', 'diameter', 'pitch')},
+    }
+
+
+def _operating_point(c, soc, segment, thrust, density_ratio):
+    """
+    Throttle, battery current (A) and loaded pack voltage of every candidate at state of charge `soc`.
+
+    The full-throttle rpm is re-balanced against the current open-circuit voltage, so the thrust
+    available falls as the pack discharges. The battery current is the electrical power into the
+    drive divided by the open-circuit voltage (at full throttle this is the motor current).
+    """
+    v_oc = open_circuit_volt(soc, c['n_cells'], c['cell_volt'])
+    rpm_max = max_rpm_array(c['NB'], c['Pc'] * density_ratio, c['diameter'], c['pitch'],
+                            c['kt'], c['kv'], c['i0'], v_oc, c['R_tot'])
+    if segment.throttle is None:
+        t_static_max = static_thrust(rpm_max, c['NB'], c['Tc'], c['eff'], c['diameter'], c['pitch'], density_ratio)
+        throttle, reachable = throttle_for_thrust_array(t_static_max, rpm_max, c['pitch'], segment.velocity, thrust)
+    else:
+        throttle = np.full(len(soc), float(segment.throttle))
+        reachable = np.isfinite(rpm_max)
+
+    outputs = solve_operating_point(rpm_max, throttle, segment.velocity, c['NB'], c['Tc'], c['Pc'], c['eff'],
+                                    c['diameter'], c['pitch'], c['kt'], c['kv'], c['i0'], v_oc, c['R_tot'],
+                                    density_ratio)
+    current = outputs['BatteryCurrent']
+    return throttle, reachable & np.isfinite(current), current, v_oc - current * c['battery_Rin']
+
+
+def simulate_mission(candidates, segments, dt=1.0, reserve=DEFAULT_RESERVE, cutoff_cell_volt=CUTOFF_CELL_VOLT,
+                     max_time=MAX_MISSION_TIME):
+    """
+    Flies every candidate through `segments` in order with explicit time steps of `dt` seconds.
+
+    A candidate stops when its usable charge (capacity x (1 - reserve)) is spent, when a segment's
+    thrust is out of reach, or when its loaded voltage drops below `cutoff_cell_volt` per cell. The
+    last step is shortened so the charge ends exactly at the reserve. Open-ended segments also end
+    once the candidate's whole mission reaches `max_time` (s).
+
+    Args:
+        candidates (dict): Arrays named as in CANDIDATE_FIELDS (see propulsion_candidates and
+            design_candidates); capacity in mAh, resistances in Ohm.
+        segments (list): MissionSegment objects.
+
+    Returns:
+        dict: Per candidate, 'endurance' (min flown), 'completed' (every fixed-length segment flown),
+        'failed_segment' (index of the segment it stopped in before finishing, -1 if none), 'soc',
+        'energy' (Wh drawn), 'min_volt' (lowest loaded pack voltage), 'max_current' (A) and
+        'segment_charge' (mAh drawn per segment, shape (candidates, segments)).
+    """
+    c = {field: np.asarray(candidates[field], dtype=float) for field in CANDIDATE_FIELDS}
+    n = len(c['capacity'])
+    usable = c['capacity'] * (1 - reserve)
+    cutoff = cutoff_cell_volt * c['n_cells']
+    sea_level_density = Atmosphere(altitude=0).density()
+
+    used = np.zeros(n)
+    flown = np.zeros(n)
+    energy = np.zeros(n)
+    min_volt = np.full(n, np.inf)
+    max_current = np.zeros(n)
+    segment_charge = np.zeros((n, len(segments)))
+    active = np.ones(n, dtype=bool)
+    failed_segment = np.full(n, -1)
+
+    for s, segment in enumerate(segments):
+        density_ratio = Atmosphere(altitude=segment.altitude).density() / sea_level_density
+        thrust = np.broadcast_to(np.asarray(segment.thrust if segment.thrust is not None else 0.0, dtype=float), (n,))
+        open_ended = segment.duration is None
+        # An open-ended segment lasts until the least-flown candidate reaches max_time; each
+        # candidate is capped at max_time on its own below
+        duration = segment.duration if not open_ended else max(max_time - flown[active].min(initial=max_time), 0.0)
+        elapsed = 0.0
+        while elapsed < duration - 1e-9 and active.any():
+            h = min(dt, duration - elapsed)
+            throttle, ok, current, volt = _operating_point(c, 1 - used / c['capacity'], segment, thrust, density_ratio)
+            ok &= volt >= cutoff
+            current = np.where(ok, current, 0.0)
+            # Time until the usable charge is spent at this current, capped at the step
+            with np.errstate(divide='ignore', invalid='ignore'):
+                step = np.where(current > 0, np.minimum(h, (usable - used) * 3.6 / current), h)
+            if open_ended:
+                step = np.minimum(step, max_time - flown)
+            step = np.where(active & ok, np.maximum(step, 0.0), 0.0)
+
+            charge = current * step / 3.6
+            used += charge
+            segment_charge[:, s] += charge
+            energy += current * volt * step / 3600
+            flown += step
+            running = active & ok
+            min_volt = np.where(running, np.minimum(min_volt, volt), min_volt)
+            max_current = np.where(running, np.maximum(max_current, current), max_current)
+
+            stopped = active & (~ok | (used >= usable * (1 - 1e-12)))
+            if open_ended:
+                stopped |= active & (flown >= max_time - 1e-9)
+            # Running out of charge or time is how an open-ended segment ends, not a failure
+            failed = stopped if not open_ended else stopped & ~ok
+            failed_segment[failed] = s
+            active &= ~stopped
+            elapsed += h
+
+    return {
+        'endurance': flown / 60,
+        'completed': failed_segment < 0,
+        'failed_segment': failed_segment,
+        'soc': 1 - used / c['capacity'],
+        'energy': energy,
+        'min_volt': min_volt,
+        'max_current': max_current,
+        'segment_charge': segment_charge,
+    }
+
+
+if __name__ == '__main__':
+    import time
+
+    import pandas as pd
+
+    from design_space import catalog_design_space, explore_top_k
+
+    # Rank the 2000 best-T/W combinations of a catalog slice by endurance over a small mission
+    options = catalog_design_space(series_cells=(4, 6))
+    take = lambda component, rows: {field: values[rows] for field, values in options[component].items()}
+    t_motor = np.array([name.startswith('T-Motor ') for name in options['motor']['name']], dtype=bool)
+    options['motor'] = take('motor', np.flatnonzero(t_motor)[:100])
+    options['esc'] = take('esc', slice(None, None, 15))
+    options['propeller'] = take('propeller', slice(None, 2 * 7))
+    airframe_weight = 1500.0
+
+    candidates_df = explore_top_k(options, k=2000, objective='T_W', airframe_weight=airframe_weight)
+    weight = airframe_weight + candidates_df['drive_weight'].to_numpy()
+    segments = [
+        MissionSegment('takeoff', 5, velocity=0.0, throttle=1.0),
+        MissionSegment('climb', 60, velocity=12.0, thrust=0.45 * weight),
+        MissionSegment('cruise', 600, velocity=18.0, thrust=0.25 * weight),
+        MissionSegment('loiter', None, velocity=14.0, thrust=0.2 * weight),
+    ]
+
+    start = time.perf_counter()
+    mission = simulate_mission(design_candidates(candidates_df, options), segments)
+    print(f"Simulated {len(candidates_df)} candidates in {time.perf_counter() - start:.2f} s")
+
+    candidates_df['mission_endurance'] = mission['endurance']
+    candidates_df['completed'] = mission['completed']
+    candidates_df['min_volt'] = mission['min_volt']
+    ranked = candidates_df[candidates_df['completed']].sort_values('mission_endurance', ascending=False)
+    with pd.option_context('display.width', 250, 'display.max_columns', 20):
+        print(ranked[['battery_name', 'n_cells', 'motor_name', 'propeller_name', 'propeller_diameter',
+                      'drive_weight', 'T_W', 'mission_endurance', 'min_volt']].head(10))
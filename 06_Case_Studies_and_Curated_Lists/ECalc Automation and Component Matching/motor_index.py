@@ -0,0 +1,203 @@
+import math
+import os
+import pickle
+import re
+from collections import defaultdict
+
+import numpy as np
+from fuzzywuzzy import fuzz, utils
+
+from catalog import ComponentCatalog
+from fuzzy_batch import best_fuzzy_matches
+
+# Bump whenever the on-disk layout or the normalization below changes
+INDEX_VERSION = 2
+# A shortlist winner scoring below fuzzy_threshold + FULL_SCAN_MARGIN is re-checked against the
+# whole catalog, since a name outside the shortlist may score higher
+FULL_SCAN_MARGIN = 10
+
+
+def clean_model_name(name):
+    """
+    Removes text in parentheses from a string and strips whitespace.
+    E.g., "KDE5215XF-330 (330)" becomes "KDE5215XF-330".
+    """
+    if isinstance(name, str):
+        return re.sub(r'\s*\(.*\)\s*', '', name).strip()
+    return name
+
+
+def process_name(name):
+    """
+    fuzzywuzzy's default string processing, applied once up front so scorers can be called
+    with `full_process=False`.
+    """
+    return utils.full_process(name, force_ascii=True)
+
+
+def name_tokens(name):
+    """
+    Lower-cased alphanumeric tokens of a model name, mirroring fuzzywuzzy's default processing.
+    """
+    return re.findall(r'[a-z0-9]+', name.lower())
+
+
+def name_grams(name):
+    """
+    The set of keys a model name is indexed under: its tokens plus the character
+    trigrams of its space-joined tokens.
+    """
+    tokens = name_tokens(name)
+    joined = f" {' '.join(tokens)} "
+    grams = {f't:{token}' for token in tokens}
+    grams.update(f'g:{joined[i:i + 3]}' for i in range(len(joined) - 2))
+    return grams
+
+
+class MotorNameIndex:
+    """
+    Lookup structure over the 'type' column of the motor database.
+
+    * `exact` / `cleaned` map the lower-cased (cleaned) model name to the first catalog row
+      carrying it, so exact lookups are dictionary hits.
+    * `postings` is an inverted index from token/trigram keys to catalog row positions. It is
+      used to shortlist the `top_k` most similar names so that `fuzz.token_set_ratio` only has
+      to run on a handful of rows instead of the whole catalog.
+    """
+    def __init__(self, types, signature=None):
+        self.signature = signature
+        self.processed = [process_name(t) if isinstance(t, str) else None for t in types]
+        self.exact = {}
+        self.cleaned = {}
+        postings = defaultdict(list)
+
+        for position, name in enumerate(types):
+            if not isinstance(name, str):
+                continue
+            self.exact.setdefault(name.lower(), position)
+            self.cleaned.setdefault(clean_model_name(name).lower(), position)
+            for gram in name_grams(name):
+                postings[gram].append(position)
+
+        n_rows = max(len(types), 1)
+        self.postings = {gram: np.asarray(rows, dtype=np.int32) for gram, rows in postings.items()}
+        self.idf = {gram: math.log(1 + n_rows / len(rows)) for gram, rows in postings.items()}
+        self.n_rows = len(types)
+
+    def exact_position(self, model):
+        return self.exact.get(model.lower())
+
+    def cleaned_position(self, model):
+        return self.cleaned.get(clean_model_name(model).lower())
+
+    def shortlist(self, model, top_k=50):
+        """
+        Returns the catalog positions (ascending) of the `top_k` names sharing the most
+        idf-weighted tokens and trigrams with `model`.
+        """
+        grams = [gram for gram in name_grams(model) if gram in self.postings]
+        if not grams:
+            return np.empty(0, dtype=np.int32)
+
+        rows = np.concatenate([self.postings[gram] for gram in grams])
+        weights = np.concatenate([np.full(len(self.postings[gram]), self.idf[gram]) for gram in grams])
+        scores = np.bincount(rows, weights=weights, minlength=self.n_rows)
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        return np.sort(candidates)
+
+    def best_in_shortlist(self, model, top_k=50):
+        """
+        Returns (position, score) of the best `fuzz.token_set_ratio` match among the shortlist,
+        or (None, -1) if the shortlist is empty. Ties go to the lowest position.
+        """
+        model_processed = process_name(model)
+        best_position = None
+        highest_score = -1
+
+        for position in self.shortlist(model, top_k):
+            score = fuzz.token_set_ratio(model_processed, self.processed[position], full_process=False)
+            if score > highest_score:
+                highest_score = score
+                best_position = int(position)
+        return best_position, highest_score
+
+    def best_fuzzy_many(self, models, fuzzy_threshold=70, top_k=50, max_workers=None):
+        """
+        Best fuzzy match for each of `models`: the shortlist winner, unless it scores below
+        fuzzy_threshold + FULL_SCAN_MARGIN, in which case the whole catalog is scored (through
+        fuzzy_batch, across `max_workers` processes).
+
+        The result is approximate: a shortlist winner above the margin is kept even if a name
+        outside the shortlist would score higher. find_best_match and match_motors both go
+        through here, so they agree.
+
+        Returns:
+            list: (position, score) per model; position is None if nothing reaches `fuzzy_threshold`.
+        """
+        results = [self.best_in_shortlist(model, top_k) for model in models]
+        rescan = [i for i, (_, score) in enumerate(results) if score < fuzzy_threshold + FULL_SCAN_MARGIN]
+        if rescan:
+            best, scores = best_fuzzy_matches([process_name(models[i]) for i in rescan], self.processed,
+                                              max_workers=max_workers)
+            for i, position, score in zip(rescan, best, scores):
+                results[i] = (int(position), int(score))
+        return [(position if score >= fuzzy_threshold else None, score) for position, score in results]
+
+    def best_fuzzy(self, model, fuzzy_threshold=70, top_k=50):
+        """
+        Returns (position, score) of the best fuzzy match as in `best_fuzzy_many`, or
+        (None, best score) if nothing reaches `fuzzy_threshold`.
+        """
+        return self.best_fuzzy_many([model], fuzzy_threshold, top_k, max_workers=1)[0]
+
+    def save(self, file_path):
+        with open(file_path, 'wb') as f:
+            pickle.dump({'version': INDEX_VERSION, 'index': self.__dict__}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, file_path, signature):
+        """
+        Loads a persisted index, returning None if it is missing, stale or from another version.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                stored = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        if stored.get('version') != INDEX_VERSION or stored['index'].get('signature') != signature:
+            return None
+        index = cls.__new__(cls)
+        index.__dict__.update(stored['index'])
+        return index
+
+
+def index_path(catalog_file_path):
+    """
+    The index is persisted next to the catalog, e.g. motors.pkl -> motors.index.pkl.
+    """
+    root, _ = os.path.splitext(catalog_file_path)
+    return f'{root}.index.pkl'
+
+
+def motor_name_index(catalog_name='motors'):
+    """
+    Returns the name index for a motor catalog, loading it from disk when it is up to date
+    with the catalog's content hash and rebuilding (and re-persisting) it otherwise.
+    """
+    motor_catalog = ComponentCatalog.get(catalog_name)
+
+    def build(df):
+        file_path = index_path(motor_catalog.file_path)
+        index = MotorNameIndex.load(file_path, motor_catalog.signature)
+        if index is None:
+            index = MotorNameIndex(df['type'].tolist(), signature=motor_catalog.signature)
+            try:
+                index.save(file_path)
+            except OSError as e:
+                print(f"Warning: could not persist motor name index to {file_path}: {e}")
+        return index
+
+    return motor_catalog.cached('name_index', build)
@@ -0,0 +1,149 @@
+import hashlib
+import os
+import pickle
+
+import numpy as np
+
+# --- Propulsion Performance Tables ---
+
+TABLE_DIR = r'resources/ecalcData/performance_tables'
+
+# Bump when the table layout or the model the tables are built from changes
+TABLE_VERSION = 2
+
+AXES = ('velocity', 'throttle', 'altitude')
+
+# eCalc result fields (see calc.parse_ecalc_csv) -> table outputs, with the factor to table units
+ECALC_OUTPUTS = {
+    'T_static': ('Propeller_StaticThrust_g', 1.0),
+    'T_dynamic': ('Propeller_availThrust_g_kmh', 1.0),
+    'rpm': ('Propeller_Revolutions_rpm', 1.0),
+    'Pm': ('Motor_mechPower_W', 1.0),
+    'CurrentDraw': ('Motor_Current_A', 1.0),
+    'efficiency': ('Motor_Efficiency_pct', 0.01),
+}
+
+
+def table_key(*parts):
+    """
+    Short content key for a component set and grid, used as the table's file name.
+    """
+    return hashlib.sha1(repr((TABLE_VERSION,) + parts).encode('utf-8')).hexdigest()[:16]
+
+
+def table_path(key):
+    return os.path.join(TABLE_DIR, f'{key}.pkl')
+
+
+class PerformanceTable:
+    """
+    Dense grid of propulsion outputs (thrust, current, power, efficiency, ...) over
+    velocity (m/s) x throttle (0-1) x altitude (m), queried by multilinear interpolation.
+
+    `values[name]` has shape (len(velocity), len(throttle), len(altitude)). Queries outside the
+    grid are clamped to its edges, like np.interp; an axis with a single point is constant.
+    """
+    def __init__(self, axes, values, key=None, source=None):
+        self.axes = {name: np.asarray(axes[name], dtype=float) for name in AXES}
+        shape = tuple(len(self.axes[name]) for name in AXES)
+        self.values = {name: np.asarray(array, dtype=float).reshape(shape) for name, array in values.items()}
+        self.key = key
+        self.source = source
+
+    @property
+    def outputs(self):
+        return list(self.values)
+
+    def _corners(self, axis, x):
+        """
+        Lower grid index and weight of the upper neighbour for each query point on one axis.
+        """
+        grid = self.axes[axis]
+        if len(grid) == 1:
+            return np.zeros(x.shape, dtype=np.int64), np.zeros(x.shape)
+        x = np.clip(x, grid[0], grid[-1])
+        lower = np.clip(np.searchsorted(grid, x, side='right') - 1, 0, len(grid) - 2)
+        weight = (x - grid[lower]) / (grid[lower + 1] - grid[lower])
+        return lower, weight
+
+    def __call__(self, velocity, throttle, altitude=0.0, outputs=None):
+        """
+        Interpolates the requested outputs (all by default) at broadcast query arrays.
+
+        Returns:
+            dict: {output name: array with the broadcast shape of the queries}.
+        """
+        queries = np.broadcast_arrays(np.asarray(velocity, dtype=float), np.asarray(throttle, dtype=float),
+                                      np.asarray(altitude, dtype=float))
+        corners = [self._corners(axis, x) for axis, x in zip(AXES, queries)]
+        (iv, wv), (it, wt), (ia, wa) = corners
+
+        results = {}
+        for name in outputs or self.outputs:
+            table = self.values[name]
+            result = np.zeros(queries[0].shape)
+            for dv in (0, 1):
+                for dt in (0, 1):
+                    for da in (0, 1):
+                        weight = (wv if dv else 1 - wv) * (wt if dt else 1 - wt) * (wa if da else 1 - wa)
+                        # Corners with zero weight may point past a single-point axis, so clip the index
+                        index = (np.minimum(iv + dv, table.shape[0] - 1),
+                                 np.minimum(it + dt, table.shape[1] - 1),
+                                 np.minimum(ia + da, table.shape[2] - 1))
+                        result = result + weight * table[index]
+            results[name] = result
+        return results
+
+    def save(self, file_path=None):
+        file_path = file_path or table_path(self.key)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        tmp_path = f'{file_path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': TABLE_VERSION, 'key': self.key, 'source': self.source,
+                         'axes': self.axes, 'values': self.values}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, file_path)
+
+    @classmethod
+    def load(cls, key, file_path=None):
+        """
+        Loads a persisted table, returning None if it is missing, of another version or another key.
+        """
+        try:
+            with open(file_path or table_path(key), 'rb') as f:
+                stored = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        if stored.get('version') != TABLE_VERSION or stored.get('key') != key:
+            return None
+        return cls(stored['axes'], stored['values'], key=key, source=stored['source'])
+
+    @classmethod
+    def from_ecalc_results(cls, points, key=None):
+        """
+        Builds a table from stored eCalc results.
+
+        eCalc reports the drive at full throttle, at the flight speed and field elevation it was run
+        with, so each result is one grid point (velocity, 1.0, altitude). The results must cover every
+        (velocity, altitude) combination of the grid they span.
+
+        Args:
+            points (list): (velocity in m/s, altitude in m, eCalc result Series) tuples.
+
+        Returns:
+            PerformanceTable: Thrust in g, power in W, current in A; the throttle axis is [1.0].
+        """
+        velocities = np.unique([velocity for velocity, _, _ in points])
+        altitudes = np.unique([altitude for _, altitude, _ in points])
+        values = {name: np.full((len(velocities), 1, len(altitudes)), np.nan) for name in ECALC_OUTPUTS}
+        for velocity, altitude, results in points:
+            i = np.searchsorted(velocities, velocity)
+            k = np.searchsorted(altitudes, altitude)
+            for name, (field, factor) in ECALC_OUTPUTS.items():
+                value = results.get(field)
+                values[name][i, 0, k] = float(value) * factor if value is not None else np.nan
+        missing = np.isnan(values['T_static']).sum()
+        if missing:
+            raise ValueError(f"eCalc results leave {missing} of {len(velocities) * len(altitudes)} "
+                             f"(velocity, altitude) grid points empty")
+        axes = {'velocity': velocities, 'throttle': [1.0], 'altitude': altitudes}
+        return cls(axes, values, key=key, source='ecalc')
@@ -0,0 +1,148 @@
+import aerosandbox as asb
+import aerosandbox.numpy as np
+
+from Propulsion import max_rpm_root, solve_operating_point
+
+# --- Differentiable Propulsion Model ---
+#
+# The analytic Propulsion equations (rpm balance, thrust, power, current) evaluated through the
+# aerosandbox.numpy kernels of Propulsion.py, without lookups or memoization, so every parameter
+# may be a float, an array or an asb.Opti variable. Propulsion sizing (propeller diameter and
+# pitch, motor Kv, pack voltage, throttle) can then sit in the same gradient-based solve as the
+# airframe.
+#
+# Thrust is in g as in Propulsion; multiply by G / 1000 for N.
+
+G = 9.81
+
+
+def kt_from_kv(kv):
+    return 9.5694 / kv  # as in Motor
+
+
+def max_rpm(NB, Pc, diameter, pitch, kv, i0, volt, R_tot, density_ratio=1.0):
+    """
+    Full-throttle rpm where propeller load and motor torque balance (Propulsion.max_rpm_root,
+    which stays smooth for any positive parameters).
+    """
+    return max_rpm_root(NB, Pc * density_ratio, diameter, pitch, kt_from_kv(kv), kv, i0, volt, R_tot)
+
+
+def operating_point(throttle, velocity, NB, Tc, Pc, eff, diameter, pitch, kv, i0, volt, R_tot, density_ratio=1.0):
+    """
+    Analytic outputs at `throttle` (0-1) and `velocity` (m/s), with rpm = throttle x full-throttle rpm.
+
+    The dynamic thrust divides by the pitch speed, so keep `throttle` bounded away from zero when
+    it is an Opti variable.
+
+    Returns:
+        dict: 'rpm', 'T_static' and 'T_dynamic' (g), 'Pm' (shaft W), 'Torque' (Nm), 'CurrentDraw' (A),
+        'P_electric' (W drawn by motor, ESC and battery resistance), 'BatteryCurrent' (P_electric / volt)
+        and 'efficiency' (Pm / P_electric), from Propulsion.solve_operating_point.
+    """
+    rpm_max = max_rpm(NB, Pc, diameter, pitch, kv, i0, volt, R_tot, density_ratio)
+    return solve_operating_point(rpm_max, throttle, velocity, NB, Tc, Pc, eff, diameter, pitch, kt_from_kv(kv), kv,
+                                 i0, volt, R_tot, density_ratio)
+
+
+class PropulsionModel:
+    """
+    One drive (battery, motor, ESC, propeller) whose parameters may be Opti variables.
+
+    Args:
+        volt (float): Pack voltage. R_tot (float): Battery + motor + ESC resistance (Ohm).
+        kv, i0: Motor Kv (rpm/V) and no-load current (A).
+        NB, Tc, Pc, eff, diameter, pitch: Propeller blades, thrust and power constants, blade
+            efficiency, diameter and pitch (in).
+    """
+    def __init__(self, volt, R_tot, kv, i0, NB, Tc, Pc, eff, diameter, pitch):
+        self.volt = volt
+        self.R_tot = R_tot
+        self.kv = kv
+        self.i0 = i0
+        self.NB = NB
+        self.Tc = Tc
+        self.Pc = Pc
+        self.eff = eff
+        self.diameter = diameter
+        self.pitch = pitch
+
+    @classmethod
+    def from_propulsion(cls, propulsion):
+        """
+        The fixed parameters of an analytic Propulsion object, as a starting point to free some of them.
+        """
+        return cls(volt=propulsion.battery_volt, R_tot=propulsion.R_tot, kv=propulsion.motor_kv,
+                   i0=propulsion.motor_i0, NB=propulsion.propeller_NB, Tc=propulsion.propeller_Tc,
+                   Pc=propulsion.propeller_Pc, eff=propulsion.propeller_eff,
+                   diameter=propulsion.propeller_diameter, pitch=propulsion.propeller_pitch)
+
+    def max_rpm(self, density_ratio=1.0):
+        return max_rpm(self.NB, self.Pc, self.diameter, self.pitch, self.kv, self.i0, self.volt, self.R_tot,
+                       density_ratio)
+
+    def operating_point(self, throttle, velocity, density_ratio=1.0):
+        return operating_point(throttle, velocity, self.NB, self.Tc, self.Pc, self.eff, self.diameter, self.pitch,
+                               self.kv, self.i0, self.volt, self.R_tot, density_ratio)
+
+    def trimmed(self, opti, velocity, thrust, density_ratio=1.0, max_current=None, min_throttle=0.05):
+        """
+        Adds a throttle variable to `opti` constrained so the dynamic thrust equals `thrust` (N)
+        at `velocity`, and optionally the current to at most `max_current` (A).
+
+        Returns:
+            dict: The operating_point outputs with the throttle variable under 'throttle'.
+        """
+        throttle = opti.variable(init_guess=0.6, lower_bound=min_throttle, upper_bound=1)
+        outputs = self.operating_point(throttle, velocity, density_ratio)
+        opti.subject_to(outputs['T_dynamic'] * G / 1000 == thrust)
+        if max_current is not None:
+            opti.subject_to(outputs['CurrentDraw'] <= max_current)
+        outputs['throttle'] = throttle
+        return outputs
+
+
+if __name__ == '__main__':
+    # Joint wing and propulsion sizing: aspect ratio, cruise alpha, propeller size and motor Kv are
+    # solved together for the lowest cruise power, subject to lift = weight, thrust = drag at cruise
+    # and a full-throttle static thrust / current requirement.
+    MTOW = 9  # [kg]
+    S_ref = 0.6  # [m^2]
+    v_cruise = 20  # [m/s]
+
+    opti = asb.Opti()
+    AR = opti.variable(init_guess=10, lower_bound=4, upper_bound=25)
+    alpha = opti.variable(init_guess=4, lower_bound=-5, upper_bound=12)
+    diameter = opti.variable(init_guess=14, lower_bound=8, upper_bound=20)
+    pitch = opti.variable(init_guess=7, lower_bound=4, upper_bound=12)
+    kv = opti.variable(init_guess=400, lower_bound=150, upper_bound=1500)
+
+    span = (S_ref * AR) ** 0.5
+    chord = (S_ref / AR) ** 0.5
+    wing = asb.Wing(name="Main Wing", symmetric=True, xsecs=[
+        asb.WingXSec(xyz_le=[0, 0, 0], chord=chord, airfoil=asb.Airfoil("naca2412")),
+        asb.WingXSec(xyz_le=[0, span / 2, 0], chord=chord, airfoil=asb.Airfoil("naca2412")),
+    ])
+    airplane = asb.Airplane(wings=[wing], s_ref=S_ref, c_ref=chord, b_ref=span)
+    aero = asb.AeroBuildup(airplane=airplane, op_point=asb.OperatingPoint(velocity=v_cruise, alpha=alpha)).run()
+
+    # 6S pack, MN705-S-like motor parameters, APC Electric E-like propeller constants
+    drive = PropulsionModel(volt=22.2, R_tot=0.035, kv=kv, i0=2.8, NB=2, Tc=1.0, Pc=1.0, eff=0.97,
+                            diameter=diameter, pitch=pitch)
+    cruise = drive.trimmed(opti, v_cruise, aero['D'])
+    full = drive.operating_point(1.0, 0.0)
+
+    opti.subject_to([
+        aero['L'] == MTOW * G,
+        full['T_static'] * G / 1000 >= 0.6 * MTOW * G,
+        full['CurrentDraw'] <= 60,
+        pitch <= 0.7 * diameter,
+    ])
+    opti.minimize(cruise['P_electric'])
+
+    sol = opti.solve(verbose=False)
+    print(f"AR = {sol(AR):.2f}, alpha = {sol(alpha):.2f} deg, drag = {sol(aero['D']):.2f} N")
+    print(f"Propeller {sol(diameter):.1f}x{sol(pitch):.1f} in, Kv = {sol(kv):.0f}")
+    print(f"Cruise: throttle {sol(cruise['throttle']):.2f}, {sol(cruise['CurrentDraw']):.1f} A, "
+          f"{sol(cruise['P_electric']):.0f} W, efficiency {sol(cruise['efficiency']):.2f}")
+    print(f"Full throttle: {sol(full['T_static']):.0f} g static thrust, {sol(full['CurrentDraw']):.1f} A")
@@ -0,0 +1,174 @@
+import numpy as np
+
+# --- Streaming Ranking ---
+#
+# Both rankers consume batches given as {field: 1-d array} dicts (all arrays of one batch have
+# the same length) and keep only the rows they may still return, so memory does not grow with
+# the number of rows scanned.
+
+# Rows compared for dominance at a time; bounds the (points x block) comparison arrays
+DOMINANCE_BLOCK = 1024
+# Strong rows every candidate is checked against before the full non-dominated sort
+PIVOTS = 64
+
+
+def _take(batch, rows):
+    return {field: values[rows] for field, values in batch.items()}
+
+
+def _concat(first, second):
+    if first is None:
+        return second
+    return {field: np.concatenate([first[field], second[field]]) for field in first}
+
+
+class TopK:
+    """
+    Keeps the `k` rows with the largest (or, with `largest=False`, smallest) `objective` seen so far.
+
+    Each batch is merged with the current top k and cut back to k with a partial sort, so at most
+    k + batch size rows are held at any time. Ties keep the earlier row; k <= 0 keeps none.
+    """
+    def __init__(self, k, objective, largest=True):
+        self.k = k
+        self.objective = objective
+        self.largest = largest
+        self.rows = None
+        self.n_seen = 0
+
+    def update(self, batch):
+        self.n_seen += len(batch[self.objective])
+        if self.k <= 0:
+            self.rows = _take(batch, slice(0, 0))
+            return
+        rows = _concat(self.rows, batch)
+        values = rows[self.objective]
+        if len(values) > self.k:
+            rows = _take(rows, self._cut(-values if self.largest else values))
+        self.rows = rows
+
+    def _cut(self, key):
+        """
+        Positions of the k smallest keys in row order. The k-th key is found with a partial sort;
+        rows tied with it are taken first come, first kept, and NaN keys rank last.
+        """
+        kth = np.partition(key, self.k - 1)[self.k - 1]
+        if np.isnan(kth):
+            better, tied = ~np.isnan(key), np.isnan(key)
+        else:
+            better, tied = key < kth, key == kth
+        better = np.flatnonzero(better)
+        tied = np.flatnonzero(tied)[:self.k - len(better)]
+        return np.sort(np.concatenate([better, tied]))
+
+    def result(self):
+        """
+        The kept rows, best first.
+        """
+        if self.rows is None:
+            return {}
+        values = self.rows[self.objective]
+        order = np.argsort(-values if self.largest else values, kind='stable')
+        return _take(self.rows, order)
+
+
+def _dominated_by(points, front):
+    """
+    For each row of `points`, True if some row of `front` is at least as good in every objective
+    and better in one (all objectives maximized).
+    """
+    dominated = np.zeros(len(points), dtype=bool)
+    if len(front) == 0 or len(points) == 0:
+        return dominated
+    for start in range(0, len(front), DOMINANCE_BLOCK):
+        block = front[start:start + DOMINANCE_BLOCK]
+        at_least = np.ones((len(points), len(block)), dtype=bool)
+        better = np.zeros((len(points), len(block)), dtype=bool)
+        for j in range(points.shape[1]):
+            at_least &= block[None, :, j] >= points[:, None, j]
+            better |= block[None, :, j] > points[:, None, j]
+        dominated |= (at_least & better).any(axis=1)
+    return dominated
+
+
+def _pivots(points, n_pivots=PIVOTS):
+    """
+    The `n_pivots` rows with the best sum of range-normalized objectives. They dominate most of
+    a large set, so filtering against them first leaves little for the full comparison.
+    """
+    low = points.min(axis=0)
+    scale = points.max(axis=0) - low
+    scale[scale == 0] = 1.0
+    score = ((points - low) / scale).sum(axis=1)
+    if len(points) > n_pivots:
+        return points[np.argpartition(-score, n_pivots - 1)[:n_pivots]]
+    return points
+
+
+def pareto_mask(points):
+    """
+    Non-dominated rows of `points` (n x objectives, all maximized). Of rows with identical
+    objectives only the first is kept.
+
+    Rows dominated by one of a few strong pivot rows are dropped first. The rest are visited in
+    descending lexicographic order, so a row can only be dominated by rows visited before it;
+    each block of rows is checked against the front found so far and against itself.
+    """
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    candidates = np.flatnonzero(~_dominated_by(points, _pivots(points)))
+    order = candidates[np.lexsort(tuple(-points[candidates, j] for j in reversed(range(points.shape[1]))))]
+    ordered = points[order]
+    # Identical rows are adjacent after sorting
+    duplicate = np.zeros(len(order), dtype=bool)
+    duplicate[1:] = (ordered[1:] == ordered[:-1]).all(axis=1)
+
+    front = np.empty((0, points.shape[1]))
+    for start in range(0, len(order), DOMINANCE_BLOCK):
+        block = ordered[start:start + DOMINANCE_BLOCK]
+        survivors = ~duplicate[start:start + DOMINANCE_BLOCK] & ~_dominated_by(block, front)
+        survivors &= ~_dominated_by(block, block)
+        keep[order[start:start + DOMINANCE_BLOCK][survivors]] = True
+        front = np.vstack([front, block[survivors]])
+    return keep
+
+
+class ParetoFront:
+    """
+    Incrementally maintained set of non-dominated rows.
+
+    Args:
+        objectives (dict): {field: 'max' or 'min'}.
+
+    Each batch is first filtered against the current front, then the survivors and the front are
+    reduced to their joint front. Memory is bounded by the size of the front, not by the number
+    of rows scanned.
+    """
+    def __init__(self, objectives):
+        self.objectives = dict(objectives)
+        self.signs = np.array([1.0 if sense == 'max' else -1.0 for sense in self.objectives.values()])
+        self.rows = None
+        self.n_seen = 0
+
+    def _points(self, rows):
+        return np.column_stack([rows[field] for field in self.objectives]) * self.signs
+
+    def update(self, batch):
+        self.n_seen += len(next(iter(batch.values())))
+        points = self._points(batch)
+        candidates = np.isfinite(points).all(axis=1)
+        if self.rows is not None:
+            candidates[candidates] = ~_dominated_by(points[candidates], self._points(self.rows))
+        rows = _concat(self.rows, _take(batch, np.flatnonzero(candidates)))
+        self.rows = _take(rows, np.flatnonzero(pareto_mask(self._points(rows))))
+
+    def result(self):
+        """
+        The front, ordered by the first objective (best first).
+        """
+        if self.rows is None:
+            return {}
+        first = self._points(self.rows)[:, 0]
+        return _take(self.rows, np.argsort(-first, kind='stable'))
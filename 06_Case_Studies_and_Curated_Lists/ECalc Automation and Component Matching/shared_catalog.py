@@ -0,0 +1,152 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from catalog import ComponentCatalog
+
+# Shared-memory segments this process has attached to, kept alive for the process lifetime
+_attached = {}
+
+
+def _attach_segment(segment_name):
+    """
+    Attaches to an existing segment. Pool workers share the publisher's resource tracker, so
+    on Pythons without `track=False` (< 3.13) their registration is a harmless duplicate.
+    """
+    try:
+        return shared_memory.SharedMemory(name=segment_name, create=False, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=segment_name, create=False)
+
+
+class SharedCatalogHandle:
+    """
+    Picklable description of a published catalog: the segment name plus, per column, its
+    dtype, length and byte offset. Dictionary-encoded string columns carry their values.
+    """
+    def __init__(self, catalog_name, segment_name, n_rows, layout, dictionaries):
+        self.catalog_name = catalog_name
+        self.segment_name = segment_name
+        self.n_rows = n_rows
+        self.layout = layout
+        self.dictionaries = dictionaries
+
+
+class SharedCatalog:
+    """
+    A component catalog published once into a single shared-memory segment.
+
+    The publishing process copies the numeric columns (and int32 codes of any requested
+    string columns) into the segment and hands `handle` to worker processes. Workers call
+    `SharedCatalog.attach(handle)` and get numpy views onto the same pages, so an N-worker
+    pool holds one copy of the catalog instead of N unpickled DataFrames.
+
+    The publisher owns the segment and must `close()` it (or use it as a context manager)
+    once the workers are done.
+    """
+    def __init__(self, handle, segment, owner):
+        self.handle = handle
+        self._segment = segment
+        self._owner = owner
+        self.arrays = {}
+        for column, (dtype, offset) in handle.layout.items():
+            array = np.ndarray((handle.n_rows,), dtype=np.dtype(dtype), buffer=segment.buf, offset=offset)
+            array.flags.writeable = False
+            self.arrays[column] = array
+
+    @classmethod
+    def publish(cls, catalog_name, columns=None):
+        """
+        Publishes a catalog (e.g. 'motors') into shared memory.
+
+        Args:
+            catalog_name (str): Catalog name or .pkl path understood by ComponentCatalog.
+            columns (list or None): Columns to share; defaults to every numeric column.
+                String columns are dictionary-encoded.
+        """
+        df = ComponentCatalog.get(catalog_name).load()
+        if columns is None:
+            columns = list(df.select_dtypes(include='number').columns)
+
+        arrays, dictionaries = {}, {}
+        for column in columns:
+            if pd.api.types.is_numeric_dtype(df[column]):
+                arrays[column] = df[column].to_numpy()
+            else:
+                codes, uniques = pd.factorize(df[column], use_na_sentinel=True)
+                arrays[column] = codes.astype(np.int32)
+                dictionaries[column] = list(uniques)
+        return cls.publish_arrays(catalog_name, arrays, dictionaries)
+
+    @classmethod
+    def publish_arrays(cls, name, arrays, dictionaries=None):
+        """
+        Publishes equal-length fixed-dtype arrays ({column: array}, numeric or fixed-width
+        strings such as '<U40') into shared memory, e.g. option arrays derived from a catalog.
+
+        Args:
+            name (str): Label kept in the handle.
+            dictionaries (dict or None): {column: values} for int32-coded columns (see decoded).
+        """
+        arrays = {column: np.ascontiguousarray(array) for column, array in arrays.items()}
+        lengths = {len(array) for array in arrays.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Shared columns of '{name}' have different lengths: {sorted(lengths)}")
+
+        layout, offset = {}, 0
+        for column, array in arrays.items():
+            layout[column] = (array.dtype.str, offset)
+            offset += -(-array.nbytes // 8) * 8  # keep every column 8-byte aligned
+
+        segment = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for column, array in arrays.items():
+            _, column_offset = layout[column]
+            np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf, offset=column_offset)[:] = array
+
+        handle = SharedCatalogHandle(name, segment.name, lengths.pop() if lengths else 0, layout, dictionaries or {})
+        return cls(handle, segment, owner=True)
+
+    @classmethod
+    def attach(cls, handle):
+        """
+        Returns the views onto a published catalog, attaching to its segment at most once per process.
+        """
+        if handle.segment_name not in _attached:
+            _attached[handle.segment_name] = cls(handle, _attach_segment(handle.segment_name), owner=False)
+        return _attached[handle.segment_name]
+
+    def __getitem__(self, column):
+        return self.arrays[column]
+
+    def decoded(self, column):
+        """
+        Decodes a shared dictionary-encoded string column to an object array (NaN where missing).
+        """
+        values = np.array(self.handle.dictionaries[column] + [np.nan], dtype=object)
+        return values[self.arrays[column]]
+
+    def close(self):
+        """
+        Releases this process's mapping (and, for the publisher, the segment). Views obtained
+        from this catalog must not be used or still be referenced afterwards.
+        """
+        self.arrays = {}
+        self._segment.close()
+        if self._owner:
+            self._segment.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def init_worker(handles):
+    """
+    Process-pool initializer: attaches every published catalog in `handles` ({name: handle}).
+    """
+    for handle in handles.values():
+        SharedCatalog.attach(handle)
+
@@ -0,0 +1,189 @@
+import argparse
+import glob
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+from aerosandbox import OperatingPoint
+
+from Battery import Battery
+from ESC import ESC
+from Motor import Motor, find_best_match as find_best_motor
+from Propeller import Propeller, propeller_constants
+from Propulsion import Propulsion, max_rpm
+from catalog import load_catalog
+from ecalc_csv import parse_ecalc_csv
+
+# --- Analytic Model vs eCalc Validation ---
+#
+# Re-evaluates stored eCalc exports with the analytic Propulsion path (ecalc=0) and reports how
+# far apart the two are per output, together with the analytic model's wall time per evaluation.
+# eCalc reports the drive at full throttle, so the analytic model is evaluated at throttle 1.0
+# (and the exported flight speed for the dynamic thrust). Nothing touches the network.
+#
+#   python validation.py                      every export in ecalcCSVs/
+#   python validation.py --corpus "runs/**/*.csv"
+
+CORPUS_PATTERN = os.path.join('ecalcCSVs', '*.csv')
+
+# Analytic output -> (eCalc result field, factor to the analytic units)
+COMPARED_OUTPUTS = {
+    'T_static': ('Propeller_StaticThrust_g', 1.0),
+    'T_dynamic': ('Propeller_availThrust_g_kmh', 1.0),
+    'rpm': ('Motor_Revolutions_rpm', 1.0),
+    'CurrentDraw': ('Motor_Current_A', 1.0),
+    'Pm': ('Motor_mechPower_W', 1.0),
+    'P_electric': ('TotalDrive_Pin_max_W', 1.0),
+    'efficiency': ('TotalDrive_Efficiency_max_pct', 0.01),
+}
+
+
+def load_corpus(pattern=CORPUS_PATTERN):
+    """
+    Parses every eCalc export matching `pattern` (recursive '**' allowed).
+
+    Returns:
+        list: (file path, result Series) tuples; unreadable files are reported and skipped.
+    """
+    corpus = []
+    for file_path in sorted(glob.glob(pattern, recursive=True)):
+        try:
+            corpus.append((file_path, parse_ecalc_csv(file_path)))
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            print(f"Warning: could not parse eCalc export {file_path}: {e}")
+    return corpus
+
+
+def _catalog_row(df, column, text):
+    """
+    Catalog row whose `column` equals `text`. The export parser drops trailing letters from text
+    fields ('max 50A' reads 'max 50'), so a row that only adds letters to `text` also matches.
+    """
+    names = df[column].astype(str)
+    exact = names == text
+    if not exact.any():
+        exact = names.str.startswith(text) & names.str[len(text):].str.isalpha()
+    return df[exact].iloc[0] if exact.any() else None
+
+
+def propulsion_from_record(record):
+    """
+    Builds the analytic Propulsion for an eCalc result from the component catalogs.
+
+    Raises:
+        ValueError: If a component of the record is not found in its catalog.
+    """
+    battery_row = _catalog_row(load_catalog('batteries'), 'text', record['Battery_Type'])
+    esc_row = _catalog_row(load_catalog('esc'), 'text', record['Controller_Type'])
+    motors_df = load_catalog('motors')
+    motor_row = _catalog_row(motors_df.assign(name=motors_df['manufacturer'].astype(str) + ' ' + motors_df['type'].astype(str)),
+                             'name', record['Motor_Type'])
+    if motor_row is None:
+        motor_row = find_best_motor(pd.Series({'Model': record['Motor_Type']}))
+    configuration = re.match(r'(\d+)S(\d+)', str(record['Battery_Configuration']))
+    size = re.search(r'([\d.]+)"\s*x\s*([\d.]+)"', str(record['Propeller_Type']))
+    prop_type = re.split(r'\s*\(|\s+[\d.]+"', str(record['Propeller_Type']))[0]
+    tconst, pconst = propeller_constants([prop_type])
+
+    missing = [name for name, found in (('battery', battery_row is not None), ('ESC', esc_row is not None),
+                                        ('motor', motor_row is not None), ('configuration', configuration),
+                                        ('propeller size', size), ('propeller type', np.isfinite(tconst[0])))
+               if not found]
+    if missing:
+        raise ValueError(f"not found in the catalogs: {', '.join(missing)}")
+
+    n_cells, p_cells = (int(group) for group in configuration.groups())
+    battery = Battery(n_cells=n_cells, p_cells=p_cells, voltpercell=battery_row['cell_volt'],
+                      cell_Rin=battery_row['Rin'], weight=battery_row['weight'],
+                      capacity=battery_row['capacity'] * p_cells, battery_type=battery_row['text'])
+    motor = Motor(kv=motor_row['Kv'], R_in=motor_row['Rin'], i0=motor_row['Io'], weight=motor_row['weight'],
+                  manuf=motor_row['manufacturer'], name=motor_row['type'])
+    esc = ESC(Rin=esc_row['Rin'], type=esc_row['text'])
+    propeller = Propeller(NB=record['Propeller_NumBlades'], diameter=float(size.group(1)), pitch=float(size.group(2)),
+                          weight=None, Tc=tconst[0], Pc=pconst[0])
+    velocity = (record.get('Propeller_FlightSpeed_kmh') or 0.0) / 3.6
+    return Propulsion(None, OperatingPoint(velocity=velocity), battery=battery, motor=motor, esc=esc,
+                      propeller=propeller, AnalysisMethod='analytic')
+
+
+def validate(corpus, repeat=5):
+    """
+    Compares the analytic model against every (file path, eCalc result) of `corpus`.
+
+    Returns:
+        pd.DataFrame: One row per export with, for each compared output, '<output>_ecalc',
+        '<output>_analytic' and '<output>_error' (relative, %), plus 'build_seconds' (catalog lookups
+        and Propulsion construction) and 'eval_seconds' (best of `repeat` cold operating-point
+        solves). Exports whose components are not in the catalogs get an 'error' message instead.
+    """
+    rows = []
+    for file_path, record in corpus:
+        row = {'file': os.path.basename(file_path), 'motor': record.get('Motor_Type'),
+               'propeller': record.get('Propeller_Type')}
+        start = time.perf_counter()
+        try:
+            propulsion = propulsion_from_record(record)
+        except ValueError as e:
+            rows.append({**row, 'error': str(e)})
+            continue
+        row['build_seconds'] = time.perf_counter() - start
+
+        eval_seconds = np.inf
+        for _ in range(repeat):
+            max_rpm.cache_clear()
+            start = time.perf_counter()
+            outputs = propulsion.operating_point(1.0)
+            eval_seconds = min(eval_seconds, time.perf_counter() - start)
+        row['eval_seconds'] = eval_seconds
+
+        for name, (field, factor) in COMPARED_OUTPUTS.items():
+            reference = record.get(field)
+            reference = float(reference) * factor if reference is not None else np.nan
+            analytic = float(outputs[name]) if outputs is not None else np.nan
+            row[f'{name}_ecalc'] = reference
+            row[f'{name}_analytic'] = analytic
+            row[f'{name}_error'] = (analytic - reference) / reference * 100 if reference else np.nan
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def error_summary(results):
+    """
+    Per-output error distribution (%) over the validated exports: count, mean (bias), median and
+    90th percentile of the absolute error, and the worst case. The last row gives the analytic
+    model's wall time per evaluation (s) in the same columns.
+    """
+    summary = {}
+    for name in COMPARED_OUTPUTS:
+        column = f'{name}_error'
+        errors = results[column].dropna() if column in results else pd.Series(dtype=float)
+        summary[name] = {'n': len(errors), 'mean': errors.mean(), 'median_abs': errors.abs().median(),
+                         'p90_abs': errors.abs().quantile(0.9), 'max_abs': errors.abs().max()}
+    seconds = results['eval_seconds'].dropna() if 'eval_seconds' in results else pd.Series(dtype=float)
+    summary['eval_seconds'] = {'n': len(seconds), 'mean': seconds.mean(), 'median_abs': seconds.median(),
+                               'p90_abs': seconds.quantile(0.9), 'max_abs': seconds.max()}
+    return pd.DataFrame(summary).T
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare the analytic propulsion model with stored eCalc exports.')
+    parser.add_argument('--corpus', default=CORPUS_PATTERN, help='glob of eCalc .csv exports')
+    parser.add_argument('--repeat', type=int, default=5, help='timed solves per export; the best time is kept')
+    parser.add_argument('--output', help='write the per-export comparison to this .csv')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    results = validate(corpus, repeat=args.repeat)
+    print(f"Validated {len(results)} eCalc exports from {args.corpus}")
+    if 'error' in results:
+        for _, row in results[results['error'].notna()].iterrows():
+            print(f"Skipped {row['file']}: {row['error']}")
+
+    with pd.option_context('display.width', 200, 'display.float_format', '{:.4g}'.format):
+        print("\nRelative error of the analytic model (%), and its time per evaluation (s):")
+        print(error_summary(results))
+    if args.output:
+        results.to_csv(args.output, index=False)
+        print(f"\nPer-export comparison written to {args.output}")